@@ -1,10 +1,17 @@
 """Core benchmarking functionality for the HTTP benchmark framework."""
 
 import asyncio
+import collections
+import inspect
+import itertools
+import os
+import queue
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
 
 from .clients.aiohttp_adapter import AiohttpAdapter
 from .clients.httpx_adapter import HttpxAdapter
@@ -12,31 +19,61 @@ from .clients.pycurl_adapter import PycurlAdapter
 from .clients.requests_adapter import RequestsAdapter
 from .clients.requestx_adapter import RequestXAdapter
 from .clients.urllib3_adapter import Urllib3Adapter
+from .convergence import ConvergenceMonitor
+from .isolation import run_isolated
 from .models.benchmark_configuration import BenchmarkConfiguration
 from .models.benchmark_result import BenchmarkResult
 from .models.http_request import HTTPRequest
+from .replay import ReplayRecord, ReplayStats, iter_records
+from .scenario import EndpointStats, labelled, load_scenario, method_label, request_picker
+from .soak import SoakRecorder
+from .utils.allocation_tracker import AllocationTracker, package_locations
+from .utils.cpu_affinity import format_cpu_set, pin_process
+from .utils.event_loop_monitor import EventLoopMonitor
+from .utils.gc_monitor import GCMonitor
+from .utils.histogram import LatencyHistogram
 from .utils.logging import app_logger
+from .utils.profiler import SamplingProfiler
 from .utils.resource_monitor import resource_monitor
+from .utils.runtime import get_runtime_info
+from .utils.target_monitor import TargetMonitor
+
+# Adapter class of each supported client library
+ADAPTER_CLASSES = {
+    "requests": RequestsAdapter,
+    "requestx": RequestXAdapter,
+    "httpx": HttpxAdapter,
+    "aiohttp": AiohttpAdapter,
+    "urllib3": Urllib3Adapter,
+    "pycurl": PycurlAdapter,
+}
 
 
 class BenchmarkRunner:
     """Core benchmarking functionality for HTTP client performance testing."""
 
-    def __init__(self, config: BenchmarkConfiguration):
+    def __init__(self, config: BenchmarkConfiguration, storage=None):
+        """`storage` (a ResultStorage) receives soak windows as they close; without it only their trends are kept."""
         self.config = config
-        self.adapter_classes = {
-            "requests": RequestsAdapter,
-            "requestx": RequestXAdapter,
-            "httpx": HttpxAdapter,
-            "aiohttp": AiohttpAdapter,
-            "urllib3": Urllib3Adapter,
-            "pycurl": PycurlAdapter,
-        }
+        self.storage = storage
+        self.adapter_classes = dict(ADAPTER_CLASSES)
         self.results = []
         self.resource_metrics = []
+        self._gc_monitor = GCMonitor(config.gc_mode, config.gc_thresholds)
+        self._cpu_times_start: Dict[str, float] = {}
+        self._cpu_times_end: Dict[str, float] = {}
+        self._allocation_tracker: Optional[AllocationTracker] = None
+        self._soak: Optional[SoakRecorder] = None
+        self._convergence: Optional[ConvergenceMonitor] = None
+        self._endpoint_stats: Optional[EndpointStats] = None
+        self._replay: Optional[ReplayStats] = None
+        self._next_request: Optional[Callable[[], HTTPRequest]] = None
 
     def run(self) -> BenchmarkResult:
-        """Run the benchmark with the given configuration."""
+        """Run the benchmark with the given configuration; isolated configurations run in a spawned subprocess."""
+        if self.config.isolate:
+            app_logger.info(f"Running {self.config.client_library} in an isolated subprocess")
+            return run_isolated(self.config, self.storage.db_path if self.storage else None)
         app_logger.info(f"Starting benchmark for {self.config.target_url} using {self.config.client_library}")
 
         start_time = datetime.now()
@@ -55,18 +92,76 @@ class BenchmarkRunner:
             timeout=self.config.timeout,
             verify_ssl=self.config.verify_ssl,
         )
+        http_method = self.config.http_method
+        self._endpoint_stats = None
+        self._next_request = itertools.repeat(http_request).__next__
+        if self.config.scenario_path:
+            scenario = load_scenario(self.config.scenario_path, self.config.target_url, self.config.timeout, self.config.verify_ssl)
+            app_logger.info(f"Replaying {len(scenario)} scenario requests from {self.config.scenario_path} ({self.config.scenario_mode})")
+            http_method = method_label(scenario)
+            self._endpoint_stats = EndpointStats(scenario, self.config.scenario_mode)
+            self._next_request = request_picker(scenario, self.config.scenario_mode, self.config.scenario_seed)
+        self._replay = None
+        if self.config.replay_path:
+            app_logger.info(f"Replaying {self.config.replay_path} at {self.config.replay_speedup:g}x the recorded pace")
+            http_method = "REPLAY"
+            self._replay = ReplayStats(self.config.replay_path, self.config.replay_speedup)
+
+        result_id = str(uuid.uuid4())
+        self._soak = None
+        if self.config.soak_window_seconds:
+            on_window = self.storage.save_soak_window if self.storage else None
+            self._soak = SoakRecorder(result_id, self.config.soak_window_seconds, resource_monitor.get_process_snapshot, on_window)
+        self._convergence = ConvergenceMonitor(self.config.target_precision, self.config.batch_seconds) if self.config.target_precision else None
+        profiler = SamplingProfiler(interval=self.config.profile_interval) if self.config.profile else None
+        self._allocation_tracker = None
+        if self.config.track_allocations:
+            app_logger.warning("Allocation tracking is enabled; tracemalloc overhead lowers throughput for this run")
+            locations = package_locations(adapter_class.packages) + [inspect.getfile(adapter_class)]
+            self._allocation_tracker = AllocationTracker(locations, frames=self.config.allocation_frames, top=self.config.allocation_top)
+            self._allocation_tracker.start()
+
+        target_monitor = None
+        if self.config.monitor_pids or self.config.monitor_processes or self.config.monitor_cgroup:
+            target_monitor = TargetMonitor(self.config.monitor_pids, self.config.monitor_processes, self.config.monitor_cgroup)
+        pinned = self._pin_cpus(target_monitor)
 
         # Start continuous monitoring
-        resource_monitor.start_monitoring()
+        resource_monitor.start_monitoring(self.config.monitor_interval, remote_port=self._target_port(), target=target_monitor, mode=self.config.monitor_mode)
+        self._cpu_times_start = resource_monitor.get_cpu_times()
+        self._gc_monitor.start()
+        if profiler:
+            profiler.start()
+
+        try:
+            if self.config.is_async:
+                result = asyncio.run(self._run_async_benchmark(adapter_class, http_request))
+            else:
+                result = self._run_sync_benchmark(adapter_class, http_request)
+        finally:
+            gc_stats = self._gc_monitor.stop()
+            if profiler:
+                profiler.stop()
+            self._restore_cpus(pinned)
+
+        allocation_stats = self._allocation_tracker.stop(result["requests_count"]) if self._allocation_tracker else {}
 
-        if self.config.is_async:
-            result = asyncio.run(self._run_async_benchmark(adapter_class, http_request))
-        else:
-            result = self._run_sync_benchmark(adapter_class, http_request)
+        profile_path = None
+        if profiler:
+            profile_path = profiler.write_collapsed(os.path.join(self.config.profile_dir, f"{self.config.client_library}-{result_id}.folded"))
+            app_logger.info(f"Profile with {profiler.sample_count} samples written to {profile_path}")
 
         # Stop monitoring and get aggregated metrics
         metrics = resource_monitor.stop_monitoring()
+        resource_samples = resource_monitor.take_samples()
+        target_resource_samples = resource_monitor.take_target_samples()
         network_io = resource_monitor.get_network_io_delta()
+        target_metrics = resource_monitor.get_target_summary()
+        cpu_budget = resource_monitor.get_cpu_budget()
+        if cpu_budget["throttling"].get("throttled_seconds"):
+            app_logger.warning(f"Benchmark cgroup was CPU-throttled for {cpu_budget['throttling']['throttled_seconds']:.2f}s; client CPU figures are capped by the quota")
+        if target_metrics.get("server_saturated"):
+            app_logger.warning(f"Target was CPU-saturated ({target_metrics['cpu_avg']:.1f}% of {target_metrics['cpu_capacity_percent']:.0f}%); results are server-bound")
 
         end_time = datetime.now()
         perf_end = time.perf_counter()
@@ -76,11 +171,33 @@ class BenchmarkRunner:
         cpu_usage_avg = metrics["cpu_avg"]
         memory_usage_avg = metrics["memory_avg"]
 
+        # Client-side CPU cost: process-wide user/system time plus the CPU spent in the threads running adapter calls
+        cpu_time_user = self._cpu_times_end["user"] - self._cpu_times_start["user"]
+        cpu_time_system = self._cpu_times_end["system"] - self._cpu_times_start["system"]
+        cpu_time_total = cpu_time_user + cpu_time_system
+        requests_count = result["requests_count"]
+        cpu_us_per_request = cpu_time_total / requests_count * 1_000_000 if requests_count > 0 else 0
+        requests_per_cpu_second = requests_count / cpu_time_total if cpu_time_total > 0 else 0
+        adapter_cpu_us_per_request = result["adapter_cpu_time"] / requests_count * 1_000_000 if requests_count > 0 else 0
+
+        runtime_info = get_runtime_info()
+        config_snapshot = self.config.to_dict()
+        config_snapshot["runtime"] = runtime_info
+        config_snapshot["monitor"] = resource_monitor.get_monitor_stats()
+        threading_stats = self._threading_stats(result, runtime_info)
+        # Per-endpoint breakdown of scenario runs, or of replays against their recorded latencies
+        endpoint_stats = None
+        if self._endpoint_stats:
+            endpoint_stats = self._endpoint_stats.summary()
+        elif self._replay:
+            endpoint_stats = self._replay.endpoint_summary()
+
         benchmark_result = BenchmarkResult(
+            id=result_id,
             name=self.config.name,
             client_library=self.config.client_library,
             client_type="async" if self.config.is_async else "sync",
-            http_method=self.config.http_method,
+            http_method=http_method,
             url=self.config.target_url,
             start_time=start_time,
             end_time=end_time,
@@ -98,12 +215,163 @@ class BenchmarkRunner:
             error_count=result["error_count"],
             error_rate=result["error_rate"],
             concurrency_level=self.config.concurrency,
-            config_snapshot=self.config.to_dict(),
+            config_snapshot=config_snapshot,
+            cpu_time_user=cpu_time_user,
+            cpu_time_system=cpu_time_system,
+            cpu_us_per_request=cpu_us_per_request,
+            requests_per_cpu_second=requests_per_cpu_second,
+            adapter_cpu_us_per_request=adapter_cpu_us_per_request,
+            cpu_budget_cores=cpu_budget["cores"],
+            cpu_usage_normalized=metrics["cpu_normalized_avg"],
+            profile_path=profile_path,
+            gc_stats=gc_stats,
+            allocation_stats=allocation_stats,
+            threading_stats=threading_stats,
+            target_metrics=target_metrics,
+            event_loop_stats=result.get("event_loop_stats"),
+            cpu_budget=cpu_budget,
+            soak_stats=self._soak.summary() if self._soak else None,
+            host=runtime_info["host"],
+            git_sha=runtime_info["git_sha"],
+            environment_fingerprint=runtime_info["environment_fingerprint"],
+            latency_histogram=result["latency_histogram"],
+            convergence_stats=self._convergence.summary() if self._convergence else None,
+            endpoint_stats=endpoint_stats,
+            replay_stats=self._replay.summary() if self._replay else None,
+            resource_samples=resource_samples,
+            target_resource_samples=target_resource_samples,
         )
 
+        if gc_stats["collections"]:
+            app_logger.info(f"GC ({gc_stats['mode']}): {gc_stats['collections']} collections, {gc_stats['total_pause'] * 1000:.2f}ms total pause")
+        if benchmark_result.event_loop_stats:
+            lag = benchmark_result.event_loop_stats["lag"]
+            app_logger.info(f"Event loop lag: p99 {lag['p99'] * 1000:.2f}ms, max {lag['max'] * 1000:.2f}ms")
+        if benchmark_result.soak_stats.get("leak_suspected"):
+            app_logger.warning(f"Suspected leak over {benchmark_result.soak_stats['window_count']} soak windows: {', '.join(benchmark_result.soak_stats['suspected_leaks'])} kept growing")
+        if benchmark_result.convergence_stats and not benchmark_result.convergence_stats["converged"]:
+            precision = benchmark_result.convergence_stats["precision"]
+            achieved = ", ".join(f"{metric} ±{value * 100:.2f}%" for metric, value in precision.items() if value is not None) or "too few batches"
+            app_logger.warning(f"Run stopped at the maximum duration before reaching ±{self.config.target_precision * 100:.2f}% ({achieved})")
+        if benchmark_result.replay_stats.get("truncated"):
+            app_logger.warning(f"Replay stopped at the {self.config.duration_seconds}s duration before the end of {self.config.replay_path}")
         app_logger.info(f"Benchmark completed: {benchmark_result.requests_per_second} RPS")
         return benchmark_result
 
+    def _pin_cpus(self, target_monitor: Optional[TargetMonitor]) -> List[Tuple[int, Set[int]]]:
+        """Pin this process and the target processes to their configured CPU sets.
+
+        Returns the previous affinity of every pinned process so it can be restored after the run.
+        """
+        pinned = []
+        if self.config.target_cpu_set:
+            if target_monitor is None:
+                raise ValueError("Pinning the target needs target monitoring (monitor_pids, monitor_processes or monitor_cgroup)")
+            if self.config.cpu_set and set(self.config.cpu_set) & set(self.config.target_cpu_set):
+                app_logger.warning("Client and target CPU sets overlap; they will compete for the shared CPUs")
+            for pid in target_monitor.resolve_pids():
+                try:
+                    pinned.append((pid, pin_process(pid, self.config.target_cpu_set)))
+                except OSError as e:
+                    app_logger.warning(f"Could not pin target process {pid}: {e}")
+            app_logger.info(f"Pinned {len(pinned)} target processes to CPUs {format_cpu_set(self.config.target_cpu_set)}")
+        if self.config.cpu_set:
+            pinned.append((os.getpid(), pin_process(os.getpid(), self.config.cpu_set)))
+            app_logger.info(f"Pinned benchmark process to CPUs {format_cpu_set(self.config.cpu_set)}")
+        return pinned
+
+    @staticmethod
+    def _restore_cpus(pinned: List[Tuple[int, Set[int]]]) -> None:
+        for pid, cpus in pinned:
+            try:
+                pin_process(pid, cpus)
+            except OSError:
+                pass  # The process exited
+
+    def _target_port(self) -> Optional[int]:
+        """Port of the benchmark target, used to match its TIME_WAIT sockets."""
+        parsed = urlparse(self.config.target_url)
+        try:
+            return parsed.port or {"http": 80, "https": 443}.get(parsed.scheme)
+        except ValueError:
+            return None
+
+    def _threading_stats(self, result: Dict[str, Any], runtime_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Compare the CPU time of the threads running adapter calls with wall time.
+
+        With the GIL only one thread runs Python code at a time, so worker CPU utilization is capped at one
+        core; on free-threaded builds utilization above 1.0 shows real parallelism. Utilization alone does not
+        show contention: a single busy thread reaches 1.0 without waiting on anything. Thread sweeps add a
+        contention estimate against their single-thread run (scaling.gil_contention_estimate).
+        """
+        wall = result["measured_duration"]
+        utilization = result["adapter_cpu_time"] / wall if wall > 0 else 0
+        thread_pool = not self.config.is_async
+        return {
+            "execution": "thread_pool" if thread_pool else "event_loop",
+            "workers": self.config.concurrency if thread_pool else 1,
+            "gil_enabled": runtime_info["gil_enabled"],
+            "worker_cpu_seconds": result["adapter_cpu_time"],
+            "wall_seconds": wall,
+            "worker_cpu_utilization": utilization,
+        }
+
+    @staticmethod
+    def _latency_stats(response_times) -> Dict[str, float]:
+        """Average, extremes and percentiles of the successful requests' response times."""
+        if not response_times:
+            return {"avg_response_time": 0, "min_response_time": 0, "max_response_time": 0, "p95_response_time": 0, "p99_response_time": 0}
+
+        # Calculate percentiles using linear interpolation method
+        sorted_times = sorted(response_times)
+
+        def calculate_percentile(data, percentile):
+            if not data:
+                return 0
+            n = len(data)
+            # Using the standard percentile formula: P = (percentile * (n - 1)) + 1
+            # Then interpolate between values if needed
+            rank = percentile * (n - 1)
+            lower_idx = int(rank)
+            upper_idx = min(lower_idx + 1, n - 1)
+
+            # Interpolate between the two values
+            fraction = rank - lower_idx
+            if lower_idx == upper_idx:
+                return data[lower_idx]
+            else:
+                lower_val = data[lower_idx]
+                upper_val = data[upper_idx]
+                return lower_val + fraction * (upper_val - lower_val)
+
+        return {
+            "avg_response_time": sum(response_times) / len(response_times),
+            "min_response_time": sorted_times[0],
+            "max_response_time": sorted_times[-1],
+            "p95_response_time": calculate_percentile(sorted_times, 0.95),
+            "p99_response_time": calculate_percentile(sorted_times, 0.99),
+        }
+
+    def _measured_result(self, response_times: List[float], error_count: int, start_time: float, adapter_cpu_time: float) -> Dict[str, Any]:
+        """Throughput, latency and error figures of the measured phase that started at `start_time`."""
+        latency_stats = self._soak.finish(error_count) if self._soak else self._latency_stats(response_times)
+        latency_histogram = self._soak.histogram if self._soak else LatencyHistogram.from_values(response_times)
+        total_completed_requests = (self._soak.count if self._soak else len(response_times)) + error_count
+        actual_duration = time.perf_counter() - start_time
+        requests_per_second = total_completed_requests / actual_duration if actual_duration > 0 else 0
+        error_rate = (error_count / total_completed_requests) * 100 if total_completed_requests > 0 else 0
+
+        return {
+            "requests_count": total_completed_requests,
+            "requests_per_second": requests_per_second,
+            **latency_stats,
+            "latency_histogram": latency_histogram,
+            "error_count": error_count,
+            "error_rate": error_rate,
+            "adapter_cpu_time": adapter_cpu_time,
+            "measured_duration": actual_duration,
+        }
+
     def _run_sync_benchmark(self, adapter_class, http_request: HTTPRequest) -> Dict[str, Any]:
         """Run a synchronous benchmark."""
         app_logger.info("Running synchronous benchmark")
@@ -111,38 +379,112 @@ class BenchmarkRunner:
         adapter = adapter_class()
         adapter.verify_ssl = http_request.verify_ssl
         with adapter:
-            return self._execute_sync_benchmark(adapter, http_request)
-
-    def _execute_sync_benchmark(self, adapter, http_request: HTTPRequest) -> Dict[str, Any]:
+            return self._execute_sync_replay(adapter) if self._replay else self._execute_sync_benchmark(adapter)
+
+    def _on_warmup_complete(self) -> None:
+        """Start the measured phase: CPU accounting, socket counters and GC timeline restart here, and the GC mode takes effect."""
+        self._cpu_times_start = resource_monitor.get_cpu_times()
+        resource_monitor.reset_cpu_baseline()
+        resource_monitor.reset_network_baseline()
+        self._gc_monitor.warmup_complete()
+        if self._allocation_tracker:
+            self._allocation_tracker.warmup_complete()
+        if self._soak:
+            self._soak.start()
+        if self._convergence:
+            self._convergence.start()
+
+    def _on_measurement_complete(self) -> None:
+        """End of the measured phase, called while the adapter is still open.
+
+        CPU accounting stops here, before the adapter is closed and before allocation snapshots and profiles are
+        analysed and written, so post-run work is not charged to the requests.
+        """
+        self._cpu_times_end = resource_monitor.get_cpu_times()
+        if self._allocation_tracker:
+            self._allocation_tracker.measurement_complete()
+        # Pooled connections are closed with the adapter, so read their final counters now
+        resource_monitor.sample_sockets()
+
+    def _measuring(self, end_time: float) -> bool:
+        """Whether to keep issuing requests: until `end_time`, or until an adaptive run has converged."""
+        return time.perf_counter() < end_time and not (self._convergence and self._convergence.converged)
+
+    def _latency_recorder(self, response_times: List[float]):
+        """Callable recording one successful latency into the run's list or soak windows, and the convergence batches."""
+        # Soak runs aggregate latencies per window instead of keeping every one of them
+        record = self._soak.record if self._soak else response_times.append
+        if not self._convergence:
+            return record
+        convergence = self._convergence
+
+        def record_latency(response_time: float) -> None:
+            record(response_time)
+            convergence.record(response_time)
+
+        return record_latency
+
+    def _tick(self, error_count: int) -> None:
+        """Let soak windows and convergence batches close once their time is up."""
+        if self._soak:
+            self._soak.tick(error_count)
+        if self._convergence:
+            self._convergence.tick(error_count)
+
+    def _warmup_sync(self, executor: ThreadPoolExecutor, adapter) -> None:
+        """Issue untimed requests through the worker pool so connections and caches are warm."""
+        if self.config.warmup_requests > 0:
+            app_logger.info(f"Warming up with {self.config.warmup_requests} requests")
+            wait([executor.submit(adapter.make_request, self._next_request()) for _ in range(self.config.warmup_requests)])
+        self._on_warmup_complete()
+
+    @staticmethod
+    def _timed_request(adapter, http_request: HTTPRequest) -> Dict[str, Any]:
+        """Make a sync request and record the CPU time the calling thread spent in the adapter, and the scenario endpoint."""
+        cpu_start = time.thread_time_ns()
+        result = adapter.make_request(http_request)
+        result["cpu_time"] = (time.thread_time_ns() - cpu_start) / 1_000_000_000
+        result["endpoint"] = getattr(http_request, "name", None)
+        return result
+
+    def _execute_sync_benchmark(self, adapter) -> Dict[str, Any]:
 
         response_times = []
+        record_latency = self._latency_recorder(response_times)
+        endpoint_stats = self._endpoint_stats
         error_count = 0
-        start_time = time.perf_counter()
-        end_time = start_time + self.config.duration_seconds
+        adapter_cpu_time = 0.0
 
         # Execute requests concurrently using ThreadPoolExecutor for the specified duration
         with ThreadPoolExecutor(max_workers=self.config.concurrency) as executor:
+            self._warmup_sync(executor, adapter)
+            start_time = time.perf_counter()
+            end_time = start_time + self.config.duration_seconds
+
             # Submit initial batch of requests
             futures = set()
             for _ in range(self.config.concurrency):
-                futures.add(executor.submit(adapter.make_request, http_request))
+                futures.add(executor.submit(self._timed_request, adapter, self._next_request()))
 
             # Continue making requests for the specified duration
-            while time.perf_counter() < end_time:
+            while self._measuring(end_time):
                 completed_futures = []
                 try:
                     for future in as_completed(futures, timeout=1):  # Use timeout to check duration periodically
                         result = future.result()
+                        adapter_cpu_time += result["cpu_time"]
+                        if endpoint_stats:
+                            endpoint_stats.record(result)
                         if result["success"]:
-                            response_times.append(result["response_time"])
+                            record_latency(result["response_time"])
                         else:
                             error_count += 1
                             if error_count <= 5:  # Limit error logging
                                 app_logger.error(f"Request failed: {result.get('error', 'Unknown error')}")
 
                         # Submit a new request to keep the concurrency level
-                        if time.perf_counter() < end_time:
-                            futures.add(executor.submit(adapter.make_request, http_request))
+                        if self._measuring(end_time):
+                            futures.add(executor.submit(self._timed_request, adapter, self._next_request()))
 
                         completed_futures.append(future)
                 except TimeoutError:
@@ -158,70 +500,81 @@ class BenchmarkRunner:
                     futures.discard(future)
 
                 # If all futures completed before duration, submit more
-                while len(futures) < self.config.concurrency and time.perf_counter() < end_time:
-                    futures.add(executor.submit(adapter.make_request, http_request))
+                while len(futures) < self.config.concurrency and self._measuring(end_time):
+                    futures.add(executor.submit(self._timed_request, adapter, self._next_request()))
+                self._tick(error_count)
 
         # Wait for any remaining requests to complete
         for future in as_completed(futures):
             result = future.result()
+            adapter_cpu_time += result["cpu_time"]
+            if endpoint_stats:
+                endpoint_stats.record(result)
             if result["success"]:
-                response_times.append(result["response_time"])
+                record_latency(result["response_time"])
             else:
                 error_count += 1
+        self._on_measurement_complete()
+
+        return self._measured_result(response_times, error_count, start_time, adapter_cpu_time)
+
+    def _replay_request(self, adapter, record: ReplayRecord, due: float) -> Dict[str, Any]:
+        """Make a replayed sync request scheduled at `due`, noting how late it started."""
+        lag = time.perf_counter() - due
+        result = self._timed_request(adapter, record.request)
+        result["lag"] = lag
+        result["record"] = record
+        return result
+
+    def _replayed(self, result: Dict[str, Any], record_latency, error_count: int) -> int:
+        """Count one replayed request's result; returns the updated error count."""
+        self._replay.record(result["record"], result, result["lag"])
+        if result["success"]:
+            record_latency(result["response_time"])
+            return error_count
+        if error_count < 5:  # Limit error logging
+            app_logger.error(f"Request failed: {result.get('error', 'Unknown error')}")
+        return error_count + 1
+
+    def _execute_sync_replay(self, adapter) -> Dict[str, Any]:
+        """Send the captured requests at their recorded offsets, divided by the speedup, whether or not earlier ones completed.
+
+        Requests are open-loop: each is submitted to the worker pool when it is due, and the pool's `concurrency`
+        only bounds how many run at once. When all workers are busy, requests start late; the lag is recorded.
+        """
+        response_times = []
+        record_latency = self._latency_recorder(response_times)
+        error_count = 0
+        adapter_cpu_time = 0.0
+        completed = queue.SimpleQueue()
 
-        # Calculate metrics
-        if response_times:
-            avg_response_time = sum(response_times) / len(response_times)
-            min_response_time = min(response_times) if response_times else 0
-            max_response_time = max(response_times) if response_times else 0
-
-            # Calculate percentiles using linear interpolation method
-            sorted_times = sorted(response_times)
-
-            def calculate_percentile(data, percentile):
-                if not data:
-                    return 0
-                n = len(data)
-                # Using the standard percentile formula: P = (percentile * (n - 1)) + 1
-                # Then interpolate between values if needed
-                rank = percentile * (n - 1)
-                lower_idx = int(rank)
-                upper_idx = min(lower_idx + 1, n - 1)
-
-                # Interpolate between the two values
-                fraction = rank - lower_idx
-                if lower_idx == upper_idx:
-                    return data[lower_idx]
-                else:
-                    lower_val = data[lower_idx]
-                    upper_val = data[upper_idx]
-                    return lower_val + fraction * (upper_val - lower_val)
-
-            p95_response_time = calculate_percentile(sorted_times, 0.95)
-            p99_response_time = calculate_percentile(sorted_times, 0.99)
-        else:
-            avg_response_time = 0
-            min_response_time = 0
-            max_response_time = 0
-            p95_response_time = 0
-            p99_response_time = 0
-
-        total_completed_requests = len(response_times) + error_count
-        actual_duration = time.perf_counter() - start_time
-        requests_per_second = total_completed_requests / actual_duration if actual_duration > 0 else 0
-        error_rate = (error_count / total_completed_requests) * 100 if total_completed_requests > 0 else 0
-
-        return {
-            "requests_count": total_completed_requests,
-            "requests_per_second": requests_per_second,
-            "avg_response_time": avg_response_time,
-            "min_response_time": min_response_time,
-            "max_response_time": max_response_time,
-            "p95_response_time": p95_response_time,
-            "p99_response_time": p99_response_time,
-            "error_count": error_count,
-            "error_rate": error_rate,
-        }
+        with ThreadPoolExecutor(max_workers=self.config.concurrency) as executor:
+            self._warmup_sync(executor, adapter)
+            start_time = time.perf_counter()
+            end_time = start_time + self.config.duration_seconds
+            for record in iter_records(self.config.replay_path, self.config.target_url, self.config.timeout, self.config.verify_ssl):
+                due = start_time + record.offset / self._replay.speedup
+                if due >= end_time:
+                    self._replay.truncated = True
+                    break
+                # Count completed requests while waiting for the next one to be due
+                while (now := time.perf_counter()) < due:
+                    try:
+                        result = completed.get(timeout=min(due - now, 1.0)).result()
+                    except queue.Empty:
+                        pass
+                    else:
+                        adapter_cpu_time += result["cpu_time"]
+                        error_count = self._replayed(result, record_latency, error_count)
+                    self._tick(error_count)
+                executor.submit(self._replay_request, adapter, record, due).add_done_callback(completed.put)
+
+        while not completed.empty():
+            result = completed.get().result()
+            adapter_cpu_time += result["cpu_time"]
+            error_count = self._replayed(result, record_latency, error_count)
+        self._on_measurement_complete()
+        return self._measured_result(response_times, error_count, start_time, adapter_cpu_time)
 
     async def _run_async_benchmark(self, adapter_class, http_request: HTTPRequest) -> Dict[str, Any]:
         """Run an asynchronous benchmark."""
@@ -230,23 +583,47 @@ class BenchmarkRunner:
         adapter = adapter_class()
         adapter.verify_ssl = http_request.verify_ssl
         async with adapter:
-            return await self._execute_async_benchmark(adapter, http_request)
-
-    async def _execute_async_benchmark(self, adapter, http_request: HTTPRequest) -> Dict[str, Any]:
-
+            return await (self._execute_async_replay(adapter) if self._replay else self._execute_async_benchmark(adapter))
+
+    async def _warmup_async(self, adapter) -> None:
+        """Issue untimed requests, at most `concurrency` at a time, so connections and caches are warm."""
+        remaining = self.config.warmup_requests
+        if remaining > 0:
+            app_logger.info(f"Warming up with {remaining} requests")
+        while remaining > 0:
+            batch = min(remaining, self.config.concurrency)
+            await asyncio.gather(*(adapter.make_request_async(self._next_request()) for _ in range(batch)), return_exceptions=True)
+            remaining -= batch
+        self._on_warmup_complete()
+
+    def _request_async(self, adapter) -> Awaitable[Dict[str, Any]]:
+        """Coroutine making the next request; scenario results are labelled with their endpoint."""
+        http_request = self._next_request()
+        request = adapter.make_request_async(http_request)
+        return labelled(request, http_request.name) if self._endpoint_stats else request
+
+    async def _execute_async_benchmark(self, adapter) -> Dict[str, Any]:
+
+        await self._warmup_async(adapter)
+        loop_monitor = EventLoopMonitor(probe_interval=self.config.loop_probe_interval, debug=self.config.loop_debug)
+        loop_monitor.start()
         response_times = []
+        record_latency = self._latency_recorder(response_times)
+        endpoint_stats = self._endpoint_stats
         error_count = 0
+        # Coroutines interleave on the loop thread, so adapter CPU is the loop thread's CPU time for the whole run
+        loop_cpu_start = time.thread_time_ns()
         start_time = time.perf_counter()
         end_time = start_time + self.config.duration_seconds
 
         # Create initial tasks for concurrent execution
         tasks = set()
         for _ in range(self.config.concurrency):
-            task = adapter.make_request_async(http_request)
+            task = loop_monitor.track(self._request_async(adapter))
             tasks.add(asyncio.create_task(task))
 
         # Continue making requests for the specified duration
-        while time.perf_counter() < end_time:
+        while self._measuring(end_time):
             if not tasks:
                 break
 
@@ -256,8 +633,10 @@ class BenchmarkRunner:
             for task in done:
                 try:
                     result = await task
+                    if endpoint_stats:
+                        endpoint_stats.record(result)
                     if result["success"]:
-                        response_times.append(result["response_time"])
+                        record_latency(result["response_time"])
                     else:
                         error_count += 1
                         if error_count <= 5:  # Limit error logging
@@ -269,71 +648,78 @@ class BenchmarkRunner:
             tasks = pending
 
             # If all tasks completed before duration, submit more
-            while len(tasks) < self.config.concurrency and time.perf_counter() < end_time:
-                new_task = adapter.make_request_async(http_request)
+            while len(tasks) < self.config.concurrency and self._measuring(end_time):
+                new_task = loop_monitor.track(self._request_async(adapter))
                 tasks.add(asyncio.create_task(new_task))
+            self._tick(error_count)
 
         # Wait for any remaining tasks to complete
         if tasks:
             for task in asyncio.as_completed(tasks):
                 try:
                     result = await task
+                    if endpoint_stats:
+                        endpoint_stats.record(result)
                     if result["success"]:
-                        response_times.append(result["response_time"])
+                        record_latency(result["response_time"])
                     else:
                         error_count += 1
                 except Exception:
                     error_count += 1
+        event_loop_stats = await loop_monitor.stop()
+        self._on_measurement_complete()
+
+        adapter_cpu_time = (time.thread_time_ns() - loop_cpu_start) / 1_000_000_000
+        return {**self._measured_result(response_times, error_count, start_time, adapter_cpu_time), "event_loop_stats": event_loop_stats}
+
+    async def _replay_request_async(self, adapter, record: ReplayRecord, due: float, slots: asyncio.Semaphore) -> Dict[str, Any]:
+        """Make a replayed async request scheduled at `due` once one of the `concurrency` slots is free."""
+        async with slots:
+            lag = time.perf_counter() - due
+            try:
+                result = await adapter.make_request_async(record.request)
+            except Exception as e:
+                result = {"success": False, "response_time": 0, "error": str(e)}
+        result["lag"] = lag
+        result["record"] = record
+        return result
+
+    async def _execute_async_replay(self, adapter) -> Dict[str, Any]:
+        """Async counterpart of _execute_sync_replay: a task per captured request, created when it is due."""
+        await self._warmup_async(adapter)
+        loop_monitor = EventLoopMonitor(probe_interval=self.config.loop_probe_interval, debug=self.config.loop_debug)
+        loop_monitor.start()
+        response_times = []
+        record_latency = self._latency_recorder(response_times)
+        error_count = 0
+        slots = asyncio.Semaphore(self.config.concurrency)
+        completed = collections.deque()
+        tasks = set()
+        loop_cpu_start = time.thread_time_ns()
+        start_time = time.perf_counter()
+        end_time = start_time + self.config.duration_seconds
 
-        # Calculate metrics
-        if response_times:
-            avg_response_time = sum(response_times) / len(response_times)
-            min_response_time = min(response_times) if response_times else 0
-            max_response_time = max(response_times) if response_times else 0
-
-            # Calculate percentiles using linear interpolation method
-            sorted_times = sorted(response_times)
-
-            def calculate_percentile(data, percentile):
-                if not data:
-                    return 0
-                n = len(data)
-                # Using the standard percentile formula: P = (percentile * (n - 1)) + 1
-                # Then interpolate between values if needed
-                rank = percentile * (n - 1)
-                lower_idx = int(rank)
-                upper_idx = min(lower_idx + 1, n - 1)
-
-                # Interpolate between the two values
-                fraction = rank - lower_idx
-                if lower_idx == upper_idx:
-                    return data[lower_idx]
-                else:
-                    lower_val = data[lower_idx]
-                    upper_val = data[upper_idx]
-                    return lower_val + fraction * (upper_val - lower_val)
-
-            p95_response_time = calculate_percentile(sorted_times, 0.95)
-            p99_response_time = calculate_percentile(sorted_times, 0.99)
-        else:
-            avg_response_time = 0
-            min_response_time = 0
-            max_response_time = 0
-            p95_response_time = 0
-            p99_response_time = 0
-
-        total_completed_requests = len(response_times) + error_count
-        actual_duration = time.perf_counter() - start_time
-        requests_per_second = total_completed_requests / actual_duration if actual_duration > 0 else 0
-        error_rate = (error_count / total_completed_requests) * 100 if total_completed_requests > 0 else 0
-        return {
-            "requests_count": total_completed_requests,
-            "requests_per_second": requests_per_second,
-            "avg_response_time": avg_response_time,
-            "min_response_time": min_response_time,
-            "max_response_time": max_response_time,
-            "p95_response_time": p95_response_time,
-            "p99_response_time": p99_response_time,
-            "error_count": error_count,
-            "error_rate": error_rate,
-        }
+        for record in iter_records(self.config.replay_path, self.config.target_url, self.config.timeout, self.config.verify_ssl):
+            due = start_time + record.offset / self._replay.speedup
+            if due >= end_time:
+                self._replay.truncated = True
+                break
+            while (now := time.perf_counter()) < due:
+                await asyncio.sleep(min(due - now, 1.0))
+                while completed:
+                    error_count = self._replayed(completed.popleft().result(), record_latency, error_count)
+                self._tick(error_count)
+            task = asyncio.create_task(loop_monitor.track(self._replay_request_async(adapter, record, due, slots)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            task.add_done_callback(completed.append)
+
+        if tasks:
+            await asyncio.wait(set(tasks))
+        while completed:
+            error_count = self._replayed(completed.popleft().result(), record_latency, error_count)
+        event_loop_stats = await loop_monitor.stop()
+        self._on_measurement_complete()
+
+        adapter_cpu_time = (time.thread_time_ns() - loop_cpu_start) / 1_000_000_000
+        return {**self._measured_result(response_times, error_count, start_time, adapter_cpu_time), "event_loop_stats": event_loop_stats}
@@ -1,16 +1,250 @@
 """Command-line interface for the HTTP benchmark framework."""
 
 import argparse
+import json
+import os
 import sys
+from typing import List
 from .benchmark import BenchmarkRunner
+from .convergence import MIN_BATCHES
+from .interleave import run_interleaved
 from .models.benchmark_configuration import BenchmarkConfiguration
+from .scenario import SCENARIO_MODES, load_scenario, method_label
+from .openapi import DEFAULT_CACHE_DIR, compile_scenario, generate_scenario, load_spec, parse_weights, write_scenario
+from .regression import DEFAULT_ALPHA, DEFAULT_TOLERANCE, REGRESSION_EXIT_CODE, check_regression, format_report
+from .scaling import run_thread_scaling_sweep, sweep_thread_counts
 from .storage import ResultStorage
+from .suite import expand_suite, load_suite, run_suite
+from .trials import compare_trials, format_trials, run_trials
+from .utils.cpu_affinity import parse_cpu_set
 from .utils.logging import app_logger
 
 
 def main():
     """Main entry point for the CLI."""
-    parser = argparse.ArgumentParser(description="HTTP Client Performance Benchmark Framework")
+    if sys.argv[1:2] == ["check"]:
+        check_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["suite"]:
+        suite_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["openapi"]:
+        openapi_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="HTTP Client Performance Benchmark Framework",
+        epilog="Run 'http-benchmark check --help' to gate a configuration against a pinned baseline, "
+        "'http-benchmark suite --help' to run a matrix of configurations from a suite file, "
+        "'http-benchmark openapi --help' to generate a scenario from an OpenAPI spec.",
+    )
+    _add_benchmark_arguments(parser)
+    parser.add_argument("--output", help="Output file for results")
+    parser.add_argument("--compare", nargs="+", help="Compare multiple client libraries")
+    parser.add_argument(
+        "--thread-sweep",
+        dest="thread_sweep",
+        type=int,
+        help="Run sync clients with 1, 2, 4, ... up to N threads and report scaling efficiency",
+    )
+    parser.add_argument(
+        "--soak-window",
+        dest="soak_window",
+        type=float,
+        help="Soak mode: aggregate and store results in rolling windows of this many seconds and test resources for leaks",
+    )
+    parser.add_argument("--tag", help="Pin the saved results under this tag, e.g. to use them as the baseline of 'http-benchmark check'")
+    parser.add_argument(
+        "--interleave",
+        type=float,
+        help="With --compare: cut each client's duration into slices of this many seconds and run them in shuffled round-robin order",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="With --compare: run each client this many times, alternating clients, and report confidence intervals and significant differences",
+    )
+
+    args = parser.parse_args()
+    _validate_benchmark_arguments(parser, args)
+
+    # Validate that either --client or --compare is provided
+    if not args.client and not args.compare:
+        parser.error("--client is required unless --compare is used")
+    if args.client and args.compare:
+        parser.error("--client and --compare cannot be used together")
+    if args.thread_sweep is not None and args.is_async:
+        parser.error("--thread-sweep applies to sync clients only")
+    if args.soak_window is not None and (args.compare or args.thread_sweep is not None):
+        parser.error("--soak-window applies to single benchmark runs only")
+    if args.soak_window is not None and args.soak_window <= 0:
+        parser.error("--soak-window must be positive")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.repeat > 1 and (not args.compare or args.thread_sweep is not None):
+        parser.error("--repeat applies to --compare only")
+    if args.interleave is not None:
+        if not args.compare or args.thread_sweep is not None or args.repeat > 1:
+            parser.error("--interleave applies to --compare only and cannot be combined with --repeat")
+        if not 0 < args.interleave <= args.duration:
+            parser.error("--interleave must be positive and at most --duration")
+        if args.target_precision is not None:
+            parser.error("--interleave runs fixed slices and cannot be combined with --target-precision")
+        if args.replay_path:
+            parser.error("--interleave runs fixed slices and cannot be combined with --replay")
+
+    try:
+        if args.thread_sweep is not None:
+            thread_sweep(args)
+        elif args.compare:
+            # Compare multiple client libraries
+            compare_clients(args)
+        else:
+            # Run a single benchmark
+            run_single_benchmark(args)
+    except Exception as e:
+        app_logger.error(f"Error running benchmark: {str(e)}")
+        sys.exit(1)
+
+
+def check_main(argv: List[str]) -> None:
+    """Entry point of `http-benchmark check`: run a configuration and fail on a significant regression against a baseline."""
+    parser = argparse.ArgumentParser(
+        prog="http-benchmark check",
+        description="Run a benchmark configuration and compare it with the baseline runs pinned under a tag; exits with status "
+        f"{REGRESSION_EXIT_CODE} on a significant regression of throughput or latency",
+    )
+    _add_benchmark_arguments(parser)
+    parser.add_argument("--baseline", required=True, help="Tag of the baseline runs (pinned with --tag)")
+    parser.add_argument("--runs", type=int, default=3, help="Number of candidate runs; the throughput test needs at least two")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level of the tests")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Smallest relative change that fails the check, e.g. 0.05 for 5%% (smaller significant changes are reported but pass)",
+    )
+    parser.add_argument("--tag", help="Also pin the candidate runs under this tag")
+
+    args = parser.parse_args(argv)
+    _validate_benchmark_arguments(parser, args)
+    if not args.client:
+        parser.error("--client is required")
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    if not 0 < args.alpha < 1:
+        parser.error("--alpha must be between 0 and 1")
+
+    try:
+        regression = check_against_baseline(args)
+    except Exception as e:
+        app_logger.error(f"Error running regression check: {str(e)}")
+        sys.exit(1)
+    if regression:
+        sys.exit(REGRESSION_EXIT_CODE)
+
+
+def suite_main(argv: List[str]) -> None:
+    """Entry point of `http-benchmark suite`: expand a suite file into its matrix of configurations and run them."""
+    parser = argparse.ArgumentParser(
+        prog="http-benchmark suite",
+        description="Run every combination of a suite file's matrix, with a cooldown between runs; results are tagged with the suite run ID",
+    )
+    parser.add_argument("path", help="Suite file (.toml, .yaml, .yml or .json)")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Continue an interrupted suite run, skipping the combinations it already saved")
+    parser.add_argument("--cooldown", type=float, help="Seconds to pause between runs (overrides the suite's cooldown_seconds)")
+    parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="List the combinations that would run and the skipped ones, then exit")
+
+    args = parser.parse_args(argv)
+    if args.cooldown is not None and args.cooldown < 0:
+        parser.error("--cooldown must not be negative")
+
+    try:
+        suite = load_suite(args.path)
+        if args.cooldown is not None:
+            suite["cooldown_seconds"] = args.cooldown
+        if args.dry_run:
+            runs, skipped = expand_suite(suite)
+            print(f"Suite {suite['name']}: {len(runs)} runs, {len(skipped)} skipped")
+            for run in runs:
+                print(f"  run   {run['key']}")
+            for skip in skipped:
+                print(f"  skip  {skip['key']} ({skip['reason']})")
+            return
+        run_suite_file(suite, args.resume)
+    except Exception as e:
+        app_logger.error(f"Error running suite: {str(e)}")
+        sys.exit(1)
+
+
+def openapi_main(argv: List[str]) -> None:
+    """Entry point of `http-benchmark openapi`: generate a scenario file covering the operations of an OpenAPI or Swagger spec."""
+    parser = argparse.ArgumentParser(
+        prog="http-benchmark openapi",
+        description="Write a JSONL scenario with one request per operation of an OpenAPI/Swagger spec, parameter values synthesized from the schemas",
+    )
+    parser.add_argument("spec", help="Spec file (.json, .yaml or .yml)")
+    parser.add_argument("--output", "-o", required=True, help="Scenario file to write, for use with --scenario")
+    _add_openapi_filter_arguments(parser, prefix="")
+
+    args = parser.parse_args(argv)
+    try:
+        weights = parse_weights(args.openapi_weights or [])
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        lines = generate_scenario(load_spec(args.spec), args.openapi_exclude or [], weights)
+        write_scenario(lines, args.output)
+    except Exception as e:
+        app_logger.error(f"Error generating scenario: {str(e)}")
+        sys.exit(1)
+    total_weight = sum(line["weight"] for line in lines)
+    print(f"{'Operation':<70} {'Share':>7}")
+    print("-" * 78)
+    for line in lines:
+        print(f"{line['name']:<70} {line['weight'] / total_weight * 100:>6.1f}%")
+    print(f"\nWrote {len(lines)} operations to {args.output}")
+
+
+def _add_openapi_filter_arguments(parser: argparse.ArgumentParser, prefix: str) -> None:
+    """Options selecting and weighting the operations of a spec; `prefix` is prepended to the option names."""
+    parser.add_argument(
+        f"--{prefix}exclude",
+        dest="openapi_exclude",
+        action="append",
+        metavar="PATTERN",
+        help="Leave out operations whose operationId, 'METHOD /path' or path matches this glob, e.g. '/delay/*' (repeatable)",
+    )
+    parser.add_argument(
+        f"--{prefix}weight",
+        dest="openapi_weights",
+        action="append",
+        metavar="PATTERN=WEIGHT",
+        help="Weight of the operations matching PATTERN in the mix (default: their x-benchmark-weight, else 1; 0 leaves them out; repeatable)",
+    )
+
+
+def run_suite_file(suite, resume=None) -> None:
+    """Run a loaded suite, printing a row per result as it completes and the suite run ID to resume with."""
+    with ResultStorage() as storage:
+        print(f"{'Combination':<70} {'RPS':<10} {'p99 ms':<10} {'Error Rate':<10}")
+        print("-" * 103)
+        outcome = run_suite(
+            suite,
+            storage,
+            run_id=resume,
+            on_result=lambda run, result: print(f"{run['key']:<70} {result.requests_per_second:<10.2f} {result.p99_response_time * 1000:<10.3f} {result.error_rate:<10.2f}"),
+        )
+    print(
+        f"\nSuite run {outcome['run_id']}: {len(outcome['results'])} runs completed, {outcome['resumed']} already done, "
+        f"{len(outcome['skipped'])} combinations skipped; results are tagged '{outcome['run_id']}'"
+    )
+
+
+def _add_benchmark_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options describing the benchmarked configuration, shared by the main command and `check`."""
     parser.add_argument("--url", required=True, help="Target URL to benchmark")
     parser.add_argument(
         "--client",
@@ -28,9 +262,15 @@ def main():
     parser.add_argument("--duration", type=int, default=30, help="Duration of benchmark in seconds")
     parser.add_argument("--headers", help="HTTP headers in JSON format")
     parser.add_argument("--body", help="Request body content")
+    parser.add_argument("--profile", action="store_true", help="Sample Python stacks during the run and write collapsed stacks per run")
+    parser.add_argument("--profile-dir", dest="profile_dir", default="profiles", help="Directory for profile output files")
+    parser.add_argument(
+        "--track-allocations",
+        dest="track_allocations",
+        action="store_true",
+        help="Track allocations with tracemalloc between warm-up end and run end (slows the run down)",
+    )
     parser.add_argument("--async", dest="is_async", action="store_true", help="Use async requests")
-    parser.add_argument("--output", help="Output file for results")
-    parser.add_argument("--compare", nargs="+", help="Compare multiple client libraries")
     parser.add_argument(
         "--verify-ssl",
         dest="verify_ssl",
@@ -38,58 +278,154 @@ def main():
         default=False,
         help="Enable SSL verification (disabled by default)",
     )
+    parser.add_argument("--warmup", type=int, default=0, help="Number of untimed warm-up requests before measurement starts")
+    parser.add_argument(
+        "--gc-mode",
+        dest="gc_mode",
+        default="default",
+        choices=["default", "freeze", "disable", "tuned"],
+        help="Garbage collector mode for the run (freeze applies gc.freeze() after warm-up)",
+    )
+    parser.add_argument(
+        "--monitor-interval",
+        dest="monitor_interval",
+        type=float,
+        default=0.2,
+        help="Resource sampling interval in seconds (minimum 0.01)",
+    )
+    parser.add_argument(
+        "--monitor-mode",
+        dest="monitor_mode",
+        default="thread",
+        choices=["thread", "process"],
+        help="Sample resources from a thread in the benchmark process or from a separate sampler process (Linux)",
+    )
+    parser.add_argument(
+        "--loop-debug",
+        dest="loop_debug",
+        action="store_true",
+        help="Run the event loop in asyncio debug mode to count slow callbacks (async runs; slows the loop down)",
+    )
+    parser.add_argument("--gc-thresholds", dest="gc_thresholds", help="Comma-separated gc.set_threshold() values, e.g. 50000,20,20")
+    parser.add_argument("--monitor-pid", dest="monitor_pids", type=int, action="append", help="PID of a target server process to monitor (repeatable)")
+    parser.add_argument(
+        "--monitor-process",
+        dest="monitor_processes",
+        action="append",
+        help="Name pattern of target server processes to monitor, e.g. 'nginx*' (repeatable)",
+    )
+    parser.add_argument("--monitor-cgroup", dest="monitor_cgroup", help="Cgroup of the target server to monitor, e.g. /system.slice/nginx.service")
+    parser.add_argument("--cpu-set", dest="cpu_set", help="Pin the benchmark process to these CPUs, e.g. 0-3 (Linux)")
+    parser.add_argument("--target-cpu-set", dest="target_cpu_set", help="Pin the monitored target processes to these CPUs, e.g. 4-7 (needs --monitor-pid/-process/-cgroup)")
+    parser.add_argument(
+        "--target-precision",
+        dest="target_precision",
+        type=float,
+        help="Adaptive duration: stop once the 95%% confidence intervals of RPS and p99 are within this fraction of their mean, e.g. 0.02; --duration becomes the maximum",
+    )
+    parser.add_argument(
+        "--batch-seconds",
+        dest="batch_seconds",
+        type=float,
+        default=1.0,
+        help="Initial batch length of the batch means behind --target-precision (doubles as batches are merged)",
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each benchmark in a freshly spawned subprocess so imports, RSS, sockets and GC state of other runs do not leak into it",
+    )
+    parser.add_argument(
+        "--scenario",
+        dest="scenario_path",
+        help="JSONL file of requests (method, url, headers, body, weight, name) to replay instead of --method/--body; relative URLs resolve against --url",
+    )
+    parser.add_argument(
+        "--scenario-mode",
+        dest="scenario_mode",
+        choices=SCENARIO_MODES,
+        default="weighted",
+        help="Pick scenario requests at random by weight, or replay them in file order",
+    )
+    parser.add_argument("--scenario-seed", dest="scenario_seed", type=int, help="Random seed of weighted scenario sampling")
+    parser.add_argument(
+        "--openapi",
+        dest="openapi_spec",
+        help="Replay a scenario covering every operation of this OpenAPI/Swagger spec; it is compiled once and cached under --openapi-cache",
+    )
+    _add_openapi_filter_arguments(parser, prefix="openapi-")
+    parser.add_argument("--openapi-cache", dest="openapi_cache", default=DEFAULT_CACHE_DIR, help="Directory of compiled --openapi scenarios")
+    parser.add_argument(
+        "--replay",
+        dest="replay_path",
+        help="Replay captured traffic (a .har file or an nginx access log, optionally .gz) against --url at its recorded pace; --duration caps the replay",
+    )
+    parser.add_argument("--replay-speedup", dest="replay_speedup", type=float, default=1.0, help="Replay this many times faster than recorded, e.g. 2 or 0.5")
 
-    args = parser.parse_args()
-
-    # Validate that either --client or --compare is provided
-    if not args.client and not args.compare:
-        parser.error("--client is required unless --compare is used")
-    if args.client and args.compare:
-        parser.error("--client and --compare cannot be used together")
 
-    try:
-        if args.compare:
-            # Compare multiple client libraries
-            compare_clients(args)
-        else:
-            # Run a single benchmark
-            run_single_benchmark(args)
-    except Exception as e:
-        app_logger.error(f"Error running benchmark: {str(e)}")
-        sys.exit(1)
+def _validate_benchmark_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Parse and check the options added by _add_benchmark_arguments."""
+    if args.gc_thresholds:
+        try:
+            args.gc_thresholds = [int(value) for value in args.gc_thresholds.split(",")]
+        except ValueError:
+            parser.error("--gc-thresholds must be comma-separated integers")
+    for option, dest in (("--cpu-set", "cpu_set"), ("--target-cpu-set", "target_cpu_set")):
+        if getattr(args, dest):
+            try:
+                setattr(args, dest, parse_cpu_set(getattr(args, dest)))
+            except ValueError:
+                parser.error(f"{option} must be a CPU list such as 0-3,6")
+    if args.target_cpu_set and not (args.monitor_pids or args.monitor_processes or args.monitor_cgroup):
+        parser.error("--target-cpu-set needs --monitor-pid, --monitor-process or --monitor-cgroup")
+    if args.target_precision is not None:
+        if not 0 < args.target_precision < 1:
+            parser.error("--target-precision must be between 0 and 1")
+        if args.batch_seconds <= 0:
+            parser.error("--batch-seconds must be positive")
+        if args.duration < MIN_BATCHES * args.batch_seconds:
+            parser.error(f"--duration must allow at least {MIN_BATCHES} batches of --batch-seconds")
+    if args.openapi_spec:
+        if args.scenario_path:
+            parser.error("--openapi and --scenario cannot be combined")
+        try:
+            weights = parse_weights(args.openapi_weights or [])
+            args.scenario_path = compile_scenario(args.openapi_spec, args.openapi_exclude or [], weights, args.openapi_cache)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"--openapi: {e}")
+    if args.replay_path:
+        if args.scenario_path:
+            parser.error("--replay cannot be combined with --scenario or --openapi")
+        if args.target_precision is not None:
+            parser.error("--replay follows the capture's timing and cannot be combined with --target-precision")
+        if args.replay_speedup <= 0:
+            parser.error("--replay-speedup must be positive")
+        if not os.path.isfile(args.replay_path):
+            parser.error(f"--replay: no such file {args.replay_path}")
+    if args.scenario_path:
+        try:
+            load_scenario(args.scenario_path, args.url)
+        except (OSError, ValueError) as e:
+            parser.error(f"--scenario: {e}")
 
 
 def run_single_benchmark(args) -> None:
     """Run a single benchmark."""
     app_logger.info(f"Starting benchmark for {args.url} using {args.client}")
 
-    # Parse headers if provided
-    headers = {}
-    if args.headers:
-        import json
-
-        try:
-            headers = json.loads(args.headers)
-        except json.JSONDecodeError:
-            app_logger.error("Invalid JSON in headers argument")
-            return
-
-    # Create benchmark configuration
-    config = BenchmarkConfiguration(
-        target_url=args.url,
-        http_method=args.method,
-        headers=headers,
-        body=args.body or "",
-        concurrency=args.concurrency,
-        duration_seconds=args.duration,
-        client_library=args.client,
-        is_async=args.is_async,
-        verify_ssl=args.verify_ssl,
-    )
+    try:
+        config = _config_from_args(args, soak_window_seconds=args.soak_window)
+    except json.JSONDecodeError:
+        app_logger.error("Invalid JSON in headers argument")
+        return
 
-    # Run the benchmark
-    runner = BenchmarkRunner(config)
-    result = runner.run()
+    # Run and store the benchmark; soak windows are stored as they close, from a background writer so the measurement loop never waits on disk
+    with ResultStorage(background=True) as storage:
+        runner = BenchmarkRunner(config, storage=storage)
+        result = runner.run()
+        storage.save_result(result)
+        if args.tag:
+            storage.tag_results(args.tag, [result.id])
 
     # Print results
     print("Benchmark Results:")
@@ -106,56 +442,307 @@ def run_single_benchmark(args) -> None:
     print(f"  99th Percentile: {result.p99_response_time:.3f}s")
     print(f"  Error Rate: {result.error_rate:.2f}%")
     print(f"  CPU Usage (avg): {result.cpu_usage_avg:.2f}%")
+    if result.cpu_budget:
+        budget = result.cpu_budget
+        limit = f", cgroup limit {budget['cgroup_limit_cores']:.2f}" if budget.get("cgroup_limit_cores") is not None else ""
+        throttled = budget["throttling"].get("throttled_seconds")
+        print(
+            f"  CPU Budget: {result.cpu_budget_cores:.2f} cores (CPUs {budget['affinity']}{limit}), "
+            f"{result.cpu_usage_normalized:.2f}% used" + (f", throttled {throttled:.2f}s" if throttled is not None else "")
+        )
     print(f"  Memory Usage (avg): {result.memory_usage_avg:.2f}MB")
-
-    # Store results
-    storage = ResultStorage()
-    storage.save_result(result)
+    print(f"  CPU Time (user/system): {result.cpu_time_user:.3f}s / {result.cpu_time_system:.3f}s")
+    print(f"  CPU per Request: {result.cpu_us_per_request:.1f}µs (adapter: {result.adapter_cpu_us_per_request:.1f}µs)")
+    print(f"  Requests per CPU-second: {result.requests_per_cpu_second:.2f}")
+    if result.network_io.get("open_sockets_max") is not None:
+        network_io = result.network_io
+        # TCP_INFO and /proc/net are Linux-only; their counters are None elsewhere
+        retransmits = "n/a" if network_io.get("tcp_retransmits") is None else network_io["tcp_retransmits"]
+        time_wait = "n/a" if network_io.get("time_wait_max") is None else network_io["time_wait_max"]
+        print(f"  Network (process): {network_io['bytes_sent']} bytes sent / {network_io['bytes_recv']} bytes received, {retransmits} TCP retransmits")
+        print(f"  Sockets: {network_io['open_sockets_max']} open max, {network_io['connections_max'].get('ESTABLISHED', 0)} established max, {time_wait} in TIME_WAIT to target max")
+    if result.target_metrics:
+        target = result.target_metrics
+        print(
+            f"  Target CPU (avg/max): {target['cpu_avg']:.2f}% / {target['cpu_max']:.2f}% of {target['cpu_capacity_percent']:.0f}% "
+            f"across {target['process_count_max']} processes, Memory (avg): {target['memory_mb_avg']:.2f}MB"
+        )
+        if target["server_saturated"]:
+            print("  Target was CPU-saturated: the run measured the server, not the client")
+    if result.event_loop_stats:
+        lag = result.event_loop_stats["lag"]
+        delay = result.event_loop_stats["scheduling_delay"]
+        print(f"  Event Loop Lag (p50/p99/max): {lag['p50'] * 1000:.2f}ms / {lag['p99'] * 1000:.2f}ms / {lag['max'] * 1000:.2f}ms")
+        print(f"  Task Scheduling Delay (p50/p99): {delay['p50'] * 1000:.2f}ms / {delay['p99'] * 1000:.2f}ms")
+        if result.event_loop_stats["slow_callbacks"] is not None:
+            print(f"  Slow Callbacks (>{result.event_loop_stats['slow_callback_duration'] * 1000:.0f}ms): {result.event_loop_stats['slow_callbacks']}")
+    if result.gc_stats:
+        print(
+            f"  GC ({result.gc_stats['mode']}): {result.gc_stats['collections']} collections, "
+            f"{result.gc_stats['total_pause'] * 1000:.2f}ms total pause, {result.gc_stats['max_pause'] * 1000:.2f}ms max pause"
+        )
+    if result.allocation_stats:
+        print(
+            f"  Allocations per Request: {result.allocation_stats['bytes_per_request']:.0f} bytes / "
+            f"{result.allocation_stats['blocks_per_request']:.1f} blocks (peak traced {result.allocation_stats['peak_traced_mb']:.2f}MB)"
+        )
+        for site in result.allocation_stats["top_sites"]:
+            print(f"    {site['size_diff']:>12} bytes  {site['site']}")
+    monitor = result.config_snapshot.get("monitor") if isinstance(result.config_snapshot, dict) else None
+    if monitor:
+        print(f"  Monitor ({monitor['mode']}): {monitor['sample_count']} samples, sampler CPU {monitor.get('sampler_cpu_percent', 0.0):.2f}% of a core")
+    if result.soak_stats:
+        soak = result.soak_stats
+        print(f"  Soak: {soak['window_count']} windows of {soak['window_seconds']:.0f}s")
+        for metric, trend in soak["trends"].items():
+            print(f"    {metric:<18} {trend['first']:>10.2f} -> {trend['last']:<10.2f} trend {trend['trend']} (p={trend['p_value']:.3f})")
+        if soak["leak_suspected"]:
+            print(f"  Suspected leak: {', '.join(soak['suspected_leaks'])}")
+    if result.convergence_stats:
+        convergence = result.convergence_stats
+        precision = {metric: f"±{value * 100:.2f}%" if value is not None else "n/a" for metric, value in convergence["precision"].items()}
+        print(
+            f"  Adaptive Duration: {'converged' if convergence['converged'] else 'stopped at --duration'} with {convergence['batches']} batches "
+            f"of {convergence['batch_seconds']:g}s; RPS {precision['requests_per_second']}, p99 {precision['p99_response_time']} "
+            f"({convergence['confidence'] * 100:.0f}% CI, target ±{convergence['target_precision'] * 100:.2f}%)"
+        )
+    if result.replay_stats:
+        replay = result.replay_stats
+        lag = replay["schedule_lag"]
+        print(f"  Replay: {replay['requests']} requests from {replay['source']} at {replay['speedup']:g}x{' (stopped at --duration)' if replay['truncated'] else ''}")
+        print(f"    Schedule lag (p50/p99/max): {lag['p50'] * 1000:.2f}ms / {lag['p99'] * 1000:.2f}ms / {lag['max'] * 1000:.2f}ms")
+        if replay["compared"]:
+            ratio = replay["latency_ratio"]
+            print(
+                f"    Latency vs recorded (p50/p95/p99 ratio): {ratio['p50']:.2f}x / {ratio['p95']:.2f}x / {ratio['p99']:.2f}x; "
+                f"{replay['slower_share'] * 100:.1f}% of {replay['compared']} requests slower"
+            )
+        print(f"    Status mismatches: {replay['status_mismatches']}")
+        width = max(len(endpoint) for endpoint in result.endpoint_stats)
+        print(f"    {'Endpoint':<{width}} {'Share':>7} {'Requests':>9} {'Errors':>7} {'p50 (ms)':>9} {'Rec p50':>9} {'p99 (ms)':>9} {'Rec p99':>9}")
+        for endpoint, stats in result.endpoint_stats.items():
+            print(
+                f"    {endpoint:<{width}} {stats['share'] * 100:>6.1f}% {stats['requests']:>9} {stats['errors']:>7} {stats['p50_response_time'] * 1000:>9.2f} "
+                f"{stats['recorded_p50_response_time'] * 1000:>9.2f} {stats['p99_response_time'] * 1000:>9.2f} {stats['recorded_p99_response_time'] * 1000:>9.2f}"
+            )
+    elif result.endpoint_stats:
+        print(f"  Endpoints ({result.config_snapshot.get('scenario_mode', 'weighted')}):")
+        width = max(len(endpoint) for endpoint in result.endpoint_stats)
+        print(f"    {'Endpoint':<{width}} {'Share':>7} {'Expected':>9} {'Requests':>9} {'Errors':>7} {'Avg (ms)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+        for endpoint, stats in result.endpoint_stats.items():
+            print(
+                f"    {endpoint:<{width}} {stats['share'] * 100:>6.1f}% {stats['expected_share'] * 100:>8.1f}% {stats['requests']:>9} {stats['errors']:>7} "
+                f"{stats['avg_response_time'] * 1000:>9.2f} {stats['p50_response_time'] * 1000:>9.2f} {stats['p95_response_time'] * 1000:>9.2f} {stats['p99_response_time'] * 1000:>9.2f}"
+            )
+    isolation = result.config_snapshot.get("isolation") if isinstance(result.config_snapshot, dict) else None
+    if isolation:
+        print(
+            f"  Isolation ({isolation['start_method']}, PID {isolation['pid']}): RSS {isolation['rss_baseline_mb']:.1f}MB before imports, "
+            f"+{isolation['import_mb']:.1f}MB for imports, {isolation['run_growth_mb']:+.1f}MB over the run"
+        )
+    if result.profile_path:
+        print(f"  Profile: {result.profile_path}")
     app_logger.info(f"Benchmark result saved with ID: {result.id}")
 
 
 def compare_clients(args) -> None:
     """Compare multiple client libraries."""
     app_logger.info(f"Comparing clients: {', '.join(args.compare)} for {args.url}")
+    with ResultStorage() as storage:
+        if args.repeat > 1:
+            compare_clients_repeated(args, storage)
+            return
+        if args.interleave is not None:
+            compare_clients_interleaved(args, storage)
+            return
 
-    results = []
+        results = []
 
-    for client in args.compare:
-        app_logger.info(f"Running benchmark with {client}")
+        for client in args.compare:
+            app_logger.info(f"Running benchmark with {client}")
 
-        # Create benchmark configuration
-        config = BenchmarkConfiguration(
-            target_url=args.url,
-            http_method=args.method,
-            concurrency=args.concurrency,
-            duration_seconds=args.duration,
-            client_library=client,
-            is_async=args.is_async,
-            verify_ssl=args.verify_ssl,
-        )
+            # Create benchmark configuration
+            config = _comparison_config(args, client)
 
-        # Run the benchmark
-        runner = BenchmarkRunner(config)
-        result = runner.run()
-        results.append(result)
+            # Run the benchmark
+            runner = BenchmarkRunner(config)
+            result = runner.run()
+            results.append(result)
 
-        # Store result
-        storage = ResultStorage()
-        storage.save_result(result)
-        app_logger.info(f"Result for {client} saved with ID: {result.id}")
+            # Store result
+            storage.save_result(result)
+            app_logger.info(f"Result for {client} saved with ID: {result.id}")
+            if result.profile_path:
+                app_logger.info(f"Profile for {client} written to {result.profile_path}")
+
+        if args.tag:
+            storage.tag_results(args.tag, [result.id for result in results])
+
+    _print_comparison(args.url, results)
 
-    # Print comparison
-    print(f"\nComparison Results for {args.url}:")
-    print(f"{'Client':<12} {'RPS':<10} {'Avg Time':<12} {'Error Rate':<12} {'CPU %':<8} {'Memory MB':<10}")
-    print("-" * 70)
+
+def _print_comparison(url: str, results) -> None:
+    """Print one row per client result."""
+    print(f"\nComparison Results for {url}:")
+    print(f"{'Client':<12} {'RPS':<10} {'Avg Time':<12} {'Error Rate':<12} {'CPU %':<8} {'Memory MB':<10} {'CPU µs/req':<12} {'Req/CPU-s':<10}")
+    print("-" * 94)
 
     for result in results:
         print(
             f"{result.client_library:<12} {result.requests_per_second:<10.2f} "
             f"{result.avg_response_time:<12.3f} {result.error_rate:<12.2f} "
-            f"{result.cpu_usage_avg:<8.2f} {result.memory_usage_avg:<10.2f}"
+            f"{result.cpu_usage_avg:<8.2f} {result.memory_usage_avg:<10.2f} "
+            f"{result.cpu_us_per_request:<12.1f} {result.requests_per_cpu_second:<10.2f}"
         )
 
 
+def _config_from_args(args, **overrides) -> BenchmarkConfiguration:
+    """Configuration described by the options of _add_benchmark_arguments; `overrides` replace individual fields."""
+    fields = dict(
+        target_url=args.url,
+        http_method=args.method,
+        headers=json.loads(args.headers) if args.headers else {},
+        body=args.body or "",
+        concurrency=args.concurrency,
+        duration_seconds=args.duration,
+        client_library=args.client,
+        is_async=args.is_async,
+        verify_ssl=args.verify_ssl,
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+        warmup_requests=args.warmup,
+        gc_mode=args.gc_mode,
+        gc_thresholds=args.gc_thresholds,
+        track_allocations=args.track_allocations,
+        monitor_interval=args.monitor_interval,
+        monitor_mode=args.monitor_mode,
+        loop_debug=args.loop_debug,
+        monitor_pids=args.monitor_pids,
+        monitor_processes=args.monitor_processes,
+        monitor_cgroup=args.monitor_cgroup,
+        cpu_set=args.cpu_set,
+        target_cpu_set=args.target_cpu_set,
+        target_precision=args.target_precision,
+        batch_seconds=args.batch_seconds,
+        isolate=args.isolate,
+        scenario_path=args.scenario_path,
+        scenario_mode=args.scenario_mode,
+        scenario_seed=args.scenario_seed,
+        replay_path=args.replay_path,
+        replay_speedup=args.replay_speedup,
+    )
+    fields.update(overrides)
+    return BenchmarkConfiguration(**fields)
+
+
+def _comparison_config(args, client: str) -> BenchmarkConfiguration:
+    """Configuration of one client of a comparison."""
+    return _config_from_args(args, client_library=client)
+
+
+def compare_clients_repeated(args, storage: ResultStorage) -> None:
+    """Compare clients over `args.repeat` trials each, with confidence intervals and significance of the differences."""
+    configs = {client: _comparison_config(args, client) for client in args.compare}
+    trials = run_trials(configs, args.repeat, on_result=lambda client, trial, result: storage.save_result(result))
+    comparison = compare_trials(trials)
+    comparison.update(
+        name=f"Comparison of {', '.join(args.compare)} for {args.url}",
+        url=args.url,
+        http_method=args.method,
+        concurrency_level=args.concurrency,
+        trials=args.repeat,
+    )
+    storage.save_comparison(comparison)
+    if args.tag:
+        storage.tag_results(args.tag, [result.id for results in trials.values() for result in results])
+
+    print(f"\nComparison of {args.repeat} trials per client for {args.url} (comparison ID {comparison['id']}):")
+    print(format_trials(comparison))
+
+
+def compare_clients_interleaved(args, storage: ResultStorage) -> None:
+    """Compare clients in interleaved slices of `args.interleave` seconds and report the drift over the run."""
+    configs = {client: _comparison_config(args, client) for client in args.compare}
+    interleaved = run_interleaved(configs, args.interleave)
+    results = list(interleaved["results"].values())
+    for result in results:
+        storage.save_result(result)
+        app_logger.info(f"Merged result of {len(interleaved['slices'][result.client_library])} slices for {result.client_library} saved with ID: {result.id}")
+    if args.tag:
+        storage.tag_results(args.tag, [result.id for result in results])
+
+    _print_comparison(args.url, results)
+    drift = interleaved["drift"]
+    print(
+        f"\nInterleaved in {drift['rounds']} rounds of {args.interleave:g}s slices; throughput drift {drift['slope_percent_per_round']:+.2f}% per round, "
+        f"{drift['total_percent']:+.1f}% over the run (trend {drift['trend']}, p={drift['p_value']:.3f})"
+    )
+    for client, client_drift in drift["clients"].items():
+        print(f"  {client:<12} slice RPS {' '.join(f'{rps:.0f}' for rps in client_drift['slice_rps'])}  ({client_drift['slope_percent_per_round']:+.2f}% per round)")
+
+
+def check_against_baseline(args) -> bool:
+    """Run the configuration `args.runs` times, test it against the runs tagged `args.baseline` and print the diff.
+
+    Baseline runs must match the client, its sync/async mode, URL, method and concurrency, and run the same
+    scenario file or replay the same capture at the same speedup; scenario runs are stored under their method label (MIXED when
+    methods differ) and replays as REPLAY. Returns whether a significant regression was found.
+    """
+    config = _config_from_args(args)
+
+    # The method the runner stores results under
+    if args.replay_path:
+        http_method = "REPLAY"
+    elif args.scenario_path:
+        http_method = method_label(load_scenario(args.scenario_path, args.url))
+    else:
+        http_method = args.method
+    workload = {"scenario_path": args.scenario_path, "replay_path": args.replay_path}
+    if args.replay_path:
+        workload["replay_speedup"] = args.replay_speedup
+
+    with ResultStorage() as storage:
+        client_type = "async" if args.is_async else "sync"
+        baseline = [
+            result
+            for result in storage.iter_results(tag=args.baseline, client_library=args.client, url=args.url, http_method=http_method, concurrency=args.concurrency)
+            if result.client_type == client_type and all(result.config_snapshot.get(key) == value for key, value in workload.items())
+        ]
+        if not baseline:
+            raise ValueError(f"No runs tagged '{args.baseline}' match this configuration; pin baseline runs with --tag {args.baseline}")
+
+        candidate = []
+        for run in range(args.runs):
+            app_logger.info(f"Regression check: candidate run {run + 1} of {args.runs}")
+            result = BenchmarkRunner(config).run()
+            storage.save_result(result)
+            candidate.append(result)
+        if args.tag:
+            storage.tag_results(args.tag, [result.id for result in candidate])
+
+    report = check_regression(baseline, candidate, alpha=args.alpha, tolerance=args.tolerance)
+    print(format_report(report, args.baseline))
+    return report["regression"]
+
+
+def thread_sweep(args) -> None:
+    """Measure how each sync client scales with the number of worker threads."""
+    with ResultStorage() as storage:
+        for client in args.compare or [args.client]:
+            config = _config_from_args(args, client_library=client)
+            points = run_thread_scaling_sweep(config, sweep_thread_counts(args.thread_sweep))
+            for point in points:
+                storage.save_result(point["result"])
+
+            gil_state = "enabled" if points[0]["result"].threading_stats.get("gil_enabled", True) else "disabled"
+            print(f"\nThread Scaling for {client} (GIL {gil_state}):")
+            print(f"{'Threads':<10} {'RPS':<10} {'Speedup':<10} {'Efficiency':<12} {'Worker CPU':<12} {'GIL Wait':<10}")
+            print("-" * 67)
+            for point in points:
+                contention = point["gil_contention_estimate"]
+                contention_text = f"{contention * 100:.1f}%" if contention is not None else "n/a"
+                print(f"{point['threads']:<10} {point['requests_per_second']:<10.2f} {point['speedup']:<10.2f} {point['efficiency']:<12.2f} {point['worker_cpu_utilization']:<12.2f} {contention_text}")
+
+
 if __name__ == "__main__":
     main()
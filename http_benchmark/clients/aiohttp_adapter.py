@@ -11,6 +11,9 @@ from ..models.http_request import HTTPRequest
 class AiohttpAdapter(BaseHTTPAdapter):
     """HTTP adapter for the aiohttp library."""
 
+    packages = ("aiohttp", "multidict", "yarl")
+    supports_sync = False
+
     def __init__(self):
         super().__init__("aiohttp")
         self.session = None
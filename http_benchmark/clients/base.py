@@ -1,13 +1,20 @@
 """Base HTTP client adapter for the HTTP benchmark framework."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from ..models.http_request import HTTPRequest
 
 
 class BaseHTTPAdapter(ABC):
     """Base class for all HTTP client adapters."""
 
+    # Top-level packages that implement the client, used to attribute allocations to the library
+    packages: Tuple[str, ...] = ()
+
+    # Execution modes the adapter implements; the other mode's methods raise NotImplementedError
+    supports_sync = True
+    supports_async = True
+
     def __init__(self, name: str):
         self.name = name
         self._session = None
@@ -12,6 +12,8 @@ from .base import BaseHTTPAdapter
 class HttpxAdapter(BaseHTTPAdapter):
     """HTTP adapter for the httpx library."""
 
+    packages = ("httpx", "httpcore", "h11")
+
     def __init__(self):
         super().__init__("httpx")
         self.client = None
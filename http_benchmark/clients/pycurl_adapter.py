@@ -11,6 +11,9 @@ import time
 class PycurlAdapter(BaseHTTPAdapter):
     """HTTP adapter for the pycurl library."""
 
+    packages = ("pycurl",)
+    supports_async = False
+
     def __init__(self):
         super().__init__("pycurl")
         self.curl = None
@@ -9,6 +9,9 @@ from ..models.http_request import HTTPRequest
 class RequestsAdapter(BaseHTTPAdapter):
     """HTTP adapter for the requests library."""
 
+    packages = ("requests", "urllib3")
+    supports_async = False
+
     def __init__(self):
         super().__init__("requests")
         self.session = None
@@ -12,6 +12,8 @@ from .base import BaseHTTPAdapter
 class RequestXAdapter(BaseHTTPAdapter):
     """HTTP adapter for the requestx library."""
 
+    packages = ("requestx",)
+
     def __init__(self):
         super().__init__("requestx")
         self.client = None
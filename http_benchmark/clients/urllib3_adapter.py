@@ -10,6 +10,9 @@ from ..models.http_request import HTTPRequest
 class Urllib3Adapter(BaseHTTPAdapter):
     """HTTP adapter for the urllib3 library."""
 
+    packages = ("urllib3",)
+    supports_async = False
+
     def __init__(self):
         super().__init__("urllib3")
         self.pool = None
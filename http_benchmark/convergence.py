@@ -0,0 +1,134 @@
+"""Adaptive run length from batch means for the HTTP benchmark framework."""
+
+import math
+import time
+from statistics import mean, stdev
+from typing import Any, Dict, List, Optional, Sequence
+
+from .utils.histogram import LatencyHistogram
+from .utils.logging import app_logger
+from .utils.stats import t_isf
+
+# Confidence level of the precision estimate
+DEFAULT_CONFIDENCE = 0.95
+
+# A run never stops on precision before this many batches are closed
+MIN_BATCHES = 10
+
+# When this many batches are closed, neighbouring pairs are merged and the batch length doubles
+MAX_BATCHES = 64
+
+
+def relative_half_width(values: Sequence[float], confidence: float = DEFAULT_CONFIDENCE) -> Optional[float]:
+    """Half-width of the t confidence interval of the mean of `values`, relative to the mean; None with fewer than two values."""
+    if len(values) < 2:
+        return None
+    center = mean(values)
+    if not center:
+        return None
+    return t_isf((1 - confidence) / 2, len(values) - 1) * stdev(values) / math.sqrt(len(values)) / abs(center)
+
+
+class ConvergenceMonitor:
+    """Decide when a run has measured its throughput and tail latency precisely enough.
+
+    The measured phase is cut into consecutive batches of `batch_seconds`, each giving one RPS and one p99.
+    Single requests are strongly correlated, but batches long enough are close to independent, so the t
+    interval over the batch values (batch means) estimates how precise the run's figures are. The run has
+    converged once at least ``MIN_BATCHES`` batches are closed and the interval of both RPS and p99,
+    relative to their mean, is within `target`. At ``MAX_BATCHES`` neighbouring batches are merged in
+    pairs, which doubles the batch length: the batches of a long run get longer and less correlated, and
+    memory stays bounded. Every batch close appends a point to the convergence trace.
+    """
+
+    def __init__(self, target: float, batch_seconds: float = 1.0, confidence: float = DEFAULT_CONFIDENCE):
+        if not 0 < target < 1:
+            raise ValueError("Target precision must be between 0 and 1")
+        if batch_seconds <= 0:
+            raise ValueError("Batch length must be positive")
+        self.target = target
+        self.batch_seconds = batch_seconds
+        self.confidence = confidence
+        self.converged = False
+        self.trace: List[Dict[str, Any]] = []
+        self._batches: List[Dict[str, Any]] = []
+        self._histogram = LatencyHistogram()
+        self._start = 0.0
+        self._batch_start = 0.0
+        self._batch_errors_start = 0
+
+    def start(self) -> None:
+        """Open the first batch; call when the measured phase starts."""
+        self._start = self._batch_start = time.perf_counter()
+
+    def record(self, response_time: float) -> None:
+        """Record the latency of one successful request."""
+        self._histogram.record(response_time)
+
+    def tick(self, error_count: int) -> None:
+        """Close the current batch if its time is up; `error_count` is the run's error count so far."""
+        now = time.perf_counter()
+        if now - self._batch_start >= self.batch_seconds:
+            self._close_batch(now, error_count)
+
+    def _close_batch(self, now: float, error_count: int) -> None:
+        self._batches.append({"requests": self._histogram.count + error_count - self._batch_errors_start, "duration": now - self._batch_start, "histogram": self._histogram})
+        self._histogram = LatencyHistogram()
+        self._batch_start = now
+        self._batch_errors_start = error_count
+        if len(self._batches) >= MAX_BATCHES:
+            self._merge_pairs()
+
+        precision = self.precision()
+        rps, p99 = self._batch_values()
+        self.trace.append(
+            {
+                "elapsed": now - self._start,
+                "batches": len(self._batches),
+                "batch_seconds": self.batch_seconds,
+                "requests_per_second": mean(rps),
+                "p99_response_time": mean(p99),
+                **{f"{metric}_precision": value for metric, value in precision.items()},
+            }
+        )
+        self.converged = len(self._batches) >= MIN_BATCHES and all(value is not None and value <= self.target for value in precision.values())
+        if self.converged:
+            app_logger.info(
+                f"Converged after {now - self._start:.1f}s: RPS within ±{precision['requests_per_second'] * 100:.2f}%, "
+                f"p99 within ±{precision['p99_response_time'] * 100:.2f}% over {len(self._batches)} batches"
+            )
+
+    def _merge_pairs(self) -> None:
+        """Merge neighbouring batches in pairs; an odd last batch is kept as it is."""
+        merged = []
+        for start in range(0, len(self._batches), 2):
+            end = start + 2
+            pair = self._batches[start:end]
+            histogram = LatencyHistogram(precision=pair[0]["histogram"].precision, min_value=pair[0]["histogram"].min_value)
+            for batch in pair:
+                histogram.merge(batch["histogram"])
+            merged.append({"requests": sum(batch["requests"] for batch in pair), "duration": sum(batch["duration"] for batch in pair), "histogram": histogram})
+        self._batches = merged
+        self.batch_seconds *= 2
+
+    def _batch_values(self):
+        rps = [batch["requests"] / batch["duration"] if batch["duration"] > 0 else 0.0 for batch in self._batches]
+        p99 = [batch["histogram"].percentile(0.99) if batch["histogram"].count else 0.0 for batch in self._batches]
+        return rps, p99
+
+    def precision(self) -> Dict[str, Optional[float]]:
+        """Relative half-width of the confidence interval of RPS and p99 over the closed batches."""
+        rps, p99 = self._batch_values()
+        return {"requests_per_second": relative_half_width(rps, self.confidence), "p99_response_time": relative_half_width(p99, self.confidence)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Target, achieved precision, final batch length, whether the run converged, and the trace."""
+        return {
+            "target_precision": self.target,
+            "confidence": self.confidence,
+            "converged": self.converged,
+            "batches": len(self._batches),
+            "batch_seconds": self.batch_seconds,
+            "precision": self.precision(),
+            "trace": self.trace,
+        }
@@ -0,0 +1,168 @@
+"""Interleaved round-robin comparisons for the HTTP benchmark framework."""
+
+import math
+import random
+from statistics import mean
+from typing import Any, Dict, List, Optional, Sequence
+
+from .benchmark import BenchmarkRunner
+from .models.benchmark_configuration import BenchmarkConfiguration
+from .models.benchmark_result import BenchmarkResult
+from .regression import merge_histograms
+from .utils.logging import app_logger
+from .utils.trend import mann_kendall
+
+
+def slice_durations(duration: float, slice_seconds: float) -> List[float]:
+    """Cut a client's duration into slices of `slice_seconds`; the last slice takes the remainder."""
+    if slice_seconds <= 0:
+        raise ValueError("Slice length must be positive")
+    rounds = max(1, math.ceil(duration / slice_seconds - 1e-9))
+    return [slice_seconds] * (rounds - 1) + [duration - slice_seconds * (rounds - 1)]
+
+
+def slice_schedule(clients: Sequence[str], rounds: int, seed: Optional[int] = None) -> List[List[str]]:
+    """Client order of each round, shuffled independently so no client is always first or last."""
+    rng = random.Random(seed)
+    schedule = []
+    for _ in range(rounds):
+        order = list(clients)
+        rng.shuffle(order)
+        schedule.append(order)
+    return schedule
+
+
+def run_interleaved(configs: Dict[str, BenchmarkConfiguration], slice_seconds: float, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Run the clients in short slices, one slice of each client per round in a random order.
+
+    Each client still gets its configured duration in total. Drift of the machine over the run (thermal
+    throttling, cache warm-up, noisy neighbours) then spreads over all clients instead of favouring whoever
+    runs first or last. Returns the merged result per client, the slice results, the schedule and the
+    drift estimate.
+    """
+    durations = {client: slice_durations(config.duration_seconds, slice_seconds) for client, config in configs.items()}
+    rounds = max(len(slices) for slices in durations.values())
+    schedule = slice_schedule(list(configs), rounds, seed)
+    slices: Dict[str, List[BenchmarkResult]] = {client: [] for client in configs}
+    for round_index, order in enumerate(schedule):
+        for client in order:
+            if round_index >= len(durations[client]):
+                continue
+            app_logger.info(f"Interleaved round {round_index + 1} of {rounds}: {client} for {durations[client][round_index]:.1f}s")
+            slice_config = BenchmarkConfiguration.from_dict({**configs[client].to_dict(), "id": None, "duration_seconds": durations[client][round_index]})
+            slices[client].append(BenchmarkRunner(slice_config).run())
+
+    drift = estimate_drift(slices)
+    interleave = {"slice_seconds": slice_seconds, "rounds": rounds, "seed": seed, "schedule": schedule, "drift": drift}
+    results = {client: merge_slices(client_slices, interleave) for client, client_slices in slices.items()}
+    return {"results": results, "slices": slices, "schedule": schedule, "drift": drift}
+
+
+def estimate_drift(slices: Dict[str, Sequence[BenchmarkResult]]) -> Dict[str, Any]:
+    """Estimate how much throughput drifted over the run from the slice RPS of every client.
+
+    Each slice's RPS is divided by its client's mean, so clients of different speed contribute equally, and
+    the normalized values are averaged per round. The Sen's slope of that series is the common drift per
+    round; `total_percent` is the drift from the first to the last round, which a sequential comparison
+    would have attributed to the clients. The Mann-Kendall test tells whether the drift is significant.
+    """
+    per_client = {}
+    normalized_by_round: Dict[int, List[float]] = {}
+    for client, results in slices.items():
+        rps = [result.requests_per_second for result in results]
+        client_mean = mean(rps) if rps else 0.0
+        normalized = [value / client_mean if client_mean else 0.0 for value in rps]
+        for round_index, value in enumerate(normalized):
+            normalized_by_round.setdefault(round_index, []).append(value)
+        trend = mann_kendall(normalized)
+        per_client[client] = {"slice_rps": rps, "slope_percent_per_round": trend["slope"] * 100, "trend": trend["trend"], "p_value": trend["p_value"]}
+
+    series = [mean(normalized_by_round[round_index]) for round_index in sorted(normalized_by_round)]
+    trend = mann_kendall(series)
+    return {
+        "rounds": len(series),
+        "series": series,
+        "slope_percent_per_round": trend["slope"] * 100,
+        "total_percent": trend["slope"] * (len(series) - 1) * 100 if series else 0.0,
+        "trend": trend["trend"],
+        "p_value": trend["p_value"],
+        "clients": per_client,
+    }
+
+
+def merge_slices(slices: Sequence[BenchmarkResult], interleave: Optional[Dict[str, Any]] = None) -> BenchmarkResult:
+    """Combine the slices of one client into a single result.
+
+    Counts and CPU times are summed, throughput is total requests over total measured time, averages of
+    CPU and memory are weighted by measured time, and latencies come from the merged histograms. Per-run
+    details without a meaningful sum (allocations, target metrics, event loop stats) are not carried over.
+    `interleave` is recorded in the config snapshot.
+    """
+    if not slices:
+        raise ValueError("No slices to merge")
+    first = slices[0]
+    requests = sum(result.requests_count for result in slices)
+    errors = sum(result.error_count for result in slices)
+    measured = [result.requests_count / result.requests_per_second if result.requests_per_second else 0.0 for result in slices]
+    measured_total = sum(measured)
+    cpu_time_user = sum(result.cpu_time_user for result in slices)
+    cpu_time_system = sum(result.cpu_time_system for result in slices)
+    cpu_time_total = cpu_time_user + cpu_time_system
+    histogram = merge_histograms(slices)
+    latency = histogram.summary() if histogram else {"mean": 0.0, "min": 0.0, "max": 0.0, "p95": 0.0, "p99": 0.0}
+
+    def weighted(attribute: str) -> float:
+        if not measured_total:
+            return mean(getattr(result, attribute) for result in slices)
+        return sum(getattr(result, attribute) * weight for result, weight in zip(slices, measured)) / measured_total
+
+    def counter(key: str) -> Optional[int]:
+        # Slices without TCP_INFO report None; the total is None only when no slice could count
+        values = [result.network_io[key] for result in slices if result.network_io.get(key) is not None]
+        return sum(values) if values else None
+
+    config_snapshot = dict(first.config_snapshot)
+    config_snapshot["duration_seconds"] = sum(result.config_snapshot.get("duration_seconds", 0) for result in slices)
+    config_snapshot["interleave"] = {**(interleave or {}), "slice_ids": [result.id for result in slices]}
+    return BenchmarkResult(
+        name=first.name,
+        client_library=first.client_library,
+        client_type=first.client_type,
+        http_method=first.http_method,
+        url=first.url,
+        start_time=first.start_time,
+        end_time=slices[-1].end_time,
+        duration=sum(result.duration for result in slices),
+        requests_count=requests,
+        requests_per_second=requests / measured_total if measured_total else 0.0,
+        avg_response_time=latency["mean"],
+        min_response_time=latency["min"],
+        max_response_time=latency["max"],
+        p95_response_time=latency["p95"],
+        p99_response_time=latency["p99"],
+        cpu_usage_avg=weighted("cpu_usage_avg"),
+        memory_usage_avg=weighted("memory_usage_avg"),
+        network_io={key: counter(key) for key in ("bytes_sent", "bytes_recv", "tcp_retransmits") if key in first.network_io},
+        error_count=errors,
+        error_rate=errors / requests * 100 if requests else 0.0,
+        concurrency_level=first.concurrency_level,
+        config_snapshot=config_snapshot,
+        cpu_time_user=cpu_time_user,
+        cpu_time_system=cpu_time_system,
+        cpu_us_per_request=cpu_time_total / requests * 1_000_000 if requests else 0.0,
+        requests_per_cpu_second=requests / cpu_time_total if cpu_time_total else 0.0,
+        adapter_cpu_us_per_request=sum(result.adapter_cpu_us_per_request * result.requests_count for result in slices) / requests if requests else 0.0,
+        cpu_budget_cores=first.cpu_budget_cores,
+        cpu_usage_normalized=weighted("cpu_usage_normalized"),
+        gc_stats={
+            "mode": first.gc_stats.get("mode"),
+            "collections": sum(result.gc_stats.get("collections", 0) for result in slices),
+            "total_pause": sum(result.gc_stats.get("total_pause", 0.0) for result in slices),
+            "max_pause": max(result.gc_stats.get("max_pause", 0.0) for result in slices),
+        },
+        cpu_budget=first.cpu_budget,
+        host=first.host,
+        git_sha=first.git_sha,
+        environment_fingerprint=first.environment_fingerprint,
+        latency_histogram=histogram,
+    )
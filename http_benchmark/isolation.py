@@ -0,0 +1,87 @@
+"""Benchmark runs isolated in fresh subprocesses for the HTTP benchmark framework."""
+
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, Optional
+
+from .models.benchmark_configuration import BenchmarkConfiguration
+from .models.benchmark_result import BenchmarkResult
+
+# How the isolated interpreter is started; recorded with the result
+START_METHOD = "spawn"
+
+
+def run_isolated(config: BenchmarkConfiguration, db_path: Optional[str] = None) -> BenchmarkResult:
+    """Run `config` in a newly spawned interpreter and rebuild its result in this process.
+
+    The child is a fresh ``python -m http_benchmark.isolation`` rather than a multiprocessing worker, which
+    would re-import the parent's main module and with it every client library. It reads its RSS before the
+    adapters are imported; the baseline, the import cost, the growth over the run and the child's PID are
+    recorded in ``config_snapshot["isolation"]``. The configuration goes in as JSON and the result comes
+    back as plain data (`to_dict()` plus the resource sample series). With `db_path`, soak windows are
+    written to that database from the child.
+    """
+    request = json.dumps({"config": {**config.to_dict(), "isolate": False}, "db_path": db_path})
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))}
+    with tempfile.TemporaryDirectory(prefix="http-benchmark-") as directory:
+        result_path = os.path.join(directory, "result.pickle")
+        completed = subprocess.run([sys.executable, "-m", "http_benchmark.isolation", result_path], input=request, text=True, env=env)
+        if completed.returncode != 0 or not os.path.exists(result_path):
+            raise RuntimeError(f"Isolated {config.client_library} run exited with status {completed.returncode}")
+        with open(result_path, "rb") as f:
+            payload = pickle.load(f)
+
+    result = BenchmarkResult.from_dict({**payload["result"], "resource_samples": payload["resource_samples"], "target_resource_samples": payload["target_resource_samples"]})
+    result.config_snapshot["isolate"] = True
+    result.config_snapshot["isolation"] = payload["isolation"]
+    return result
+
+
+def _run_child(config_data: Dict[str, Any], db_path: Optional[str]) -> Dict[str, Any]:
+    """Body of the isolated run; everything heavier than the models is imported only after the RSS baseline."""
+    import psutil
+
+    process = psutil.Process()
+    rss_baseline_mb = process.memory_info().rss / 1024 / 1024
+    from .benchmark import BenchmarkRunner
+    from .storage import ResultStorage
+
+    rss_after_import_mb = process.memory_info().rss / 1024 / 1024
+
+    storage = ResultStorage(db_path, background=True) if db_path else None
+    try:
+        result = BenchmarkRunner(BenchmarkConfiguration.from_dict(config_data), storage=storage).run()
+    finally:
+        if storage:
+            storage.close()
+    rss_end_mb = process.memory_info().rss / 1024 / 1024
+    return {
+        "result": result.to_dict(),
+        "resource_samples": list(result._resource_samples or ()),
+        "target_resource_samples": list(result._target_resource_samples or ()),
+        "isolation": {
+            "start_method": START_METHOD,
+            "pid": os.getpid(),
+            "rss_baseline_mb": rss_baseline_mb,
+            "rss_after_import_mb": rss_after_import_mb,
+            "import_mb": rss_after_import_mb - rss_baseline_mb,
+            "rss_end_mb": rss_end_mb,
+            "run_growth_mb": rss_end_mb - rss_after_import_mb,
+        },
+    }
+
+
+def _child_main(result_path: str, request: Dict[str, Any]) -> None:
+    """Entry point of the isolated interpreter: run the request and write the payload to `result_path`."""
+    payload = _run_child(request["config"], request["db_path"])
+    with open(result_path, "wb") as f:
+        pickle.dump(payload, f)
+
+
+if __name__ == "__main__":
+    _child_main(sys.argv[1], json.load(sys.stdin))
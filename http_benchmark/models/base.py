@@ -18,6 +18,11 @@ class BaseModel(ABC):
                     result[attr] = value
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Create a model from a dictionary produced by to_dict()."""
+        return cls(**data)
+
     def __repr__(self) -> str:
         """String representation of the model."""
         attrs = []
@@ -1,7 +1,7 @@
 """Benchmark configuration model for the HTTP benchmark framework."""
 
 import uuid
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from .base import BaseModel
 
 
@@ -23,6 +23,33 @@ class BenchmarkConfiguration(BaseModel):
         verify_ssl: bool = True,
         retry_attempts: int = 3,
         delay_between_requests: float = 0.0,
+        profile: bool = False,
+        profile_interval: float = 0.005,
+        profile_dir: str = "profiles",
+        warmup_requests: int = 0,
+        gc_mode: str = "default",
+        gc_thresholds: Optional[List[int]] = None,
+        track_allocations: bool = False,
+        allocation_frames: int = 15,
+        allocation_top: int = 10,
+        monitor_interval: float = 0.2,
+        monitor_mode: str = "thread",
+        monitor_pids: Optional[List[int]] = None,
+        monitor_processes: Optional[List[str]] = None,
+        monitor_cgroup: Optional[str] = None,
+        loop_debug: bool = False,
+        loop_probe_interval: float = 0.005,
+        cpu_set: Optional[List[int]] = None,
+        target_cpu_set: Optional[List[int]] = None,
+        soak_window_seconds: Optional[float] = None,
+        target_precision: Optional[float] = None,
+        batch_seconds: float = 1.0,
+        isolate: bool = False,
+        scenario_path: Optional[str] = None,
+        scenario_mode: str = "weighted",
+        scenario_seed: Optional[int] = None,
+        replay_path: Optional[str] = None,
+        replay_speedup: float = 1.0,
         name: Optional[str] = None,
         id: Optional[str] = None,
     ):
@@ -41,3 +68,34 @@ class BenchmarkConfiguration(BaseModel):
         self.verify_ssl = verify_ssl
         self.retry_attempts = retry_attempts
         self.delay_between_requests = delay_between_requests
+        self.profile = profile
+        self.profile_interval = profile_interval
+        self.profile_dir = profile_dir
+        self.warmup_requests = warmup_requests
+        self.gc_mode = gc_mode
+        self.gc_thresholds = gc_thresholds
+        self.track_allocations = track_allocations
+        self.allocation_frames = allocation_frames
+        self.allocation_top = allocation_top
+        self.monitor_interval = monitor_interval
+        self.monitor_mode = monitor_mode
+        self.monitor_pids = monitor_pids or []
+        self.monitor_processes = monitor_processes or []
+        self.monitor_cgroup = monitor_cgroup
+        self.loop_debug = loop_debug
+        self.loop_probe_interval = loop_probe_interval
+        self.cpu_set = cpu_set
+        self.target_cpu_set = target_cpu_set
+        self.soak_window_seconds = soak_window_seconds
+        # Adaptive runs stop once RPS and p99 are this precise (relative CI half-width); duration_seconds is then the maximum
+        self.target_precision = target_precision
+        self.batch_seconds = batch_seconds
+        # Run in a freshly spawned interpreter so no state of earlier runs in this process carries over
+        self.isolate = isolate
+        # JSONL file of requests replayed instead of the single request above, sampled by weight or in file order
+        self.scenario_path = scenario_path
+        self.scenario_mode = scenario_mode
+        self.scenario_seed = scenario_seed
+        # HAR capture or nginx access log replayed at its recorded pace times replay_speedup; duration_seconds caps the replay
+        self.replay_path = replay_path
+        self.replay_speedup = replay_speedup
@@ -2,8 +2,10 @@
 
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, Optional, Union
 from .base import BaseModel
+from .resource_metrics import ResourceMetrics
+from ..utils.histogram import LatencyHistogram
 
 
 class BenchmarkResult(BaseModel):
@@ -28,11 +30,35 @@ class BenchmarkResult(BaseModel):
         p99_response_time: float,
         cpu_usage_avg: float,
         memory_usage_avg: float,
-        network_io: Dict[str, int],
+        network_io: Dict[str, Any],
         error_count: int,
         error_rate: float,
         concurrency_level: int,
         config_snapshot: Dict[str, Any],
+        cpu_time_user: float = 0.0,
+        cpu_time_system: float = 0.0,
+        cpu_us_per_request: float = 0.0,
+        requests_per_cpu_second: float = 0.0,
+        adapter_cpu_us_per_request: float = 0.0,
+        cpu_budget_cores: float = 0.0,
+        cpu_usage_normalized: float = 0.0,
+        profile_path: Optional[str] = None,
+        gc_stats: Optional[Dict[str, Any]] = None,
+        allocation_stats: Optional[Dict[str, Any]] = None,
+        threading_stats: Optional[Dict[str, Any]] = None,
+        target_metrics: Optional[Dict[str, Any]] = None,
+        event_loop_stats: Optional[Dict[str, Any]] = None,
+        cpu_budget: Optional[Dict[str, Any]] = None,
+        soak_stats: Optional[Dict[str, Any]] = None,
+        host: Optional[str] = None,
+        git_sha: Optional[str] = None,
+        environment_fingerprint: Optional[str] = None,
+        latency_histogram: Optional[Union[LatencyHistogram, Dict[str, Any]]] = None,
+        convergence_stats: Optional[Dict[str, Any]] = None,
+        endpoint_stats: Optional[Dict[str, Dict[str, Any]]] = None,
+        replay_stats: Optional[Dict[str, Any]] = None,
+        resource_samples: Optional[Iterable[Dict[str, float]]] = None,
+        target_resource_samples: Optional[Iterable[Dict[str, float]]] = None,
         id: Optional[str] = None,
     ):
         self.id = id or str(uuid.uuid4())
@@ -58,3 +84,49 @@ class BenchmarkResult(BaseModel):
         self.error_rate = error_rate
         self.concurrency_level = concurrency_level
         self.config_snapshot = config_snapshot
+        self.cpu_time_user = cpu_time_user
+        self.cpu_time_system = cpu_time_system
+        self.cpu_us_per_request = cpu_us_per_request
+        self.requests_per_cpu_second = requests_per_cpu_second
+        self.adapter_cpu_us_per_request = adapter_cpu_us_per_request
+        self.cpu_budget_cores = cpu_budget_cores
+        self.cpu_usage_normalized = cpu_usage_normalized
+        self.profile_path = profile_path
+        self.gc_stats = gc_stats or {}
+        self.allocation_stats = allocation_stats or {}
+        self.threading_stats = threading_stats or {}
+        self.target_metrics = target_metrics or {}
+        self.event_loop_stats = event_loop_stats or {}
+        self.cpu_budget = cpu_budget or {}
+        self.soak_stats = soak_stats or {}
+        self.host = host
+        self.git_sha = git_sha
+        self.environment_fingerprint = environment_fingerprint
+        # Latencies of the successful requests; unlike the percentiles above it can be merged across runs
+        self.latency_histogram = LatencyHistogram.from_dict(latency_histogram) if isinstance(latency_histogram, dict) else latency_histogram
+        self.convergence_stats = convergence_stats or {}
+        # Scenario and replay runs: request share, errors and latency percentiles per endpoint name
+        self.endpoint_stats = endpoint_stats or {}
+        # Replay runs: schedule lag and replayed against recorded latency and status
+        self.replay_stats = replay_stats or {}
+        # Kept private so to_dict() and repr() stay small; the series can hold hundreds of thousands of samples
+        self._resource_samples = resource_samples
+        self._target_resource_samples = target_resource_samples
+
+    def iter_resource_metrics(self) -> Iterator[ResourceMetrics]:
+        """Yield the resource sample series recorded during the run, one ResourceMetrics at a time.
+
+        Samples of this process come first (source "client"), followed by the monitored target's (source "target").
+        """
+        for source, samples in (("client", self._resource_samples), ("target", self._target_resource_samples)):
+            for sample in samples or ():
+                yield ResourceMetrics(
+                    benchmark_id=self.id,
+                    timestamp=datetime.fromtimestamp(sample["timestamp"]),
+                    cpu_percent=sample["cpu_percent"],
+                    memory_mb=sample["memory_rss_mb"],
+                    bytes_sent=0,
+                    bytes_received=0,
+                    memory_percent=sample["memory_percent"],
+                    source=source,
+                )
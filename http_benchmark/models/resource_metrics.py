@@ -19,6 +19,8 @@ class ResourceMetrics(BaseModel):
         bytes_received: int,
         disk_read_mb: float = 0.0,
         disk_write_mb: float = 0.0,
+        memory_percent: float = 0.0,
+        source: str = "client",
         id: Optional[str] = None,
     ):
         self.id = id or str(uuid.uuid4())
@@ -30,3 +32,5 @@ class ResourceMetrics(BaseModel):
         self.bytes_received = bytes_received
         self.disk_read_mb = disk_read_mb
         self.disk_write_mb = disk_write_mb
+        self.memory_percent = memory_percent
+        self.source = source
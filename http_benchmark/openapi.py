@@ -0,0 +1,265 @@
+"""Workload scenarios generated from OpenAPI and Swagger specs for the HTTP benchmark framework."""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote, urlencode, urlparse
+
+from .utils.logging import app_logger
+
+# Bump when generation changes so that scenarios cached by an older generator are rebuilt
+GENERATOR_VERSION = 1
+
+# Directory compiled scenarios are cached in unless another one is given
+DEFAULT_CACHE_DIR = "scenarios"
+
+# Operations of these methods become scenario requests
+SPEC_METHODS = ("get", "post", "put", "patch", "delete", "head", "options")
+
+# Vendor extension an operation can set its weight in the mix with
+WEIGHT_EXTENSION = "x-benchmark-weight"
+
+# Nested schemas are synthesized down to this depth; deeper objects are left empty
+MAX_SCHEMA_DEPTH = 5
+
+# Parameter placeholders in a path template
+PATH_TEMPLATE = re.compile(r"\{([^}/]+)\}")
+
+# Values of string parameters with a format
+STRING_FORMATS = {
+    "date": "2024-01-01",
+    "date-time": "2024-01-01T00:00:00Z",
+    "email": "user@example.com",
+    "uri": "http://example.com/",
+    "url": "http://example.com/",
+    "uuid": "00000000-0000-4000-8000-000000000000",
+    "byte": "aGVsbG8=",
+    "password": "password",
+}
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """Read a Swagger 2.0 or OpenAPI 3 spec; JSON, or YAML (.yaml, .yml) with PyYAML installed."""
+    if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML specs need PyYAML: pip install 'http-client-benchmarker[suite]'") from None
+        with open(path) as f:
+            spec = yaml.safe_load(f) or {}
+    else:
+        with open(path) as f:
+            spec = json.load(f)
+    if not isinstance(spec.get("paths"), dict):
+        raise ValueError(f"{path} is not an OpenAPI or Swagger spec: it has no paths")
+    return spec
+
+
+def resolve(spec: Dict[str, Any], node: Any) -> Any:
+    """Follow local `$ref` pointers such as ``#/definitions/User`` or ``#/components/schemas/User``."""
+    seen = set()
+    while isinstance(node, dict) and "$ref" in node:
+        ref = node["$ref"]
+        if not ref.startswith("#/") or ref in seen:
+            raise ValueError(f"Cannot resolve $ref {ref}")
+        seen.add(ref)
+        node = spec
+        for part in ref[2:].split("/"):
+            node = node[part.replace("~1", "/").replace("~0", "~")]
+    return node
+
+
+def synthesize(spec: Dict[str, Any], schema: Optional[Dict[str, Any]], name: str = "", depth: int = 0) -> Any:
+    """A value valid for `schema`: its example, default or first enum value, else the smallest value of its type.
+
+    Strings with a known format get a fixed value of that format; other strings are the parameter name. Objects
+    get their required properties (all of them when none are required), arrays a single item.
+    """
+    schema = resolve(spec, schema or {})
+    for key in ("example", "default"):
+        if key in schema:
+            return schema[key]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    if "allOf" in schema:
+        merged = {"type": "object", "properties": {}, "required": []}
+        for part in schema["allOf"]:
+            part = resolve(spec, part)
+            merged["properties"].update(part.get("properties", {}))
+            merged["required"] += part.get("required", [])
+        return synthesize(spec, merged, name, depth)
+    for key in ("oneOf", "anyOf"):
+        if schema.get(key):
+            return synthesize(spec, schema[key][0], name, depth)
+
+    kind = schema.get("type") or ("object" if "properties" in schema else "array" if "items" in schema else "string")
+    if kind in ("integer", "int", "number"):
+        value = max(schema.get("minimum", 1), 1)
+        if "maximum" in schema:
+            value = min(value, schema["maximum"])
+        return int(value) if kind != "number" else float(value)
+    if kind == "boolean":
+        return True
+    if kind == "array":
+        return [synthesize(spec, schema.get("items"), name, depth + 1)] if depth < MAX_SCHEMA_DEPTH else []
+    if kind == "object":
+        if depth >= MAX_SCHEMA_DEPTH:
+            return {}
+        properties = schema.get("properties", {})
+        required = schema.get("required") or list(properties)
+        return {prop: synthesize(spec, properties[prop], prop, depth + 1) for prop in required if prop in properties}
+    value = STRING_FORMATS.get(schema.get("format"), name or "string")
+    return value.ljust(schema.get("minLength", 0), "x")
+
+
+def _path_prefix(spec: Dict[str, Any]) -> str:
+    """Path every operation is relative to: `basePath` in Swagger 2.0, the first server's path in OpenAPI 3."""
+    if "basePath" in spec:
+        return spec["basePath"].rstrip("/")
+    servers = spec.get("servers") or [{}]
+    return urlparse(servers[0].get("url", "")).path.rstrip("/")
+
+
+def _matches(patterns: Sequence[str], name: str, method: str, path: str) -> Optional[str]:
+    """First of `patterns` matching the operation's name, ``METHOD /path`` or path."""
+    for pattern in patterns:
+        if any(fnmatch.fnmatchcase(candidate, pattern) for candidate in (name, f"{method} {path}", path)):
+            return pattern
+    return None
+
+
+def _parameters(spec: Dict[str, Any], path_item: Dict[str, Any], operation: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Parameters of an operation; its own override path-level ones with the same name and location."""
+    parameters = {}
+    for parameter in path_item.get("parameters", []) + operation.get("parameters", []):
+        parameter = resolve(spec, parameter)
+        parameters[(parameter["name"], parameter.get("in"))] = parameter
+    return list(parameters.values())
+
+
+def _request_body(spec: Dict[str, Any], operation: Dict[str, Any], parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Scenario `body` and headers of an operation: a Swagger body or form parameters, or an OpenAPI requestBody."""
+    for parameter in parameters:
+        if parameter.get("in") == "body":
+            return {"body": synthesize(spec, parameter.get("schema"), parameter["name"])}
+    form = {parameter["name"]: synthesize(spec, parameter.get("schema", parameter), parameter["name"]) for parameter in parameters if parameter.get("in") == "formData" and parameter.get("required")}
+    if form:
+        return {"body": urlencode(form), "headers": {"Content-Type": "application/x-www-form-urlencoded"}}
+
+    request_body = resolve(spec, operation.get("requestBody"))
+    if not request_body:
+        return {}
+    content = request_body.get("content", {})
+    media_type = next((candidate for candidate in ("application/json", "application/x-www-form-urlencoded") if candidate in content), next(iter(content), None))
+    if media_type is None:
+        return {}
+    value = content[media_type].get("example", synthesize(spec, content[media_type].get("schema")))
+    if media_type == "application/json":
+        return {"body": value}
+    if media_type == "application/x-www-form-urlencoded" and isinstance(value, dict):
+        return {"body": urlencode(value), "headers": {"Content-Type": media_type}}
+    return {"body": value if isinstance(value, str) else json.dumps(value), "headers": {"Content-Type": media_type}}
+
+
+def generate_scenario(spec: Dict[str, Any], exclude: Sequence[str] = (), weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """Scenario lines, one per operation of the spec, with parameter values synthesized from their schemas.
+
+    Every path parameter is filled in; query, header and form parameters only when they are required. URLs are relative,
+    so they resolve against the benchmark's --url. An operation is left out when it matches an `exclude` pattern
+    (fnmatch against its operationId, ``METHOD /path`` or path). Its weight is that of the first matching
+    pattern in `weights`, else its ``x-benchmark-weight``, else 1; a weight of 0 leaves it out too.
+    """
+    weights = weights or {}
+    prefix = _path_prefix(spec)
+    lines = []
+    for path, path_item in spec["paths"].items():
+        path_item = resolve(spec, path_item)
+        for method in SPEC_METHODS:
+            if method not in path_item:
+                continue
+            operation = resolve(spec, path_item[method])
+            name = operation.get("operationId") or f"{method.upper()} {path}"
+            if _matches(exclude, name, method.upper(), path):
+                continue
+            pattern = _matches(list(weights), name, method.upper(), path)
+            weight = float(weights[pattern] if pattern else operation.get(WEIGHT_EXTENSION, 1.0))
+            if weight <= 0:
+                continue
+
+            parameters = _parameters(spec, path_item, operation)
+            url = path
+            query = {}
+            headers = {}
+            for parameter in parameters:
+                location = parameter.get("in")
+                if location not in ("path", "query", "header") or (location != "path" and not parameter.get("required")):
+                    continue
+                value = synthesize(spec, parameter.get("schema", parameter), parameter["name"])
+                if location == "path":
+                    url = url.replace(f"{{{parameter['name']}}}", quote(str(value), safe=""))
+                elif location == "query":
+                    query[parameter["name"]] = value
+                else:
+                    headers[parameter["name"]] = str(value)
+            # Path templates whose parameters the spec does not declare get the parameter name as value
+            url = PATH_TEMPLATE.sub(lambda match: quote(match.group(1), safe=""), url)
+            url = (prefix + url).lstrip("/")
+            if query:
+                url = f"{url}?{urlencode(query, doseq=True)}"
+
+            line = {"name": name, "method": method.upper(), "url": url, "weight": weight}
+            body = _request_body(spec, operation, parameters)
+            headers.update(body.pop("headers", {}))
+            if headers:
+                line["headers"] = headers
+            line.update(body)
+            lines.append(line)
+    if not lines:
+        raise ValueError("No operations left in the spec after exclusions")
+    return lines
+
+
+def write_scenario(lines: List[Dict[str, Any]], path: str) -> None:
+    """Write scenario lines as JSONL; the file is replaced atomically so a concurrent reader never sees half of it."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        for line in lines:
+            f.write(json.dumps(line) + "\n")
+    os.replace(temporary, path)
+
+
+def compile_scenario(spec_path: str, exclude: Sequence[str] = (), weights: Optional[Dict[str, float]] = None, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Path of the scenario generated from `spec_path`, generating it only when it is not cached yet.
+
+    The cache key covers the spec's bytes, the exclusions, the weights and the generator version, so editing any
+    of them compiles a new scenario while repeated runs with the same inputs start at once.
+    """
+    with open(spec_path, "rb") as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(json.dumps({"exclude": list(exclude), "weights": weights or {}, "version": GENERATOR_VERSION}, sort_keys=True).encode())
+    path = os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(spec_path))[0]}-{digest.hexdigest()[:16]}.jsonl")
+    if os.path.exists(path):
+        app_logger.info(f"Using cached scenario {path}")
+        return path
+    lines = generate_scenario(load_spec(spec_path), exclude, weights)
+    write_scenario(lines, path)
+    app_logger.info(f"Compiled {len(lines)} operations of {spec_path} into {path}")
+    return path
+
+
+def parse_weights(values: Sequence[str]) -> Dict[str, float]:
+    """Parse ``PATTERN=WEIGHT`` options into a weights mapping, keeping their order."""
+    weights = {}
+    for value in values:
+        pattern, separator, weight = value.rpartition("=")
+        if not separator or not pattern:
+            raise ValueError(f"Weight must be PATTERN=WEIGHT: {value}")
+        weights[pattern] = float(weight)
+        if weights[pattern] < 0:
+            raise ValueError(f"Weight must not be negative: {value}")
+    return weights
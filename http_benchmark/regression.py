@@ -0,0 +1,110 @@
+"""Regression checks of benchmark runs against pinned baselines."""
+
+from statistics import mean
+from typing import Any, Dict, List, Optional, Sequence
+
+from .models.benchmark_result import BenchmarkResult
+from .utils.histogram import LatencyHistogram
+from .utils.stats import mann_whitney_histograms, tail_exceedance_test, welch_t_test
+
+# Significance level of every check
+DEFAULT_ALPHA = 0.05
+
+# A significant change only fails the check once it is also larger than this relative change
+DEFAULT_TOLERANCE = 0.05
+
+# Exit status of `http-benchmark check` when a regression is found (1 is used for errors)
+REGRESSION_EXIT_CODE = 3
+
+
+def merge_histograms(results: Sequence[BenchmarkResult]) -> Optional[LatencyHistogram]:
+    """Merge the latency histograms of `results`, or None when none of them has one."""
+    histograms = [result.latency_histogram for result in results if result.latency_histogram is not None]
+    if not histograms:
+        return None
+    merged = LatencyHistogram(precision=histograms[0].precision, min_value=histograms[0].min_value)
+    for histogram in histograms:
+        merged.merge(histogram)
+    return merged
+
+
+def _relative_change(baseline: float, candidate: float) -> float:
+    return candidate / baseline - 1 if baseline else 0.0
+
+
+def _check(metric: str, test: str, baseline: float, candidate: float, p_value: Optional[float], worse: bool, alpha: float, tolerance: float) -> Dict[str, Any]:
+    """One line of the report; `worse` is whether the change goes in the regressing direction."""
+    change = _relative_change(baseline, candidate)
+    regression = p_value is not None and p_value < alpha and worse and abs(change) > tolerance
+    return {"metric": metric, "test": test, "baseline": baseline, "candidate": candidate, "change": change, "p_value": p_value, "regression": regression}
+
+
+def check_regression(
+    baseline: Sequence[BenchmarkResult],
+    candidate: Sequence[BenchmarkResult],
+    alpha: float = DEFAULT_ALPHA,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Dict[str, Any]:
+    """Test the candidate runs against the baseline runs for lower throughput and slower latency.
+
+    Throughput uses a one-sided Welch's t-test on the per-run RPS (two or more runs on each side). Latency
+    is tested on the merged histograms of all requests: the share of requests above the baseline's p99
+    (tail) and a Mann-Whitney U test of the whole distribution (median). A check fails only when its change
+    is significant at `alpha` and larger than `tolerance`, so that huge request counts do not turn a 0.1%
+    shift into a failure.
+    """
+    if not baseline or not candidate:
+        raise ValueError("Regression check needs at least one baseline and one candidate run")
+
+    checks: List[Dict[str, Any]] = []
+    baseline_rps = [result.requests_per_second for result in baseline]
+    candidate_rps = [result.requests_per_second for result in candidate]
+    throughput = welch_t_test(baseline_rps, candidate_rps)
+    checks.append(_check("requests_per_second", "welch_t", mean(baseline_rps), mean(candidate_rps), throughput["p_value"], mean(candidate_rps) < mean(baseline_rps), alpha, tolerance))
+
+    baseline_histogram = merge_histograms(baseline)
+    candidate_histogram = merge_histograms(candidate)
+    if baseline_histogram and candidate_histogram:
+        tail = tail_exceedance_test(baseline_histogram, candidate_histogram, 0.99)
+        baseline_p99 = baseline_histogram.percentile(0.99)
+        candidate_p99 = candidate_histogram.percentile(0.99)
+        checks.append(_check("p99_response_time", "tail_exceedance", baseline_p99, candidate_p99, tail["p_value"], candidate_p99 > baseline_p99, alpha, tolerance))
+
+        distribution = mann_whitney_histograms(baseline_histogram, candidate_histogram)
+        baseline_p50 = baseline_histogram.percentile(0.5)
+        candidate_p50 = candidate_histogram.percentile(0.5)
+        checks.append(_check("p50_response_time", "mann_whitney", baseline_p50, candidate_p50, distribution["p_value"], candidate_p50 > baseline_p50, alpha, tolerance))
+
+    fingerprints = {result.environment_fingerprint for result in list(baseline) + list(candidate) if result.environment_fingerprint}
+    return {
+        "baseline_runs": len(baseline),
+        "candidate_runs": len(candidate),
+        "baseline_ids": [result.id for result in baseline],
+        "candidate_ids": [result.id for result in candidate],
+        "runs_without_histogram": sum(result.latency_histogram is None for result in list(baseline) + list(candidate)),
+        "environment_mismatch": len(fingerprints) > 1,
+        "alpha": alpha,
+        "tolerance": tolerance,
+        "checks": checks,
+        "regression": any(check["regression"] for check in checks),
+    }
+
+
+def format_report(report: Dict[str, Any], tag: str) -> str:
+    """Human-readable diff of a check_regression report."""
+    lines = [
+        f"Regression check against baseline '{tag}' ({report['baseline_runs']} runs) with {report['candidate_runs']} candidate runs:",
+        f"{'Metric':<26} {'Baseline':<12} {'Candidate':<12} {'Change %':<10} {'p-value':<10} {'Test':<18} {'Verdict':<10}",
+        "-" * 102,
+    ]
+    for check in report["checks"]:
+        scale, label = (1, check["metric"]) if check["metric"] == "requests_per_second" else (1000, f"{check['metric']} (ms)")
+        p_value = f"{check['p_value']:.4f}" if check["p_value"] is not None else "n/a"
+        verdict = "REGRESSED" if check["regression"] else "ok"
+        lines.append(f"{label:<26} {check['baseline'] * scale:<12.2f} {check['candidate'] * scale:<12.2f} {check['change'] * 100:<+10.1f} {p_value:<10} {check['test']:<18} {verdict:<10}")
+    if report["runs_without_histogram"]:
+        lines.append(f"{report['runs_without_histogram']} runs have no latency histogram and are left out of the latency checks")
+    if report["environment_mismatch"]:
+        lines.append("Warning: baseline and candidate ran in different environments (interpreter, OS or CPU differ)")
+    lines.append("Result: " + ("REGRESSION" if report["regression"] else "no significant regression") + f" (alpha {report['alpha']}, tolerance {report['tolerance'] * 100:.0f}%)")
+    return "\n".join(lines)
@@ -0,0 +1,221 @@
+"""Replay of captured traffic with its original timing for the HTTP benchmark framework."""
+
+import gzip
+import heapq
+import itertools
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from .scenario import PreparedRequest
+from .utils.histogram import LatencyHistogram
+from .utils.logging import app_logger
+
+# nginx's default combined format, optionally followed by $request_time and $msec as in the `benchmark`
+# log_format of httpbin_server/nginx.conf
+ACCESS_LOG_PATTERN = re.compile(
+    r'(?P<remote_addr>\S+) \S+ (?P<remote_user>\S+) \[(?P<time_local>[^\]]+)\] "(?P<method>[A-Z]+) (?P<uri>\S+)[^"]*" (?P<status>\d{3}) (?P<bytes>\d+|-) '
+    r'"(?P<referer>[^"]*)" "(?P<user_agent>[^"]*)"(?: (?P<request_time>[\d.]+))?(?: (?P<msec>[\d.]+))?'
+)
+
+# nginx writes a log line when the request ends; lines are buffered this many seconds to replay them in start order
+REORDER_SECONDS = 60.0
+
+# Headers of a recorded request that belong to the original connection, not to the request
+SKIPPED_HEADERS = frozenset(("host", "content-length", "connection", "keep-alive", "transfer-encoding", "upgrade", "te"))
+
+# Path segments shown as {id} in endpoint names: numbers, UUIDs and long hex strings
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{16,})$")
+
+# Endpoints beyond this many are reported together as "other"
+MAX_ENDPOINTS = 200
+
+
+class ReplayRecord(NamedTuple):
+    """One captured request: when it started relative to the first one, what to send, and how the original went."""
+
+    offset: float
+    request: PreparedRequest
+    recorded_time: Optional[float]
+    recorded_status: Optional[int]
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """``METHOD /path`` with IDs in the path collapsed, so requests for different resources are reported together."""
+    segments = ["{id}" if ID_SEGMENT.match(segment) else segment for segment in urlsplit(path).path.split("/")]
+    return f"{method} {'/'.join(segments) or '/'}"
+
+
+def _prepare(method: str, url: str, base_url: str, headers: Dict[str, str], body: str, timeout: int, verify_ssl: bool) -> PreparedRequest:
+    """A request for the recorded path and query, sent to `base_url` instead of the original host."""
+    parts = urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    headers = {name: value for name, value in headers.items() if name.lower() not in SKIPPED_HEADERS and not name.startswith(":")}
+    return PreparedRequest(
+        name=endpoint_name(method, path),
+        method=method,
+        url=base_url.rstrip("/") + path,
+        headers=headers,
+        body=body,
+        weight=1.0,
+        timeout=timeout,
+        verify_ssl=verify_ssl,
+    )
+
+
+def _open_text(path: str):
+    """Open a log for reading, transparently decompressing rotated .gz logs."""
+    return gzip.open(path, "rt", errors="replace") if path.endswith(".gz") else open(path, errors="replace")
+
+
+def iter_access_log(path: str, base_url: str, timeout: int = 30, verify_ssl: bool = True) -> Iterator[ReplayRecord]:
+    """Stream the requests of an nginx access log in the order they started.
+
+    Lines are read one at a time. With ``$request_time`` logged, a request started that long before its line's
+    timestamp, and its recorded latency is known; with ``$msec`` the timestamp has millisecond resolution
+    instead of seconds. Lines wait in a heap until no later line can start before them (``REORDER_SECONDS``),
+    so memory is bounded by the traffic of that window. Bodies are not logged, so replayed requests have none.
+    """
+    pending = []
+    sequence = itertools.count()
+    first_start = None
+    skipped = 0
+    with _open_text(path) as f:
+        for line in f:
+            match = ACCESS_LOG_PATTERN.match(line)
+            if not match:
+                skipped += 1
+                continue
+            end = float(match["msec"]) if match["msec"] else datetime.strptime(match["time_local"], "%d/%b/%Y:%H:%M:%S %z").timestamp()
+            recorded_time = float(match["request_time"]) if match["request_time"] else None
+            request = _prepare(match["method"], match["uri"], base_url, {}, "", timeout, verify_ssl)
+            heapq.heappush(pending, (end - (recorded_time or 0.0), next(sequence), request, recorded_time, int(match["status"])))
+            while pending[0][0] < end - REORDER_SECONDS:
+                start, _, request, recorded_time, status = heapq.heappop(pending)
+                first_start = start if first_start is None else first_start
+                yield ReplayRecord(start - first_start, request, recorded_time, status)
+    while pending:
+        start, _, request, recorded_time, status = heapq.heappop(pending)
+        first_start = start if first_start is None else first_start
+        yield ReplayRecord(start - first_start, request, recorded_time, status)
+    if skipped:
+        app_logger.warning(f"Skipped {skipped} lines of {path} that are not in the combined log format")
+
+
+def _har_time(value: str) -> float:
+    """Epoch seconds of a HAR ``startedDateTime`` (ISO 8601; Python 3.10 does not parse a Z suffix)."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def iter_har(path: str, base_url: str, timeout: int = 30, verify_ssl: bool = True) -> Iterator[ReplayRecord]:
+    """The requests of a HAR capture in the order they started, with their bodies, headers and recorded timings.
+
+    A HAR file is a single JSON document, so it is loaded whole; its entries are converted one at a time.
+    """
+    with open(path) as f:
+        entries = json.load(f)["log"]["entries"]
+    entries.sort(key=lambda entry: _har_time(entry["startedDateTime"]))
+    first_start = _har_time(entries[0]["startedDateTime"]) if entries else 0.0
+    for entry in entries:
+        har_request = entry["request"]
+        headers = {header["name"]: header["value"] for header in har_request.get("headers", [])}
+        body = (har_request.get("postData") or {}).get("text", "")
+        request = _prepare(har_request["method"].upper(), har_request["url"], base_url, headers, body, timeout, verify_ssl)
+        recorded_time = entry["time"] / 1000 if entry.get("time", -1) >= 0 else None
+        status = (entry.get("response") or {}).get("status") or None
+        yield ReplayRecord(_har_time(entry["startedDateTime"]) - first_start, request, recorded_time, status)
+
+
+def iter_records(path: str, base_url: str, timeout: int = 30, verify_ssl: bool = True) -> Iterator[ReplayRecord]:
+    """Captured requests of a HAR file (.har) or an nginx access log (anything else, optionally .gz)."""
+    if os.path.splitext(path)[1].lower() == ".har":
+        return iter_har(path, base_url, timeout, verify_ssl)
+    return iter_access_log(path, base_url, timeout, verify_ssl)
+
+
+class ReplayStats:
+    """Replayed against recorded latency and status, per request and per endpoint, and how late requests were sent.
+
+    A request's lag is how long after its scheduled time it started: with all workers busy, requests queue and the
+    replay no longer reproduces the original arrival pattern.
+    """
+
+    def __init__(self, source: str, speedup: float = 1.0):
+        self.source = source
+        self.speedup = speedup
+        self.truncated = False
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self._lag = LatencyHistogram()
+        self._ratio = LatencyHistogram()
+        self._slower = 0
+        self._requests = 0
+        self._errors = 0
+        self._status_mismatches = 0
+
+    def _endpoint(self, name: str) -> Dict[str, Any]:
+        if name not in self._endpoints and len(self._endpoints) >= MAX_ENDPOINTS:
+            name = "other"
+        if name not in self._endpoints:
+            self._endpoints[name] = {"replayed": LatencyHistogram(), "recorded": LatencyHistogram(), "requests": 0, "errors": 0, "status_mismatches": 0}
+        return self._endpoints[name]
+
+    def record(self, record: ReplayRecord, result: Dict[str, Any], lag: float) -> None:
+        """Count one replayed request."""
+        endpoint = self._endpoint(record.request.name)
+        self._requests += 1
+        endpoint["requests"] += 1
+        self._lag.record(max(lag, 0.0))
+        if record.recorded_time is not None:
+            endpoint["recorded"].record(record.recorded_time)
+        if not result["success"]:
+            self._errors += 1
+            endpoint["errors"] += 1
+            return
+        endpoint["replayed"].record(result["response_time"])
+        if record.recorded_status is not None and result.get("status_code") != record.recorded_status:
+            self._status_mismatches += 1
+            endpoint["status_mismatches"] += 1
+        if record.recorded_time:
+            ratio = result["response_time"] / record.recorded_time
+            self._ratio.record(ratio)
+            self._slower += ratio > 1
+
+    def endpoint_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per endpoint: share of requests, errors, status mismatches, and replayed and recorded latency percentiles."""
+        summary = {}
+        for name, endpoint in self._endpoints.items():
+            replayed = endpoint["replayed"].summary()
+            recorded = endpoint["recorded"].summary()
+            summary[name] = {
+                "share": endpoint["requests"] / self._requests if self._requests else 0.0,
+                "requests": endpoint["requests"],
+                "errors": endpoint["errors"],
+                "error_rate": endpoint["errors"] / endpoint["requests"] * 100 if endpoint["requests"] else 0.0,
+                "status_mismatches": endpoint["status_mismatches"],
+                "avg_response_time": replayed["mean"],
+                "p50_response_time": replayed["p50"],
+                "p95_response_time": replayed["p95"],
+                "p99_response_time": replayed["p99"],
+                "max_response_time": replayed["max"],
+                "recorded_p50_response_time": recorded["p50"],
+                "recorded_p99_response_time": recorded["p99"],
+            }
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """Source, speedup, request counts, schedule lag, and the distribution of replayed/recorded latency ratios."""
+        return {
+            "source": self.source,
+            "speedup": self.speedup,
+            "truncated": self.truncated,
+            "requests": self._requests,
+            "errors": self._errors,
+            "status_mismatches": self._status_mismatches,
+            "schedule_lag": {"p50": self._lag.percentile(0.50), "p99": self._lag.percentile(0.99), "max": self._lag.max or 0.0},
+            "compared": self._ratio.count,
+            "slower_share": self._slower / self._ratio.count if self._ratio.count else 0.0,
+            "latency_ratio": {"p50": self._ratio.percentile(0.50), "p95": self._ratio.percentile(0.95), "p99": self._ratio.percentile(0.99)},
+        }
@@ -0,0 +1,68 @@
+"""Thread-scaling sweeps for the HTTP benchmark framework."""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .benchmark import BenchmarkRunner
+from .models.benchmark_configuration import BenchmarkConfiguration
+from .models.benchmark_result import BenchmarkResult
+from .utils.logging import app_logger
+
+
+def sweep_thread_counts(max_threads: int) -> List[int]:
+    """Return 1, 2, 4, ... up to and including max_threads."""
+    if max_threads < 1:
+        raise ValueError("Thread sweep needs at least one thread")
+    counts = []
+    threads = 1
+    while threads < max_threads:
+        counts.append(threads)
+        threads *= 2
+    counts.append(max_threads)
+    return counts
+
+
+def gil_contention_estimate(result: BenchmarkResult, baseline: BenchmarkResult) -> Optional[float]:
+    """Share of a request's wall time its worker spent neither on CPU nor in I/O, i.e. waiting for the GIL.
+
+    A request's wall time is its thread CPU time, its I/O time and its wait for the GIL. The I/O time comes
+    from `baseline`, a single-thread run where no other worker holds the GIL: its response time minus its
+    CPU time per request. None on free-threaded builds, where there is no GIL to wait for, and without
+    successful requests.
+    """
+    if not result.threading_stats.get("gil_enabled", True) or not result.avg_response_time or not baseline.avg_response_time:
+        return None
+    io_time = max(baseline.avg_response_time - baseline.adapter_cpu_us_per_request / 1_000_000, 0.0)
+    wait = result.avg_response_time - result.adapter_cpu_us_per_request / 1_000_000 - io_time
+    return min(max(wait / result.avg_response_time, 0.0), 1.0)
+
+
+def run_thread_scaling_sweep(config: BenchmarkConfiguration, thread_counts: Sequence[int]) -> List[Dict[str, Any]]:
+    """Run a sync configuration once per thread count and compute its scaling efficiency curve.
+
+    Speedup and efficiency are relative to the first (smallest) thread count: perfect scaling has an
+    efficiency of 1.0 at every point, GIL-bound clients fall off as threads are added. The GIL contention
+    estimate of each point, also stored in its result's threading_stats, takes the first point as the
+    uncontended baseline.
+    """
+    if config.is_async:
+        raise ValueError("Thread scaling sweeps apply to the sync ThreadPoolExecutor path only")
+
+    points = []
+    for threads in thread_counts:
+        app_logger.info(f"Thread sweep: {config.client_library} with {threads} threads")
+        point_config = BenchmarkConfiguration.from_dict({**config.to_dict(), "id": None, "concurrency": threads})
+        result = BenchmarkRunner(point_config).run()
+        points.append({"threads": threads, "result": result})
+
+    base_threads = points[0]["threads"]
+    base_rps = points[0]["result"].requests_per_second
+    for point in points:
+        result = point["result"]
+        speedup = result.requests_per_second / base_rps if base_rps > 0 else 0
+        point["requests_per_second"] = result.requests_per_second
+        point["speedup"] = speedup
+        point["efficiency"] = speedup / (point["threads"] / base_threads)
+        point["worker_cpu_utilization"] = result.threading_stats.get("worker_cpu_utilization", 0)
+        point["gil_contention_estimate"] = gil_contention_estimate(result, points[0]["result"])
+        result.threading_stats["gil_contention_estimate"] = point["gil_contention_estimate"]
+    return points
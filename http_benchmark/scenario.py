@@ -0,0 +1,151 @@
+"""Workload scenarios replayed from JSONL request files for the HTTP benchmark framework."""
+
+import bisect
+import itertools
+import json
+import random
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence
+from urllib.parse import urljoin, urlparse
+
+from .utils.histogram import LatencyHistogram
+
+# How the workers pick the next request of a scenario
+SCENARIO_MODES = ("weighted", "sequential")
+
+# Keys a line of a scenario file may have
+SCENARIO_KEYS = frozenset(("name", "method", "url", "headers", "body", "weight"))
+
+
+class PreparedRequest(NamedTuple):
+    """A scenario request parsed once before the run and shared read-only by every worker.
+
+    It has the attributes the adapters read from an HTTPRequest, plus the endpoint `name` its latency is
+    reported under and its sampling `weight`.
+    """
+
+    name: str
+    method: str
+    url: str
+    headers: Dict[str, str]
+    body: str
+    weight: float
+    timeout: int = 30
+    verify_ssl: bool = True
+    stream: bool = False
+
+
+def parse_scenario_line(data: Dict[str, Any], base_url: str, timeout: int = 30, verify_ssl: bool = True) -> PreparedRequest:
+    """Turn one decoded line into a PreparedRequest: relative URLs are resolved against `base_url` and JSON bodies serialized."""
+    unknown = set(data) - SCENARIO_KEYS
+    if unknown:
+        raise ValueError(f"Unknown scenario keys: {', '.join(sorted(unknown))}")
+    if "url" not in data:
+        raise ValueError("Scenario request needs a url")
+    method = str(data.get("method", "GET")).upper()
+    url = urljoin(base_url, data["url"])
+    headers = {str(key): str(value) for key, value in (data.get("headers") or {}).items()}
+    body = data.get("body")
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body, separators=(",", ":"))
+        if not any(key.lower() == "content-type" for key in headers):
+            headers["Content-Type"] = "application/json"
+    weight = float(data.get("weight", 1.0))
+    if weight <= 0:
+        raise ValueError(f"Scenario weight must be positive: {weight}")
+    name = data.get("name") or f"{method} {urlparse(url).path or '/'}"
+    return PreparedRequest(name=name, method=method, url=url, headers=headers, body=body or "", weight=weight, timeout=timeout, verify_ssl=verify_ssl)
+
+
+def load_scenario(path: str, base_url: str, timeout: int = 30, verify_ssl: bool = True) -> List[PreparedRequest]:
+    """Read a JSONL scenario file: one request per line, blank lines and lines starting with # are skipped."""
+    requests = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                requests.append(parse_scenario_line(json.loads(line), base_url, timeout, verify_ssl))
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+    if not requests:
+        raise ValueError(f"Scenario {path} has no requests")
+    return requests
+
+
+def request_picker(requests: Sequence[PreparedRequest], mode: str = "weighted", seed: Optional[int] = None) -> Callable[[], PreparedRequest]:
+    """Callable returning the next request to send: sampled by weight, or the file's requests in order, over and over.
+
+    Both pickers are safe to call from several threads; the sampling is reproducible with `seed` as long as a
+    single thread calls it.
+    """
+    if mode == "sequential":
+        counter = itertools.count()
+        return lambda: requests[next(counter) % len(requests)]
+    if mode != "weighted":
+        raise ValueError(f"Unknown scenario mode: {mode}")
+    cumulative = list(itertools.accumulate(request.weight for request in requests))
+    total = cumulative[-1]
+    rng = random.Random(seed)
+    return lambda: requests[bisect.bisect_right(cumulative, rng.random() * total)]
+
+
+def method_label(requests: Sequence[PreparedRequest]) -> str:
+    """The scenario's HTTP method, or MIXED when it has several."""
+    methods = {request.method for request in requests}
+    return methods.pop() if len(methods) == 1 else "MIXED"
+
+
+async def labelled(request: Awaitable[Dict[str, Any]], endpoint: str) -> Dict[str, Any]:
+    """Await an adapter's request coroutine and label its result with the endpoint it was for."""
+    result = await request
+    result["endpoint"] = endpoint
+    return result
+
+
+class EndpointStats:
+    """Latency histogram and error count per endpoint of a scenario run.
+
+    The expected share of an endpoint follows the weights in weighted mode and the number of lines in sequential mode.
+    """
+
+    def __init__(self, requests: Sequence[PreparedRequest], mode: str = "weighted"):
+        weights = [request.weight if mode == "weighted" else 1.0 for request in requests]
+        total_weight = sum(weights)
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        for request, weight in zip(requests, weights):
+            endpoint = self._endpoints.setdefault(request.name, {"method": request.method, "url": request.url, "weight": 0.0, "histogram": LatencyHistogram(), "requests": 0, "errors": 0})
+            endpoint["weight"] += weight / total_weight
+
+    def record(self, result: Dict[str, Any]) -> None:
+        """Count one adapter result under its endpoint label."""
+        endpoint = self._endpoints.get(result.get("endpoint"))
+        if endpoint is None:
+            return
+        endpoint["requests"] += 1
+        if result["success"]:
+            endpoint["histogram"].record(result["response_time"])
+        else:
+            endpoint["errors"] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per endpoint: expected and actual share of requests, errors and latency percentiles."""
+        total = sum(endpoint["requests"] for endpoint in self._endpoints.values())
+        summary = {}
+        for name, endpoint in self._endpoints.items():
+            latency = endpoint["histogram"].summary()
+            summary[name] = {
+                "method": endpoint["method"],
+                "url": endpoint["url"],
+                "expected_share": endpoint["weight"],
+                "share": endpoint["requests"] / total if total else 0.0,
+                "requests": endpoint["requests"],
+                "errors": endpoint["errors"],
+                "error_rate": endpoint["errors"] / endpoint["requests"] * 100 if endpoint["requests"] else 0.0,
+                "avg_response_time": latency["mean"],
+                "p50_response_time": latency["p50"],
+                "p95_response_time": latency["p95"],
+                "p99_response_time": latency["p99"],
+                "max_response_time": latency["max"],
+            }
+        return summary
@@ -0,0 +1,181 @@
+"""Soak testing in rolling windows for the HTTP benchmark framework."""
+
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .utils.histogram import LatencyHistogram
+from .utils.logging import app_logger
+from .utils.trend import mann_kendall
+
+# Process resources tracked per window and tested for an upward trend
+LEAK_METRICS = ("memory_rss_mb", "open_fds", "connections")
+
+# A significant upward trend only counts as a leak once it has grown by at least this much over the run
+LEAK_MIN_GROWTH = {"memory_rss_mb": 5.0, "open_fds": 2, "connections": 2}
+
+# Significance level of the trend test
+LEAK_ALPHA = 0.05
+
+# The trend test needs at least this many windows
+MIN_TREND_WINDOWS = 4
+
+# Trend series are capped at this many points (even); past it, neighbouring points are averaged in pairs
+MAX_TREND_POINTS = 256
+
+
+def detect_leaks(series: Dict[str, List[float]], alpha: float = LEAK_ALPHA) -> Dict[str, Any]:
+    """Run a Mann-Kendall trend test on each resource series and flag the ones that keep growing.
+
+    A metric is a suspected leak when it trends upward at significance `alpha` and Sen's slope over the
+    whole series exceeds ``LEAK_MIN_GROWTH``, so that a stable value with a few late outliers is not flagged.
+    """
+    trends = {}
+    leaks = []
+    for metric, values in series.items():
+        trend = mann_kendall(values, alpha)
+        trend["growth"] = trend["slope"] * (len(values) - 1) if values else 0.0
+        trend["first"] = values[0] if values else 0.0
+        trend["last"] = values[-1] if values else 0.0
+        trends[metric] = trend
+        if metric in LEAK_MIN_GROWTH and len(values) >= MIN_TREND_WINDOWS and trend["trend"] == "increasing" and trend["growth"] >= LEAK_MIN_GROWTH[metric]:
+            leaks.append(metric)
+    return {"trends": trends, "suspected_leaks": leaks, "leak_suspected": bool(leaks)}
+
+
+class SoakRecorder:
+    """Aggregate a long run window by window so memory stays flat however long it runs.
+
+    Latencies go into a log-bucketed histogram per window instead of a list. When a window closes its
+    latency summary, histogram and the process's resources (``snapshot()``) are handed to `on_window`,
+    typically ``ResultStorage.save_soak_window``; only a handful of numbers per window stay in memory
+    for the trend tests, and once a series reaches ``MAX_TREND_POINTS`` each point averages twice as many
+    windows, so the series and the quadratic trend tests stay bounded. The whole-run histogram is the
+    merge of the window histograms.
+    """
+
+    def __init__(
+        self,
+        benchmark_id: str,
+        window_seconds: float,
+        snapshot: Callable[[], Dict[str, float]],
+        on_window: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        if window_seconds <= 0:
+            raise ValueError("Soak window must be positive")
+        self.benchmark_id = benchmark_id
+        self.window_seconds = window_seconds
+        self.snapshot = snapshot
+        self.on_window = on_window
+        self.histogram = LatencyHistogram()
+        self._window = LatencyHistogram()
+        self._window_index = 0
+        self._window_start = 0.0
+        self._window_started_at = datetime.now()
+        self._window_errors_start = 0
+        self._series: Dict[str, List[float]] = {metric: [] for metric in LEAK_METRICS + ("p99_response_time", "error_rate")}
+        self._step = 1
+        self._pending: Dict[str, float] = dict.fromkeys(self._series, 0.0)
+        self._pending_count = 0
+
+    def start(self) -> None:
+        """Open the first window; call when the measured phase starts."""
+        self._window_start = time.perf_counter()
+        self._window_started_at = datetime.now()
+
+    @property
+    def count(self) -> int:
+        """Successful requests recorded so far, including the open window."""
+        return self.histogram.count + self._window.count
+
+    def record(self, response_time: float) -> None:
+        """Record the latency of one successful request."""
+        self._window.record(response_time)
+
+    def tick(self, error_count: int) -> None:
+        """Close the current window if its time is up; `error_count` is the run's error count so far."""
+        if time.perf_counter() - self._window_start >= self.window_seconds:
+            self._close_window(error_count)
+
+    def finish(self, error_count: int) -> Dict[str, Any]:
+        """Close the last, possibly partial, window and return the run's latency statistics."""
+        if self._window.count or error_count > self._window_errors_start:
+            self._close_window(error_count)
+        summary = self.histogram.summary()
+        return {
+            "avg_response_time": summary["mean"],
+            "min_response_time": summary["min"],
+            "max_response_time": summary["max"],
+            "p95_response_time": summary["p95"],
+            "p99_response_time": summary["p99"],
+        }
+
+    def _close_window(self, error_count: int) -> None:
+        now = time.perf_counter()
+        duration = now - self._window_start
+        errors = error_count - self._window_errors_start
+        requests = self._window.count + errors
+        latency = self._window.summary()
+        resources = self.snapshot()
+        window = {
+            "benchmark_id": self.benchmark_id,
+            "window_index": self._window_index,
+            "start_time": self._window_started_at,
+            "end_time": datetime.now(),
+            "duration": duration,
+            "requests_count": requests,
+            "error_count": errors,
+            "requests_per_second": requests / duration if duration > 0 else 0.0,
+            "avg_response_time": latency["mean"],
+            "p50_response_time": latency["p50"],
+            "p95_response_time": latency["p95"],
+            "p99_response_time": latency["p99"],
+            "max_response_time": latency["max"],
+            "histogram": self._window.to_dict(),
+            **resources,
+        }
+        if self.on_window:
+            self.on_window(window)
+        self._add_trend_point({**{metric: resources[metric] for metric in LEAK_METRICS}, "p99_response_time": latency["p99"], "error_rate": errors / requests * 100 if requests else 0.0})
+        app_logger.info(
+            f"Soak window {self._window_index}: {window['requests_per_second']:.1f} RPS, p99 {latency['p99'] * 1000:.2f}ms, "
+            f"RSS {resources['memory_rss_mb']:.1f}MB, {resources['open_fds']} fds, {resources['connections']} connections"
+        )
+
+        self.histogram.merge(self._window)
+        self._window = LatencyHistogram()
+        self._window_index += 1
+        self._window_start = now
+        self._window_started_at = window["end_time"]
+        self._window_errors_start = error_count
+
+    def _add_trend_point(self, values: Dict[str, float]) -> None:
+        """Add one window's values to the trend series, each point being the mean of `_step` windows."""
+        for metric, value in values.items():
+            self._pending[metric] += value
+        self._pending_count += 1
+        if self._pending_count < self._step:
+            return
+        for metric, series in self._series.items():
+            series.append(self._pending[metric] / self._step)
+            self._pending[metric] = 0.0
+        self._pending_count = 0
+        if len(self._series["p99_response_time"]) >= MAX_TREND_POINTS:
+            for metric, series in self._series.items():
+                self._series[metric] = [(series[i] + series[i + 1]) / 2 for i in range(0, len(series) - 1, 2)]
+            self._step *= 2
+
+    def summary(self) -> Dict[str, Any]:
+        """Window count, trend tests of resources, latency and errors, and the leak verdict.
+
+        Each point of the trend series averages `trend_step_windows` windows; the last one may average fewer.
+        """
+        series = {metric: values + ([self._pending[metric] / self._pending_count] if self._pending_count else []) for metric, values in self._series.items()}
+        analysis = detect_leaks(series)
+        return {
+            "window_seconds": self.window_seconds,
+            "window_count": self._window_index,
+            "trend_step_windows": self._step,
+            "series": series,
+            **analysis,
+        }
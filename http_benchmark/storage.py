@@ -1,22 +1,284 @@
 """Storage module for the HTTP benchmark framework."""
 
+import queue
 import sqlite3
 import json
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Sequence, Set, Tuple, Union
 from .models.benchmark_result import BenchmarkResult
+from .models.resource_metrics import ResourceMetrics
+from .utils.histogram import LatencyHistogram
+from .utils.logging import app_logger
+
+# Columns added after the original schema but before schema versioning; applied by the first migration
+ADDED_COLUMNS = {
+    "cpu_time_user": "REAL NOT NULL DEFAULT 0",
+    "cpu_time_system": "REAL NOT NULL DEFAULT 0",
+    "cpu_us_per_request": "REAL NOT NULL DEFAULT 0",
+    "requests_per_cpu_second": "REAL NOT NULL DEFAULT 0",
+    "adapter_cpu_us_per_request": "REAL NOT NULL DEFAULT 0",
+    "profile_path": "TEXT",
+    "gc_stats": "TEXT NOT NULL DEFAULT '{}'",
+    "allocation_stats": "TEXT NOT NULL DEFAULT '{}'",
+    "threading_stats": "TEXT NOT NULL DEFAULT '{}'",
+    "target_metrics": "TEXT NOT NULL DEFAULT '{}'",
+    "event_loop_stats": "TEXT NOT NULL DEFAULT '{}'",
+    "cpu_budget_cores": "REAL NOT NULL DEFAULT 0",
+    "cpu_usage_normalized": "REAL NOT NULL DEFAULT 0",
+    "cpu_budget": "TEXT NOT NULL DEFAULT '{}'",
+    "soak_stats": "TEXT NOT NULL DEFAULT '{}'",
+}
+
+# Columns added to resource_metrics after it was introduced
+ADDED_RESOURCE_METRICS_COLUMNS = {
+    "source": "TEXT NOT NULL DEFAULT 'client'",
+}
+
+# Columns of soak_windows written by save_soak_window
+SOAK_WINDOW_COLUMNS = (
+    "benchmark_id",
+    "window_index",
+    "start_time",
+    "end_time",
+    "duration",
+    "requests_count",
+    "error_count",
+    "requests_per_second",
+    "avg_response_time",
+    "p50_response_time",
+    "p95_response_time",
+    "p99_response_time",
+    "max_response_time",
+    "histogram",
+    "memory_rss_mb",
+    "open_fds",
+    "connections",
+    "threads",
+)
+
+
+# Run metadata promoted out of config_snapshot["runtime"] into their own indexed columns
+METADATA_COLUMNS = ("host", "git_sha", "environment_fingerprint")
+
+# Schema version stored in PRAGMA user_version once every migration has been applied
+SCHEMA_VERSION = 10
+
+# Columns of benchmark_results that map one-to-one to BenchmarkResult attributes, in insert order
+RESULT_COLUMNS = (
+    "id",
+    "name",
+    "client_library",
+    "client_type",
+    "http_method",
+    "url",
+    "start_time",
+    "end_time",
+    "duration",
+    "requests_count",
+    "requests_per_second",
+    "avg_response_time",
+    "min_response_time",
+    "max_response_time",
+    "p95_response_time",
+    "p99_response_time",
+    "cpu_usage_avg",
+    "memory_usage_avg",
+    "network_io",
+    "error_count",
+    "error_rate",
+    "concurrency_level",
+    "config_snapshot",
+    "cpu_time_user",
+    "cpu_time_system",
+    "cpu_us_per_request",
+    "requests_per_cpu_second",
+    "adapter_cpu_us_per_request",
+    "profile_path",
+    "gc_stats",
+    "allocation_stats",
+    "threading_stats",
+    "target_metrics",
+    "event_loop_stats",
+    "cpu_budget_cores",
+    "cpu_usage_normalized",
+    "cpu_budget",
+    "soak_stats",
+    *METADATA_COLUMNS,
+    "latency_histogram",
+    "convergence_stats",
+    "endpoint_stats",
+    "replay_stats",
+)
+
+# Result columns stored as JSON text
+JSON_RESULT_COLUMNS = frozenset(
+    (
+        "network_io",
+        "config_snapshot",
+        "gc_stats",
+        "allocation_stats",
+        "threading_stats",
+        "target_metrics",
+        "event_loop_stats",
+        "cpu_budget",
+        "soak_stats",
+        "convergence_stats",
+        "endpoint_stats",
+        "replay_stats",
+    )
+)
+
+# Result columns stored as ISO 8601 text
+DATETIME_RESULT_COLUMNS = frozenset(("start_time", "end_time"))
+
+# Result columns stored as LatencyHistogram.to_bytes() blobs
+HISTOGRAM_RESULT_COLUMNS = frozenset(("latency_histogram",))
+
+# Percentiles reported by aggregate_latency
+AGGREGATE_PERCENTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+INSERT_RESULT_SQL = f"INSERT INTO benchmark_results ({', '.join(RESULT_COLUMNS)}) VALUES ({', '.join('?' * len(RESULT_COLUMNS))})"
+
+# Rows fetched per query by iter_results
+PAGE_SIZE = 500
+
+# Statements kept compiled per connection; every query here uses a fixed SQL string, so they are reused
+CACHED_STATEMENTS = 256
+
+# Most writes the background writer commits in one transaction
+WRITE_BATCH_SIZE = 500
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open a connection in WAL mode: readers do not block the writer and commits append to the log instead of rewriting pages."""
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    if db_path != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only syncs at checkpoints; a crash can lose the last commits but never corrupts the database
+        conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class _BackgroundWriter(threading.Thread):
+    """Apply queued writes on a dedicated connection, committing whatever has queued up as one transaction.
+
+    The connection is opened by the caller, so a database that cannot be opened fails there instead of
+    leaving a dead writer that flush() would wait on forever. Each write runs inside its own savepoint, so
+    a failing write is rolled back alone and the rest of the batch is still committed.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int = WRITE_BATCH_SIZE):
+        super().__init__(name="result-storage-writer", daemon=True)
+        self.conn = conn
+        self.batch_size = batch_size
+        self.queue: "queue.Queue[Optional[Tuple[Callable, tuple]]]" = queue.Queue()
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        conn = self.conn
+        try:
+            while True:
+                batch = [self.queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                writes = [item for item in batch if item is not None]
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("BEGIN")
+                    for write, args in writes:
+                        cursor.execute("SAVEPOINT write")
+                        try:
+                            write(cursor, *args)
+                        except Exception as e:
+                            cursor.execute("ROLLBACK TO write")
+                            self.error = self.error or e
+                            app_logger.error(f"Background write {getattr(write, '__name__', write)} failed and was skipped: {e}")
+                        cursor.execute("RELEASE write")
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    self.error = self.error or e
+                    app_logger.error(f"Background commit of {len(writes)} items failed: {e}")
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+                if len(writes) < len(batch):
+                    return  # Stop sentinel
+        finally:
+            conn.close()
 
 
 class ResultStorage:
-    """Handle storage and retrieval of benchmark results using SQLite."""
+    """Handle storage and retrieval of benchmark results using SQLite.
 
-    def __init__(self, db_path: str = "benchmark_results.db"):
+    One connection is kept open for the lifetime of the storage. With `background=True` writes are queued
+    and applied by a writer thread on its own connection, so saving never blocks the caller (e.g. soak
+    windows saved from the measurement loop); reads flush the queue first, so they always see earlier
+    writes. Call close() (or use the storage as a context manager) to flush and release the connections.
+    """
+
+    def __init__(self, db_path: str = "benchmark_results.db", background: bool = False):
+        if background and db_path == ":memory:":
+            raise ValueError("background=True needs a database file: the writer's connection would open a separate in-memory database")
         self.db_path = db_path
+        self._conn = connect(db_path)
         self.init_db()
+        self._writer: Optional[_BackgroundWriter] = None
+        if background:
+            self._writer = _BackgroundWriter(connect(db_path))
+            self._writer.start()
+
+    def __enter__(self) -> "ResultStorage":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        """Wait until every queued write is committed; re-raises the first error the writer hit."""
+        if self._writer:
+            self._writer.queue.join()
+            error, self._writer.error = self._writer.error, None
+            if error:
+                raise error
+
+    def close(self) -> None:
+        """Flush pending writes and close the connections."""
+        writer, self._writer = self._writer, None
+        if writer:
+            writer.queue.put(None)
+            writer.join()
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+        if writer and writer.error:
+            raise writer.error
+
+    def _write(self, write: Callable[..., None], *args) -> None:
+        """Run `write(cursor, *args)` in its own transaction, or queue it for the background writer."""
+        if self._writer:
+            self._writer.queue.put((write, args))
+            return
+        try:
+            write(self._conn.cursor(), *args)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """Cursor for a read, after any queued writes have landed."""
+        self.flush()
+        return self._conn.cursor()
 
     def init_db(self) -> None:
         """Initialize the SQLite database with required tables."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
 
         # Create benchmark_results table
@@ -51,58 +313,346 @@ class ResultStorage:
         """
         )
 
+        # Create resource_metrics table holding the full sample series of each run
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resource_metrics (
+                id TEXT PRIMARY KEY,
+                benchmark_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                cpu_percent REAL NOT NULL,
+                memory_mb REAL NOT NULL,
+                memory_percent REAL NOT NULL DEFAULT 0,
+                bytes_sent INTEGER NOT NULL DEFAULT 0,
+                bytes_received INTEGER NOT NULL DEFAULT 0,
+                disk_read_mb REAL NOT NULL DEFAULT 0,
+                disk_write_mb REAL NOT NULL DEFAULT 0,
+                source TEXT NOT NULL DEFAULT 'client'
+            )
+        """
+        )
+
+        # Create soak_windows table holding one row per rolling window of a soak run
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS soak_windows (
+                benchmark_id TEXT NOT NULL,
+                window_index INTEGER NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                duration REAL NOT NULL,
+                requests_count INTEGER NOT NULL,
+                error_count INTEGER NOT NULL,
+                requests_per_second REAL NOT NULL,
+                avg_response_time REAL NOT NULL,
+                p50_response_time REAL NOT NULL,
+                p95_response_time REAL NOT NULL,
+                p99_response_time REAL NOT NULL,
+                max_response_time REAL NOT NULL,
+                histogram TEXT NOT NULL,
+                memory_rss_mb REAL NOT NULL,
+                open_fds INTEGER NOT NULL,
+                connections INTEGER NOT NULL,
+                threads INTEGER NOT NULL,
+                PRIMARY KEY (benchmark_id, window_index)
+            )
+        """
+        )
+
         conn.commit()
-        conn.close()
+        self._migrate()
+
+    def _migrations(self) -> List[Callable[[sqlite3.Cursor], None]]:
+        """Forward migrations in order; migration ``i`` takes the schema from user_version ``i`` to ``i + 1``."""
+        return [
+            self._migrate_added_columns,
+            self._migrate_query_indexes,
+            self._migrate_run_metadata,
+            self._migrate_range_indexes,
+            self._migrate_latency_histogram,
+            self._migrate_result_tags,
+            self._migrate_comparisons,
+            self._migrate_convergence_stats,
+            self._migrate_endpoint_stats,
+            self._migrate_replay_stats,
+        ]
+
+    def schema_version(self) -> int:
+        """Schema version of the database (PRAGMA user_version)."""
+        return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _migrate(self) -> None:
+        """Apply the migrations the database has not seen yet, each in its own transaction."""
+        version = self.schema_version()
+        migrations = self._migrations()
+        if version > len(migrations):
+            raise ValueError(f"Database schema version {version} is newer than the supported version {len(migrations)}; upgrade http_benchmark")
+        for target_version, migration in enumerate(migrations[version:], start=version + 1):
+            cursor = self._conn.cursor()
+            try:
+                cursor.execute("BEGIN")
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {target_version}")
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _migrate_added_columns(self, cursor: sqlite3.Cursor) -> None:
+        """Version 1: columns added before the schema was versioned (databases may have any subset of them)."""
+        self._add_missing_columns(cursor, "benchmark_results", ADDED_COLUMNS)
+        self._add_missing_columns(cursor, "resource_metrics", ADDED_RESOURCE_METRICS_COLUMNS)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_resource_metrics_benchmark ON resource_metrics (benchmark_id, timestamp)")
+
+    def _migrate_query_indexes(self, cursor: sqlite3.Cursor) -> None:
+        """Version 2: indexes for the lookups by client, URL, name, method and recency."""
+        self._create_index(cursor, "idx_benchmark_results_client_url", "benchmark_results", ("client_library", "url", "created_at"))
+        self._create_index(cursor, "idx_benchmark_results_name", "benchmark_results", ("name",))
+        self._create_index(cursor, "idx_benchmark_results_method", "benchmark_results", ("http_method",))
+        self._create_index(cursor, "idx_benchmark_results_created", "benchmark_results", ("created_at",))
+
+    def _migrate_run_metadata(self, cursor: sqlite3.Cursor) -> None:
+        """Version 3: host, git SHA and environment fingerprint as columns, backfilled from config_snapshot where recorded."""
+        self._add_missing_columns(cursor, "benchmark_results", {column: "TEXT" for column in METADATA_COLUMNS})
+        if "config_snapshot" in self._table_columns(cursor, "benchmark_results"):
+            assignments = ", ".join(f"{column} = json_extract(config_snapshot, '$.runtime.{column}')" for column in METADATA_COLUMNS)
+            cursor.execute(f"UPDATE benchmark_results SET {assignments} WHERE json_valid(config_snapshot)")
+        self._create_index(cursor, "idx_benchmark_results_git_sha", "benchmark_results", ("git_sha",))
+        self._create_index(cursor, "idx_benchmark_results_environment", "benchmark_results", ("environment_fingerprint",))
+
+    def _migrate_range_indexes(self, cursor: sqlite3.Cursor) -> None:
+        """Version 4: indexes for the time range and concurrency filters and the keyset pagination of iter_results."""
+        self._create_index(cursor, "idx_benchmark_results_start_time", "benchmark_results", ("start_time",))
+        self._create_index(cursor, "idx_benchmark_results_concurrency", "benchmark_results", ("concurrency_level", "start_time"))
+
+    def _migrate_latency_histogram(self, cursor: sqlite3.Cursor) -> None:
+        """Version 5: compressed latency histogram per result; NULL for results saved before it existed."""
+        self._add_missing_columns(cursor, "benchmark_results", {"latency_histogram": "BLOB"})
+
+    def _migrate_result_tags(self, cursor: sqlite3.Cursor) -> None:
+        """Version 6: tags pinning results, e.g. as the baseline of regression checks."""
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS result_tags (
+                tag TEXT NOT NULL,
+                result_id TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (tag, result_id)
+            )
+        """
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_result_tags_result ON result_tags (result_id)")
+
+    def _migrate_comparisons(self, cursor: sqlite3.Cursor) -> None:
+        """Version 7: comparisons grouping the repeated trials of several clients, with their statistical summary."""
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS comparisons (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                url TEXT NOT NULL,
+                http_method TEXT NOT NULL,
+                concurrency_level INTEGER NOT NULL,
+                trials INTEGER NOT NULL,
+                summary TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS comparison_results (
+                comparison_id TEXT NOT NULL,
+                result_id TEXT NOT NULL,
+                client_library TEXT NOT NULL,
+                trial INTEGER NOT NULL,
+                PRIMARY KEY (comparison_id, result_id)
+            )
+        """
+        )
+
+    def _migrate_convergence_stats(self, cursor: sqlite3.Cursor) -> None:
+        """Version 8: precision and convergence trace of adaptive-duration runs."""
+        self._add_missing_columns(cursor, "benchmark_results", {"convergence_stats": "TEXT NOT NULL DEFAULT '{}'"})
+
+    def _migrate_endpoint_stats(self, cursor: sqlite3.Cursor) -> None:
+        """Version 9: latency and error statistics per endpoint of scenario runs."""
+        self._add_missing_columns(cursor, "benchmark_results", {"endpoint_stats": "TEXT NOT NULL DEFAULT '{}'"})
+
+    def _migrate_replay_stats(self, cursor: sqlite3.Cursor) -> None:
+        """Version 10: schedule lag and recorded-latency comparison of traffic replays."""
+        self._add_missing_columns(cursor, "benchmark_results", {"replay_stats": "TEXT NOT NULL DEFAULT '{}'"})
+
+    def _table_columns(self, cursor: sqlite3.Cursor, table: str) -> Set[str]:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def _create_index(self, cursor: sqlite3.Cursor, name: str, table: str, columns: Tuple[str, ...]) -> None:
+        """Create an index unless a column is missing from a hand-made or truncated table."""
+        if set(columns) <= self._table_columns(cursor, table):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+    def _add_missing_columns(self, cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]) -> None:
+        """Add columns introduced after `table` was created."""
+        existing_columns = self._table_columns(cursor, table)
+        for column, definition in columns.items():
+            if column not in existing_columns:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
 
     def save_result(self, result: BenchmarkResult) -> None:
-        """Save a benchmark result to the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Save a benchmark result, with its resource sample series, to the database."""
+        self._write(self._insert_result, result)
+
+    def _insert_result(self, cursor: sqlite3.Cursor, result: BenchmarkResult) -> None:
+        cursor.execute(INSERT_RESULT_SQL, tuple(_encode_column(column, getattr(result, column)) for column in RESULT_COLUMNS))
+        self._insert_resource_metrics(cursor, result.iter_resource_metrics())
 
+    def save_soak_window(self, window: Dict[str, Any]) -> None:
+        """Save one closed soak window (as produced by SoakRecorder) while the run is still going."""
+        self._write(self._insert_soak_window, window)
+
+    def _insert_soak_window(self, cursor: sqlite3.Cursor, window: Dict[str, Any]) -> None:
+        row = dict(window, start_time=window["start_time"].isoformat(), end_time=window["end_time"].isoformat(), histogram=json.dumps(window["histogram"]))
         cursor.execute(
+            f"INSERT INTO soak_windows ({', '.join(SOAK_WINDOW_COLUMNS)}) VALUES ({', '.join('?' * len(SOAK_WINDOW_COLUMNS))})",
+            [row[column] for column in SOAK_WINDOW_COLUMNS],
+        )
+
+    def tag_results(self, tag: str, result_ids: Iterable[str]) -> None:
+        """Pin results under `tag`, e.g. the runs of a release that later runs are checked against."""
+        self._write(self._insert_tags, tag, list(result_ids))
+
+    def _insert_tags(self, cursor: sqlite3.Cursor, tag: str, result_ids: List[str]) -> None:
+        cursor.executemany("INSERT OR IGNORE INTO result_tags (tag, result_id) VALUES (?, ?)", [(tag, result_id) for result_id in result_ids])
+
+    def remove_tag(self, tag: str) -> None:
+        """Unpin every result tagged `tag`; the results themselves are kept."""
+        self._write(self._delete_tag, tag)
+
+    def _delete_tag(self, cursor: sqlite3.Cursor, tag: str) -> None:
+        cursor.execute("DELETE FROM result_tags WHERE tag = ?", (tag,))
+
+    def get_tags(self, result_id: str) -> List[str]:
+        """Tags pinning a result."""
+        cursor = self._cursor()
+        cursor.execute("SELECT tag FROM result_tags WHERE result_id = ? ORDER BY tag", (result_id,))
+        return [row["tag"] for row in cursor.fetchall()]
+
+    def save_comparison(self, comparison: Dict[str, Any]) -> None:
+        """Save a comparison of repeated trials and link the results of its trials; the results are saved separately.
+
+        `comparison` is a trials.compare_trials summary plus name, url, http_method, concurrency_level and trials.
+        """
+        self._write(self._insert_comparison, comparison)
+
+    def _insert_comparison(self, cursor: sqlite3.Cursor, comparison: Dict[str, Any]) -> None:
+        summary = {key: value for key, value in comparison.items() if key not in ("id", "name", "url", "http_method", "concurrency_level", "trials")}
+        cursor.execute(
+            "INSERT INTO comparisons (id, name, url, http_method, concurrency_level, trials, summary) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (comparison["id"], comparison["name"], comparison["url"], comparison["http_method"], comparison["concurrency_level"], comparison["trials"], json.dumps(summary)),
+        )
+        cursor.executemany(
+            "INSERT INTO comparison_results (comparison_id, result_id, client_library, trial) VALUES (?, ?, ?, ?)",
+            [(comparison["id"], result_id, client_library, trial) for client_library, client in comparison["clients"].items() for trial, result_id in enumerate(client["result_ids"])],
+        )
+
+    def get_comparison(self, comparison_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a saved comparison with its summary; the trial results are listed under clients[...]["result_ids"]."""
+        cursor = self._cursor()
+        cursor.execute("SELECT * FROM comparisons WHERE id = ?", (comparison_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        comparison = {key: row[key] for key in ("id", "name", "url", "http_method", "concurrency_level", "trials", "created_at")}
+        comparison.update(json.loads(row["summary"]))
+        return comparison
+
+    def get_soak_windows(self, benchmark_id: str) -> List[Dict[str, Any]]:
+        """Retrieve the windows of a soak run in order, with their latency histograms."""
+        cursor = self._cursor()
+        cursor.execute("SELECT * FROM soak_windows WHERE benchmark_id = ? ORDER BY window_index", (benchmark_id,))
+        rows = cursor.fetchall()
+        windows = []
+        for row in rows:
+            window = dict(row)
+            window["start_time"] = datetime.fromisoformat(window["start_time"])
+            window["end_time"] = datetime.fromisoformat(window["end_time"])
+            window["histogram"] = json.loads(window["histogram"])
+            windows.append(window)
+        return windows
+
+    def save_resource_metrics(self, metrics: Iterable[ResourceMetrics]) -> None:
+        """Save a series of resource samples."""
+        self._write(self._insert_resource_metrics, metrics)
+
+    def _insert_resource_metrics(self, cursor: sqlite3.Cursor, metrics: Iterable[ResourceMetrics]) -> None:
+        """Insert samples lazily so long series are never materialized in memory."""
+        cursor.executemany(
             """
-            INSERT INTO benchmark_results (
-                id, name, client_library, client_type, http_method, url, start_time, end_time,
-                duration, requests_count, requests_per_second, avg_response_time,
-                min_response_time, max_response_time, p95_response_time, p99_response_time,
-                cpu_usage_avg, memory_usage_avg, network_io, error_count, error_rate,
-                concurrency_level, config_snapshot
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO resource_metrics (
+                id, benchmark_id, timestamp, cpu_percent, memory_mb, memory_percent,
+                bytes_sent, bytes_received, disk_read_mb, disk_write_mb, source
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
             (
-                result.id,
-                result.name,
-                result.client_library,
-                result.client_type,
-                result.http_method,
-                result.url,
-                result.start_time.isoformat(),
-                result.end_time.isoformat(),
-                result.duration,
-                result.requests_count,
-                result.requests_per_second,
-                result.avg_response_time,
-                result.min_response_time,
-                result.max_response_time,
-                result.p95_response_time,
-                result.p99_response_time,
-                result.cpu_usage_avg,
-                result.memory_usage_avg,
-                json.dumps(result.network_io),
-                result.error_count,
-                result.error_rate,
-                result.concurrency_level,
-                json.dumps(result.config_snapshot),
+                (
+                    metric.id,
+                    metric.benchmark_id,
+                    metric.timestamp.isoformat(),
+                    metric.cpu_percent,
+                    metric.memory_mb,
+                    metric.memory_percent,
+                    metric.bytes_sent,
+                    metric.bytes_received,
+                    metric.disk_read_mb,
+                    metric.disk_write_mb,
+                    metric.source,
+                )
+                for metric in metrics
             ),
         )
 
-        conn.commit()
-        conn.close()
+    def get_resource_metrics(self, benchmark_id: str, source: Optional[str] = None) -> List[ResourceMetrics]:
+        """Retrieve the resource sample series of a benchmark run in time order, optionally for one source ("client" or "target")."""
+        cursor = self._cursor()
+
+        if source:
+            cursor.execute(
+                """
+                SELECT * FROM resource_metrics WHERE benchmark_id = ? AND source = ? ORDER BY timestamp
+            """,
+                (benchmark_id, source),
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT * FROM resource_metrics WHERE benchmark_id = ? ORDER BY timestamp
+            """,
+                (benchmark_id,),
+            )
+
+        rows = cursor.fetchall()
+
+        return [
+            ResourceMetrics(
+                id=row["id"],
+                benchmark_id=row["benchmark_id"],
+                timestamp=datetime.fromisoformat(row["timestamp"]),
+                cpu_percent=row["cpu_percent"],
+                memory_mb=row["memory_mb"],
+                memory_percent=row["memory_percent"],
+                bytes_sent=row["bytes_sent"],
+                bytes_received=row["bytes_received"],
+                disk_read_mb=row["disk_read_mb"],
+                disk_write_mb=row["disk_write_mb"],
+                source=row["source"],
+            )
+            for row in rows
+        ]
 
     def get_result_by_id(self, result_id: str) -> Optional[BenchmarkResult]:
         """Retrieve a benchmark result by its ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._cursor()
 
         cursor.execute(
             """
@@ -112,7 +662,6 @@ class ResultStorage:
         )
 
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return self._row_to_benchmark_result(row)
@@ -120,41 +669,158 @@ class ResultStorage:
 
     def get_results_by_name(self, name: str) -> List[BenchmarkResult]:
         """Retrieve benchmark results by name."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return list(self.iter_results(name=name))
+
+    def get_all_results(self) -> List[BenchmarkResult]:
+        """Retrieve all benchmark results, most recent first; use iter_results for large databases."""
+        return list(self.iter_results())
 
+    def iter_results(
+        self,
+        client_library: Optional[str] = None,
+        url: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        concurrency: Optional[Union[int, Sequence[int]]] = None,
+        name: Optional[str] = None,
+        http_method: Optional[str] = None,
+        tag: Optional[str] = None,
+        ids: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = PAGE_SIZE,
+    ) -> Iterator[Union[BenchmarkResult, Dict[str, Any]]]:
+        """Yield matching results, most recent first, fetching `page_size` rows per query.
+
+        Filters are applied in SQL: `since`/`until` bound the start time (inclusive/exclusive), and `concurrency`
+        is one level or a list of levels, `tag` keeps results pinned with tag_results, and `ids` restricts to the
+        given result IDs. With `fields`, only those columns are read and each result is a dict
+        of them instead of a BenchmarkResult. Pages are read with short keyset queries, so no cursor stays open
+        between pages and memory stays flat however many results match.
+        """
+        cursor = None
+        while True:
+            page, cursor = self.query_results(
+                client_library=client_library,
+                url=url,
+                since=since,
+                until=until,
+                concurrency=concurrency,
+                name=name,
+                http_method=http_method,
+                tag=tag,
+                ids=ids,
+                fields=fields,
+                limit=page_size,
+                after=cursor,
+            )
+            yield from page
+            if cursor is None:
+                return
+
+    def query_results(
+        self,
+        client_library: Optional[str] = None,
+        url: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        concurrency: Optional[Union[int, Sequence[int]]] = None,
+        name: Optional[str] = None,
+        http_method: Optional[str] = None,
+        tag: Optional[str] = None,
+        ids: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+        limit: int = PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Tuple[List[Union[BenchmarkResult, Dict[str, Any]]], Optional[str]]:
+        """Fetch one page of matching results, most recent first, and the cursor of the next page.
+
+        Takes the same filters as iter_results. Pass the returned cursor as `after` to continue; it is None
+        on the last page. The cursor is the (start time, rowid) of the last row, so pages stay stable while
+        results are being added.
+        """
+        if limit <= 0:
+            raise ValueError("Page size must be positive")
+        columns = tuple(fields) if fields else RESULT_COLUMNS
+        unknown = [column for column in columns if column not in RESULT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown result fields: {', '.join(unknown)}")
+
+        conditions = []
+        params: List[Any] = []
+        for column, value in (("client_library", client_library), ("url", url), ("name", name), ("http_method", http_method)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("start_time >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            conditions.append("start_time < ?")
+            params.append(until.isoformat())
+        if concurrency is not None:
+            levels = [concurrency] if isinstance(concurrency, int) else list(concurrency)
+            conditions.append(f"concurrency_level IN ({', '.join('?' * len(levels))})")
+            params.extend(levels)
+        if tag is not None:
+            conditions.append("id IN (SELECT result_id FROM result_tags WHERE tag = ?)")
+            params.append(tag)
+        if ids is not None:
+            conditions.append(f"id IN ({', '.join('?' * len(ids))})")
+            params.extend(ids)
+        if after is not None:
+            start_time, _, rowid = after.rpartition("|")
+            conditions.append("(start_time < ? OR (start_time = ? AND rowid < ?))")
+            params.extend((start_time, start_time, int(rowid)))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = self._cursor()
         cursor.execute(
-            """
-            SELECT * FROM benchmark_results WHERE name = ?
-        """,
-            (name,),
+            f"SELECT rowid AS _rowid, start_time AS _start_time, {', '.join(columns)} FROM benchmark_results {where} ORDER BY start_time DESC, rowid DESC LIMIT ?",
+            (*params, limit),
         )
-
         rows = cursor.fetchall()
-        conn.close()
 
-        return [self._row_to_benchmark_result(row) for row in rows]
+        if fields:
+            page = [{column: _decode_column(column, row[column]) for column in columns} for row in rows]
+        else:
+            page = [self._row_to_benchmark_result(row) for row in rows]
+        next_cursor = f"{rows[-1]['_start_time']}|{rows[-1]['_rowid']}" if len(rows) == limit else None
+        return page, next_cursor
 
-    def get_all_results(self) -> List[BenchmarkResult]:
-        """Retrieve all benchmark results."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def merge_latency_histograms(self, **filters) -> Tuple[LatencyHistogram, int]:
+        """Merge the latency histograms of every result matching `filters` (as for iter_results).
 
-        cursor.execute(
-            """
-            SELECT * FROM benchmark_results ORDER BY created_at DESC
+        Returns the merged histogram and the number of matching results saved without a histogram, which
+        are left out. Only the histogram column is read, a page at a time.
         """
-        )
+        merged = LatencyHistogram()
+        missing = 0
+        for row in self.iter_results(fields=["latency_histogram"], **filters):
+            if row["latency_histogram"] is None:
+                missing += 1
+            else:
+                merged.merge(row["latency_histogram"])
+        return merged, missing
 
-        rows = cursor.fetchall()
-        conn.close()
+    def aggregate_latency(self, percentiles: Sequence[float] = AGGREGATE_PERCENTILES, **filters) -> Dict[str, Any]:
+        """Latency percentiles over all requests of the matching results, e.g. every httpx run of the past week.
 
-        return [self._row_to_benchmark_result(row) for row in rows]
+        Percentiles are read from the merged histograms, so they are exact to the histogram's bucket precision
+        (1%) instead of being an average of per-run percentiles, which weighs runs equally whatever their size.
+        """
+        histogram, missing = self.merge_latency_histograms(**filters)
+        return {
+            "requests": histogram.count,
+            "results_without_histogram": missing,
+            "mean": histogram.mean,
+            "min": histogram.min or 0.0,
+            "max": histogram.max or 0.0,
+            "percentiles": {f"p{percentile * 100:g}": histogram.percentile(percentile) for percentile in percentiles},
+        }
 
     def compare_results(self, result_ids: List[str]) -> List[Dict[str, Any]]:
         """Compare multiple benchmark results."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._cursor()
 
         placeholders = ",".join("?" * len(result_ids))
         cursor.execute(
@@ -165,7 +831,6 @@ class ResultStorage:
         )
 
         rows = cursor.fetchall()
-        conn.close()
 
         results = [self._row_to_benchmark_result(row) for row in rows]
 
@@ -178,38 +843,41 @@ class ResultStorage:
                     "client_library": result.client_library,
                     "requests_per_second": result.requests_per_second,
                     "avg_response_time": result.avg_response_time,
+                    "p95_response_time": result.p95_response_time,
+                    "p99_response_time": result.p99_response_time,
                     "error_rate": result.error_rate,
                     "cpu_usage_avg": result.cpu_usage_avg,
+                    "cpu_usage_normalized": result.cpu_usage_normalized,
                     "memory_usage_avg": result.memory_usage_avg,
+                    "cpu_us_per_request": result.cpu_us_per_request,
+                    "requests_per_cpu_second": result.requests_per_cpu_second,
                 }
             )
 
         return comparison
 
-    def _row_to_benchmark_result(self, row: tuple) -> BenchmarkResult:
-        """Convert a database row to a BenchmarkResult object."""
-        return BenchmarkResult(
-            id=row[0],
-            name=row[1],
-            client_library=row[2],
-            client_type=row[3],
-            http_method=row[4],
-            url=row[5],
-            start_time=datetime.fromisoformat(row[6]),
-            end_time=datetime.fromisoformat(row[7]),
-            duration=row[8],
-            requests_count=row[9],
-            requests_per_second=row[10],
-            avg_response_time=row[11],
-            min_response_time=row[12],
-            max_response_time=row[13],
-            p95_response_time=row[14],
-            p99_response_time=row[15],
-            cpu_usage_avg=row[16],
-            memory_usage_avg=row[17],
-            network_io=json.loads(row[18]),
-            error_count=row[19],
-            error_rate=row[20],
-            concurrency_level=row[21],
-            config_snapshot=json.loads(row[22]),
-        )
+    def _row_to_benchmark_result(self, row: sqlite3.Row) -> BenchmarkResult:
+        """Convert a database row to a BenchmarkResult object, mapping columns by name."""
+        return BenchmarkResult(**{column: _decode_column(column, row[column]) for column in RESULT_COLUMNS})
+
+
+def _encode_column(column: str, value: Any) -> Any:
+    """Convert a BenchmarkResult attribute to its stored form."""
+    if column in JSON_RESULT_COLUMNS:
+        return json.dumps(value)
+    if column in DATETIME_RESULT_COLUMNS:
+        return value.isoformat()
+    if column in HISTOGRAM_RESULT_COLUMNS:
+        return value.to_bytes() if value is not None else None
+    return value
+
+
+def _decode_column(column: str, value: Any) -> Any:
+    """Convert a stored benchmark_results value back to the BenchmarkResult attribute."""
+    if column in JSON_RESULT_COLUMNS:
+        return json.loads(value)
+    if column in DATETIME_RESULT_COLUMNS:
+        return datetime.fromisoformat(value)
+    if column in HISTOGRAM_RESULT_COLUMNS:
+        return LatencyHistogram.from_bytes(value) if value is not None else None
+    return value
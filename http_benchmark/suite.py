@@ -0,0 +1,176 @@
+"""Declarative benchmark suites with matrix expansion for the HTTP benchmark framework."""
+
+import inspect
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .benchmark import ADAPTER_CLASSES, BenchmarkRunner
+from .models.benchmark_configuration import BenchmarkConfiguration
+from .models.benchmark_result import BenchmarkResult
+from .utils.logging import app_logger
+
+# Suite keys that are not configuration fields: a request body of this many bytes
+PAYLOAD_FIELD = "payload_bytes"
+
+# Configuration fields a suite may set in `defaults` or vary in `matrix`
+SUITE_FIELDS = frozenset(name for name in inspect.signature(BenchmarkConfiguration.__init__).parameters if name not in ("self", "id", "name")) | {PAYLOAD_FIELD}
+
+# Pause between two runs of a suite unless the suite sets `cooldown_seconds`
+DEFAULT_COOLDOWN = 5.0
+
+
+def load_suite(path: str) -> Dict[str, Any]:
+    """Read and validate a suite file; TOML (.toml), YAML (.yaml, .yml) or JSON (.json) by extension.
+
+    A suite has a `name`, optional `cooldown_seconds`, `defaults` applied to every run, a `matrix` mapping
+    fields to the list of values to combine, and `exclude`, a list of partial combinations to leave out.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python 3.10
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    elif extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML suites need PyYAML: pip install 'http-client-benchmarker[suite]'") from None
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+    elif extension == ".json":
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        raise ValueError(f"Unknown suite format '{extension}'; use .toml, .yaml, .yml or .json")
+    data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return validate_suite(data)
+
+
+def validate_suite(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Check a suite's structure and field names and fill in the optional parts."""
+    unknown_keys = set(data) - {"name", "cooldown_seconds", "defaults", "matrix", "exclude"}
+    if unknown_keys:
+        raise ValueError(f"Unknown suite keys: {', '.join(sorted(unknown_keys))}")
+    suite = {
+        "name": str(data.get("name") or "suite"),
+        "cooldown_seconds": float(data.get("cooldown_seconds", DEFAULT_COOLDOWN)),
+        "defaults": dict(data.get("defaults") or {}),
+        "matrix": dict(data.get("matrix") or {}),
+        "exclude": list(data.get("exclude") or []),
+    }
+    if suite["cooldown_seconds"] < 0:
+        raise ValueError("cooldown_seconds must not be negative")
+    for section, fields in [("defaults", suite["defaults"]), ("matrix", suite["matrix"])] + [("exclude", rule) for rule in suite["exclude"]]:
+        unknown = set(fields) - SUITE_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown fields in {section}: {', '.join(sorted(unknown))}")
+    for field, values in suite["matrix"].items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Matrix field {field} must be a non-empty list")
+    if "target_url" not in suite["defaults"] and "target_url" not in suite["matrix"]:
+        raise ValueError("A suite needs target_url in defaults or matrix")
+    return suite
+
+
+def combination_key(combination: Dict[str, Any]) -> str:
+    """Stable identifier of a matrix combination, used to name its runs and to resume a suite run."""
+    return ", ".join(f"{field}={value}" for field, value in combination.items())
+
+
+def unsupported_reason(fields: Dict[str, Any]) -> Optional[str]:
+    """Why the adapter cannot run this combination, or None when it can."""
+    client = fields.get("client_library", "requests")
+    adapter_class = ADAPTER_CLASSES.get(client)
+    if adapter_class is None:
+        return f"unknown client library {client}"
+    if fields.get("is_async") and not adapter_class.supports_async:
+        return f"{client} is sync-only"
+    if not fields.get("is_async") and not adapter_class.supports_sync:
+        return f"{client} is async-only"
+    return None
+
+
+def expand_suite(suite: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Expand the matrix into one configuration per combination, in matrix order.
+
+    Returns the runs (`key` and `config`) and the skipped combinations (`key` and `reason`): those matching
+    an `exclude` rule and those the client's adapter cannot run, such as pycurl in async mode.
+    """
+    runs = []
+    skipped = []
+    fields = list(suite["matrix"])
+    for values in itertools.product(*(suite["matrix"][field] for field in fields)):
+        combination = dict(zip(fields, values))
+        key = combination_key(combination)
+        settings = {**suite["defaults"], **combination}
+        if any(all(settings.get(field) == value for field, value in rule.items()) for rule in suite["exclude"]):
+            skipped.append({"key": key, "reason": "excluded"})
+            continue
+        reason = unsupported_reason(settings)
+        if reason:
+            skipped.append({"key": key, "reason": reason})
+            continue
+        payload_bytes = settings.pop(PAYLOAD_FIELD, None)
+        if payload_bytes is not None:
+            settings["body"] = "x" * int(payload_bytes)
+        runs.append({"key": key, "config": BenchmarkConfiguration(name=f"{suite['name']} [{key}]", **settings)})
+    return runs, skipped
+
+
+def new_run_id(suite: Dict[str, Any]) -> str:
+    """Run ID of a new suite run: the suite name and the start time."""
+    return f"{suite['name']}-{datetime.now():%Y%m%dT%H%M%S}"
+
+
+def completed_keys(storage, run_id: str) -> Set[str]:
+    """Combination keys that already have a saved result in suite run `run_id`."""
+    keys = set()
+    for row in storage.iter_results(tag=run_id, fields=["config_snapshot"]):
+        key = row["config_snapshot"].get("suite", {}).get("key")
+        if key is not None:
+            keys.add(key)
+    return keys
+
+
+def run_suite(
+    suite: Dict[str, Any],
+    storage,
+    run_id: Optional[str] = None,
+    on_result: Optional[Callable[[Dict[str, Any], BenchmarkResult], None]] = None,
+) -> Dict[str, Any]:
+    """Run every combination of the suite, saving and tagging each result with the suite run ID as it completes.
+
+    Each result is tagged `run_id` in `storage` and records the suite name, run ID and combination key in
+    ``config_snapshot["suite"]``. Passing the `run_id` of an interrupted run resumes it: combinations with a
+    saved result are not run again. Runs are separated by the suite's cooldown so that heat and sockets in
+    TIME_WAIT from one run do not carry over to the next.
+    """
+    runs, skipped = expand_suite(suite)
+    run_id = run_id or new_run_id(suite)
+    done = completed_keys(storage, run_id)
+    pending = [run for run in runs if run["key"] not in done]
+    if done:
+        app_logger.info(f"Resuming suite run {run_id}: {len(runs) - len(pending)} of {len(runs)} combinations already done")
+    for skip in skipped:
+        app_logger.info(f"Skipping {skip['key']}: {skip['reason']}")
+
+    results = []
+    for index, run in enumerate(pending):
+        if index and suite["cooldown_seconds"]:
+            time.sleep(suite["cooldown_seconds"])
+        app_logger.info(f"Suite {run_id} run {index + 1} of {len(pending)}: {run['key']}")
+        result = BenchmarkRunner(run["config"]).run()
+        result.config_snapshot["suite"] = {"name": suite["name"], "run_id": run_id, "key": run["key"]}
+        storage.save_result(result)
+        storage.tag_results(run_id, [result.id])
+        results.append(result)
+        if on_result:
+            on_result(run, result)
+    return {"run_id": run_id, "results": results, "skipped": skipped, "resumed": len(runs) - len(pending), "total": len(runs)}
@@ -0,0 +1,123 @@
+"""Repeated trials of client comparisons for the HTTP benchmark framework."""
+
+import uuid
+from itertools import combinations
+from statistics import mean, median, stdev
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .benchmark import BenchmarkRunner
+from .models.benchmark_configuration import BenchmarkConfiguration
+from .models.benchmark_result import BenchmarkResult
+from .regression import merge_histograms
+from .utils.logging import app_logger
+from .utils.stats import bootstrap_ci, mann_whitney_histograms, welch_t_test
+
+# Confidence level of the bootstrap intervals
+DEFAULT_CONFIDENCE = 0.95
+
+# Significance level of the differences between clients
+DEFAULT_ALPHA = 0.05
+
+
+def run_trials(
+    configs: Dict[str, BenchmarkConfiguration],
+    repeat: int,
+    on_result: Optional[Callable[[str, int, BenchmarkResult], None]] = None,
+) -> Dict[str, List[BenchmarkResult]]:
+    """Run every configuration `repeat` times, one round of all clients per trial.
+
+    Alternating the clients round by round instead of running all trials of one client in a row keeps slow
+    drift of the machine (thermal state, caches, neighbours) from landing on a single client.
+    `on_result(client, trial, result)` is called after each run, e.g. to save it.
+    """
+    if repeat < 1:
+        raise ValueError("Trials need at least one repetition")
+    trials: Dict[str, List[BenchmarkResult]] = {client: [] for client in configs}
+    for trial in range(repeat):
+        for client, config in configs.items():
+            app_logger.info(f"Trial {trial + 1} of {repeat}: {client}")
+            result = BenchmarkRunner(config).run()
+            trials[client].append(result)
+            if on_result:
+                on_result(client, trial, result)
+    return trials
+
+
+def describe(values: Sequence[float], confidence: float = DEFAULT_CONFIDENCE) -> Dict[str, float]:
+    """Mean, median, standard deviation and bootstrap confidence interval of the mean over trials."""
+    ci_low, ci_high = bootstrap_ci(values, mean, confidence)
+    return {
+        "mean": mean(values),
+        "median": median(values),
+        "stdev": stdev(values) if len(values) > 1 else 0.0,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+def compare_trials(trials: Dict[str, Sequence[BenchmarkResult]], alpha: float = DEFAULT_ALPHA, confidence: float = DEFAULT_CONFIDENCE) -> Dict[str, Any]:
+    """Summarize the trials of each client and test every pair of clients for a difference.
+
+    RPS and p99 are summarized over the per-trial values. For each pair, throughput is compared with a
+    two-sided Welch's t-test on the per-trial RPS, and latency with a two-sided Mann-Whitney U test on
+    all requests of all trials (from the merged histograms). `latency_effect` is the probability that a
+    request of the second client is slower than one of the first.
+    """
+    clients = {}
+    histograms = {}
+    for client, results in trials.items():
+        clients[client] = {
+            "trials": len(results),
+            "requests_per_second": describe([result.requests_per_second for result in results], confidence),
+            "p99_response_time": describe([result.p99_response_time for result in results], confidence),
+            "result_ids": [result.id for result in results],
+        }
+        histograms[client] = merge_histograms(results)
+
+    pairs = []
+    for first, second in combinations(trials, 2):
+        first_rps = [result.requests_per_second for result in trials[first]]
+        second_rps = [result.requests_per_second for result in trials[second]]
+        throughput = welch_t_test(first_rps, second_rps, alternative="two-sided")
+        latency = {"p_value": None, "effect": None}
+        if histograms[first] and histograms[second]:
+            latency = mann_whitney_histograms(histograms[first], histograms[second], alternative="two-sided")
+        first_mean = mean(first_rps)
+        pairs.append(
+            {
+                "clients": [first, second],
+                "rps_change": mean(second_rps) / first_mean - 1 if first_mean else 0.0,
+                "rps_p_value": throughput["p_value"],
+                "rps_significant": throughput["p_value"] is not None and throughput["p_value"] < alpha,
+                "latency_p_value": latency["p_value"],
+                "latency_effect": latency["effect"],
+                "latency_significant": latency["p_value"] is not None and latency["p_value"] < alpha,
+            }
+        )
+    return {"id": str(uuid.uuid4()), "alpha": alpha, "confidence": confidence, "clients": clients, "pairs": pairs}
+
+
+def format_trials(comparison: Dict[str, Any]) -> str:
+    """Table of the per-client summaries followed by the pairwise differences."""
+    confidence = f"{comparison['confidence'] * 100:.0f}% CI"
+    lines = [
+        f"{'Client':<12} {'Trials':<8} {'RPS mean':<10} {'RPS median':<12} {'RPS ' + confidence:<22} {'p99 mean ms':<13} {'p99 ' + confidence + ' ms':<22}",
+        "-" * 103,
+    ]
+    for client, summary in comparison["clients"].items():
+        rps = summary["requests_per_second"]
+        p99 = summary["p99_response_time"]
+        rps_ci = f"{rps['ci_low']:.2f} - {rps['ci_high']:.2f}"
+        p99_ci = f"{p99['ci_low'] * 1000:.3f} - {p99['ci_high'] * 1000:.3f}"
+        lines.append(f"{client:<12} {summary['trials']:<8} {rps['mean']:<10.2f} {rps['median']:<12.2f} {rps_ci:<22} {p99['mean'] * 1000:<13.3f} {p99_ci:<22}")
+    for pair in comparison["pairs"]:
+        first, second = pair["clients"]
+        rps_p = f"p={pair['rps_p_value']:.4f}" if pair["rps_p_value"] is not None else "needs 2+ trials"
+        latency_p = f"p={pair['latency_p_value']:.4f}" if pair["latency_p_value"] is not None else "no histograms"
+        lines.append(
+            f"{second} vs {first}: RPS {pair['rps_change'] * 100:+.1f}% ({rps_p}, {'significant' if pair['rps_significant'] else 'not significant'}), "
+            f"latency {latency_p} ({'significant' if pair['latency_significant'] else 'not significant'}"
+            + (f", P(slower) {pair['latency_effect']:.2f}" if pair["latency_effect"] is not None else "")
+            + ")"
+        )
+    return "\n".join(lines)
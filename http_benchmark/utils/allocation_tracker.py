@@ -0,0 +1,112 @@
+"""Allocation tracking for the HTTP benchmark framework."""
+
+import importlib.util
+import os
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def package_locations(packages: Sequence[str]) -> List[str]:
+    """Resolve importable package names to the directories (or single files) that hold their code."""
+    locations = []
+    for package in packages:
+        try:
+            spec = importlib.util.find_spec(package)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None:
+            continue
+        if spec.submodule_search_locations:
+            locations.extend(os.path.join(location, "") for location in spec.submodule_search_locations)
+        elif spec.origin:
+            locations.append(spec.origin)
+    return locations
+
+
+class AllocationTracker:
+    """Compare tracemalloc snapshots taken at the end of warm-up and at the end of the measured phase.
+
+    tracemalloc only sees memory that is still allocated when a snapshot is taken, so the per-request
+    figures are net allocations retained over the run; short-lived churn shows up in ``peak_traced_mb``.
+    Call sites are attributed to the innermost frame that belongs to the client library (or its adapter).
+    """
+
+    def __init__(self, locations: Sequence[str], frames: int = 15, top: int = 10):
+        self.locations = list(locations)
+        self.frames = frames
+        self.top = top
+        self._started_tracing = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._final: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        """Start tracing allocations unless tracemalloc is already running."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._baseline = None
+        self._final = None
+
+    def warmup_complete(self) -> None:
+        """Take the baseline snapshot."""
+        self._baseline = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+
+    def measurement_complete(self) -> None:
+        """Take the final snapshot while the client is still open."""
+        self._final = tracemalloc.take_snapshot()
+
+    def stop(self, requests_count: int) -> Dict[str, Any]:
+        """Stop tracing and return per-request allocation figures and the top library call sites."""
+        if self._final is None and tracemalloc.is_tracing():
+            self.measurement_complete()
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self._baseline is None or self._final is None:
+            return {}
+
+        snapshot_filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        baseline = self._baseline.filter_traces(snapshot_filters)
+        final = self._final.filter_traces(snapshot_filters)
+        diffs = final.compare_to(baseline, "traceback")
+
+        size_diff = sum(diff.size_diff for diff in diffs)
+        count_diff = sum(diff.count_diff for diff in diffs)
+        library_size_diff = 0
+        library_count_diff = 0
+        sites: Dict[str, Dict[str, Any]] = {}
+        for diff in diffs:
+            frame = self._library_frame(diff.traceback)
+            if frame is None:
+                continue
+            library_size_diff += diff.size_diff
+            library_count_diff += diff.count_diff
+            site = f"{frame.filename}:{frame.lineno}"
+            entry = sites.setdefault(site, {"site": site, "size_diff": 0, "count_diff": 0})
+            entry["size_diff"] += diff.size_diff
+            entry["count_diff"] += diff.count_diff
+
+        top_sites = sorted(sites.values(), key=lambda entry: entry["size_diff"], reverse=True)[: self.top]
+        for entry in top_sites:
+            entry["bytes_per_request"] = entry["size_diff"] / requests_count if requests_count > 0 else 0
+
+        return {
+            "requests_count": requests_count,
+            "net_bytes": size_diff,
+            "net_blocks": count_diff,
+            "bytes_per_request": size_diff / requests_count if requests_count > 0 else 0,
+            "blocks_per_request": count_diff / requests_count if requests_count > 0 else 0,
+            "library_bytes_per_request": library_size_diff / requests_count if requests_count > 0 else 0,
+            "library_blocks_per_request": library_count_diff / requests_count if requests_count > 0 else 0,
+            "peak_traced_mb": peak / 1024 / 1024,
+            "top_sites": top_sites,
+        }
+
+    def _library_frame(self, traceback: tracemalloc.Traceback) -> Optional[tracemalloc.Frame]:
+        """Return the most recent frame inside one of the tracked locations."""
+        for frame in reversed(traceback):
+            if any(frame.filename.startswith(location) for location in self.locations):
+                return frame
+        return None
@@ -0,0 +1,108 @@
+"""Control group (cgroup) helpers for the HTTP benchmark framework."""
+
+import os
+from typing import Dict, List, Optional, Union
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def resolve_cgroup_path(path: str, root: str = CGROUP_ROOT) -> str:
+    """Accept either a filesystem path or a cgroup path relative to the cgroup root (e.g. ``/system.slice/nginx.service``)."""
+    if os.path.isdir(path) and os.path.exists(os.path.join(path, "cgroup.procs")):
+        return path
+    candidate = os.path.join(root, path.lstrip("/"))
+    if os.path.isdir(candidate):
+        return candidate
+    raise ValueError(f"Cgroup not found: {path}")
+
+
+def process_cgroup_path(pid: Union[int, str] = "self", root: str = CGROUP_ROOT) -> Optional[str]:
+    """Directory of the cgroup holding the CPU controller files of a process, or None if there is none.
+
+    Looks for the v1 ``cpu`` hierarchy first (hybrid hosts mount v2 without the CPU controller), then v2.
+    """
+    content = _read(f"/proc/{pid}/cgroup")
+    if not content:
+        return None
+    candidates = []
+    for line in content.splitlines():
+        hierarchy, _, rest = line.partition(":")
+        controllers, _, path = rest.partition(":")
+        if "cpu" in controllers.split(","):
+            candidates.insert(0, os.path.join(root, controllers, path.lstrip("/")))
+            candidates.insert(1, os.path.join(root, "cpu", path.lstrip("/")))
+        elif hierarchy == "0" and not controllers:
+            candidates.append(os.path.join(root, path.lstrip("/")))
+    for candidate in candidates:
+        if os.path.exists(os.path.join(candidate, "cpu.max")) or os.path.exists(os.path.join(candidate, "cpu.cfs_quota_us")):
+            return os.path.normpath(candidate)
+    return None
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as cgroup_file:
+            return cgroup_file.read()
+    except OSError:
+        return None
+
+
+def read_cgroup_pids(path: str) -> List[int]:
+    """PIDs of the processes in the cgroup."""
+    content = _read(os.path.join(path, "cgroup.procs"))
+    return [int(line) for line in content.split()] if content else []
+
+
+def read_cgroup_cpu_usage(path: str) -> Optional[float]:
+    """Cumulative CPU time of the cgroup in seconds (cgroup v2 ``cpu.stat``, v1 ``cpuacct.usage``)."""
+    content = _read(os.path.join(path, "cpu.stat"))
+    if content:
+        for line in content.splitlines():
+            key, _, value = line.partition(" ")
+            if key == "usage_usec":
+                return int(value) / 1_000_000
+    content = _read(os.path.join(path, "cpuacct.usage"))
+    return int(content) / 1_000_000_000 if content else None
+
+
+def read_cgroup_cpu_throttling(path: str) -> Dict[str, float]:
+    """Throttling counters of the cgroup: enforcement periods, throttled periods and throttled time in seconds.
+
+    Empty when the cgroup has no CPU controller files; the counters only move while a CPU quota is set.
+    """
+    content = _read(os.path.join(path, "cpu.stat"))
+    if not content:
+        return {}
+    stat = {}
+    for line in content.splitlines():
+        key, _, value = line.partition(" ")
+        if value.strip().isdigit():
+            stat[key] = int(value)
+    if "throttled_usec" in stat:
+        throttled = stat["throttled_usec"] / 1_000_000
+    elif "throttled_time" in stat:
+        throttled = stat["throttled_time"] / 1_000_000_000  # cgroup v1 reports nanoseconds
+    else:
+        return {}
+    return {"nr_periods": stat.get("nr_periods", 0), "nr_throttled": stat.get("nr_throttled", 0), "throttled_seconds": throttled}
+
+
+def read_cgroup_memory(path: str) -> Optional[int]:
+    """Current memory charged to the cgroup in bytes."""
+    content = _read(os.path.join(path, "memory.current")) or _read(os.path.join(path, "memory.usage_in_bytes"))
+    return int(content) if content else None
+
+
+def read_cgroup_cpu_limit(path: str) -> Optional[float]:
+    """CPU limit of the cgroup in cores, or None when it is not limited."""
+    content = _read(os.path.join(path, "cpu.max"))
+    if content:
+        quota, _, period = content.strip().partition(" ")
+        if quota == "max":
+            return None
+        return int(quota) / int(period or 100_000)
+    quota = _read(os.path.join(path, "cpu.cfs_quota_us"))
+    period = _read(os.path.join(path, "cpu.cfs_period_us"))
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
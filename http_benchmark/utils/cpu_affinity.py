@@ -0,0 +1,92 @@
+"""CPU sets, pinning and the effective CPU budget for the HTTP benchmark framework."""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .cgroup import process_cgroup_path, read_cgroup_cpu_limit
+
+
+def parse_cpu_set(spec: str) -> List[int]:
+    """Parse a CPU list in the kernel's ``cpuset`` notation, e.g. ``0-3,6``."""
+    cpus: Set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        try:
+            start, end = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Invalid CPU set: {spec!r}")
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid CPU set: {spec!r}")
+        cpus.update(range(start, end + 1))
+    if not cpus:
+        raise ValueError(f"Invalid CPU set: {spec!r}")
+    return sorted(cpus)
+
+
+def format_cpu_set(cpus: Iterable[int]) -> str:
+    """Inverse of parse_cpu_set: ``[0, 1, 2, 3, 6]`` becomes ``0-3,6``."""
+    ranges: List[List[int]] = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def is_supported() -> bool:
+    """Whether this platform supports reading and setting CPU affinity."""
+    return hasattr(os, "sched_setaffinity")
+
+
+def get_affinity(pid: int = 0) -> Set[int]:
+    """CPUs a process may run on; all CPUs where affinity is not supported."""
+    if is_supported():
+        return os.sched_getaffinity(pid)
+    return set(range(os.cpu_count() or 1))
+
+
+def pin_process(pid: int, cpus: Iterable[int]) -> Set[int]:
+    """Restrict every thread of a process to `cpus` and return the process's previous affinity.
+
+    ``sched_setaffinity`` applies to a single thread, so the threads listed in ``/proc/<pid>/task`` are
+    pinned one by one; threads started afterwards inherit the affinity of the thread creating them.
+    """
+    if not is_supported():
+        raise ValueError("CPU pinning is not supported on this platform")
+    cpus = set(cpus)
+    pid = pid or os.getpid()
+    previous = os.sched_getaffinity(pid)
+    try:
+        threads = [int(tid) for tid in os.listdir(f"/proc/{pid}/task")]
+    except OSError:
+        threads = [pid]
+    for tid in threads:
+        try:
+            os.sched_setaffinity(tid, cpus)
+        except ProcessLookupError:
+            continue  # The thread exited
+    return previous
+
+
+def cpu_budget(pid: int = 0, cgroup: Optional[str] = None) -> Dict[str, Any]:
+    """Cores a process can actually use: the smaller of its affinity mask and its cgroup's CPU quota.
+
+    `cgroup` defaults to the cgroup of the process itself.
+    """
+    affinity = get_affinity(pid)
+    if cgroup is None:
+        cgroup = process_cgroup_path(pid or "self")
+    limit = read_cgroup_cpu_limit(cgroup) if cgroup else None
+    cores = min(float(len(affinity)), limit) if limit is not None else float(len(affinity))
+    return {
+        "cores": cores,
+        "host_cpus": os.cpu_count() or 1,
+        "affinity": format_cpu_set(affinity),
+        "affinity_cpus": len(affinity),
+        "cgroup": cgroup,
+        "cgroup_limit_cores": limit,
+    }
@@ -0,0 +1,119 @@
+"""Event loop lag and scheduling delay monitoring for the HTTP benchmark framework."""
+
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+from .histogram import LatencyHistogram
+
+T = TypeVar("T")
+
+# asyncio's debug-mode report of a slow callback: "Executing <Handle ...> took 0.123 seconds"
+SLOW_CALLBACK_MESSAGE = re.compile(r"^Executing (?P<callback>.+) took (?P<duration>[0-9.]+) seconds$")
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Collect the slow-callback warnings asyncio logs in debug mode."""
+
+    def __init__(self, monitor: "EventLoopMonitor"):
+        super().__init__(level=logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord) -> None:
+        match = SLOW_CALLBACK_MESSAGE.match(record.getMessage())
+        if match:
+            self.monitor._record_slow_callback(match.group("callback"), float(match.group("duration")))
+
+
+class EventLoopMonitor:
+    """Measure how responsive the running event loop is during an async run.
+
+    - Loop lag: a probe task sleeps for `probe_interval` over and over; how much later than requested it
+      wakes up is the time the loop spent busy with other callbacks.
+    - Scheduling delay: for every request coroutine passed through ``track()``, the time between creating
+      its task and the coroutine actually starting.
+    - Slow callbacks (``debug=True`` only): asyncio debug mode reports every callback that blocks the loop
+      for longer than `slow_callback_duration`. Debug mode itself slows the loop down noticeably.
+    """
+
+    def __init__(self, probe_interval: float = 0.005, debug: bool = False, slow_callback_duration: float = 0.05, top: int = 10):
+        self.probe_interval = probe_interval
+        self.debug = debug
+        self.slow_callback_duration = slow_callback_duration
+        self.top = top
+        self.lag = LatencyHistogram()
+        self.scheduling_delay = LatencyHistogram()
+        self._slow_callbacks: List[Dict[str, Any]] = []
+        self._slow_callback_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._probe: Optional[asyncio.Task] = None
+        self._handler: Optional[_SlowCallbackHandler] = None
+        self._saved_debug = False
+        self._saved_slow_callback_duration = 0.1
+
+    def start(self) -> None:
+        """Start probing the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self.lag = LatencyHistogram()
+        self.scheduling_delay = LatencyHistogram()
+        self._slow_callbacks = []
+        self._slow_callback_count = 0
+        if self.debug:
+            self._saved_debug = self._loop.get_debug()
+            self._saved_slow_callback_duration = self._loop.slow_callback_duration
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.slow_callback_duration
+            self._handler = _SlowCallbackHandler(self)
+            logging.getLogger("asyncio").addHandler(self._handler)
+        self._probe = self._loop.create_task(self._probe_loop())
+
+    async def _probe_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.probe_interval
+            await asyncio.sleep(self.probe_interval)
+            self.lag.record(max(0.0, loop.time() - expected))
+
+    def track(self, coroutine: Awaitable[T]) -> Awaitable[T]:
+        """Wrap a request coroutine so the delay until it starts running is recorded."""
+        created = self._loop.time() if self._loop else None
+        return self._tracked(coroutine, created)
+
+    async def _tracked(self, coroutine: Awaitable[T], created: Optional[float]) -> T:
+        if created is not None and self._loop is not None:
+            self.scheduling_delay.record(self._loop.time() - created)
+        return await coroutine
+
+    def _record_slow_callback(self, callback: str, duration: float) -> None:
+        self._slow_callback_count += 1
+        self._slow_callbacks.append({"callback": callback, "duration": duration})
+        if len(self._slow_callbacks) > self.top:
+            self._slow_callbacks = sorted(self._slow_callbacks, key=lambda entry: entry["duration"], reverse=True)[: self.top]
+
+    async def stop(self) -> Dict[str, Any]:
+        """Stop probing, restore the loop's debug settings and return the loop statistics."""
+        if self._probe:
+            self._probe.cancel()
+            try:
+                await self._probe
+            except asyncio.CancelledError:
+                pass
+            self._probe = None
+        if self._handler:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            self._handler = None
+            self._loop.set_debug(self._saved_debug)
+            self._loop.slow_callback_duration = self._saved_slow_callback_duration
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "probe_interval": self.probe_interval,
+            "lag": self.lag.summary(),
+            "scheduling_delay": self.scheduling_delay.summary(),
+            "debug": self.debug,
+            "slow_callback_duration": self.slow_callback_duration if self.debug else None,
+            "slow_callbacks": self._slow_callback_count if self.debug else None,
+            "slowest_callbacks": sorted(self._slow_callbacks, key=lambda entry: entry["duration"], reverse=True),
+        }
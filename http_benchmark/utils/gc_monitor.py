@@ -0,0 +1,126 @@
+"""Garbage collector instrumentation for the HTTP benchmark framework."""
+
+import gc
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+GC_MODES = ("default", "freeze", "disable", "tuned")
+
+# Used by the "tuned" mode when no explicit thresholds are given: far fewer young collections
+TUNED_THRESHOLDS = (50_000, 20, 20)
+
+
+class GCMonitor:
+    """Record every garbage collection during a run and apply a GC control mode.
+
+    Modes:
+        default: leave the collector untouched.
+        freeze: collect and ``gc.freeze()`` at the end of warm-up so long-lived objects leave the tracked generations.
+        disable: ``gc.disable()`` for the whole run.
+        tuned: run with custom ``gc.set_threshold()`` values.
+    """
+
+    def __init__(self, mode: str = "default", thresholds: Optional[Sequence[int]] = None, max_events: int = 10_000):
+        if mode not in GC_MODES:
+            raise ValueError(f"Unsupported GC mode: {mode}")
+        self.mode = mode
+        self.thresholds = tuple(thresholds) if thresholds else (TUNED_THRESHOLDS if mode == "tuned" else None)
+        self.max_events = max_events
+        self._events: List[Dict[str, Any]] = []
+        self._collections = [0, 0, 0]
+        self._pauses = [0.0, 0.0, 0.0]
+        self._max_pause = 0.0
+        self._collected = 0
+        self._uncollectable = 0
+        self._collection_start: Optional[float] = None
+        self._timeline_start = time.perf_counter()
+        self._timeline_start_timestamp = time.time()
+        self._saved_enabled = True
+        self._saved_thresholds = gc.get_threshold()
+        self._frozen = False
+
+    def start(self) -> None:
+        """Apply the GC mode and start recording collections."""
+        self._saved_enabled = gc.isenabled()
+        self._saved_thresholds = gc.get_threshold()
+        if self.mode == "disable":
+            gc.disable()
+        elif self.thresholds:
+            gc.set_threshold(*self.thresholds)
+        self._reset()
+        gc.callbacks.append(self._callback)
+
+    def warmup_complete(self) -> None:
+        """Freeze surviving objects if requested and restart the timeline for the measured phase."""
+        if self.mode == "freeze":
+            gc.collect()
+            gc.freeze()
+            self._frozen = True
+        self._reset()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop recording, restore the previous GC settings and return the collection summary."""
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+        if self._frozen:
+            gc.unfreeze()
+            self._frozen = False
+        gc.set_threshold(*self._saved_thresholds)
+        if self._saved_enabled:
+            gc.enable()
+        return self.summary()
+
+    def _reset(self) -> None:
+        self._events = []
+        self._collections = [0, 0, 0]
+        self._pauses = [0.0, 0.0, 0.0]
+        self._max_pause = 0.0
+        self._collected = 0
+        self._uncollectable = 0
+        self._collection_start = None
+        self._timeline_start = time.perf_counter()
+        self._timeline_start_timestamp = time.time()
+
+    def _callback(self, phase: str, info: Dict[str, int]) -> None:
+        """gc.callbacks hook; collections are stop-the-world, so no locking is needed."""
+        now = time.perf_counter()
+        if phase == "start":
+            self._collection_start = now
+            return
+        if self._collection_start is None:
+            return
+
+        generation = info.get("generation", 0)
+        duration = now - self._collection_start
+        self._collection_start = None
+        self._collections[generation] += 1
+        self._pauses[generation] += duration
+        self._max_pause = max(self._max_pause, duration)
+        self._collected += info.get("collected", 0)
+        self._uncollectable += info.get("uncollectable", 0)
+        if len(self._events) < self.max_events:
+            self._events.append(
+                {
+                    "offset": now - duration - self._timeline_start,
+                    "generation": generation,
+                    "duration": duration,
+                    "collected": info.get("collected", 0),
+                }
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate counts and pause times per generation plus the recorded event timeline."""
+        return {
+            "mode": self.mode,
+            "thresholds": list(self.thresholds) if self.thresholds else list(self._saved_thresholds),
+            "collections": sum(self._collections),
+            "collections_by_generation": {str(gen): count for gen, count in enumerate(self._collections)},
+            "pause_by_generation": {str(gen): pause for gen, pause in enumerate(self._pauses)},
+            "total_pause": sum(self._pauses),
+            "max_pause": self._max_pause,
+            "collected": self._collected,
+            "uncollectable": self._uncollectable,
+            "timeline_start": self._timeline_start_timestamp,
+            "events": list(self._events),
+            "events_truncated": sum(self._collections) > len(self._events),
+        }
@@ -0,0 +1,170 @@
+"""Per-process network and socket statistics for the HTTP benchmark framework."""
+
+import os
+import socket
+import struct
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+import psutil
+
+# /proc/net/tcp state code for TIME_WAIT
+TCP_TIME_WAIT = "06"
+
+# Offsets into Linux's struct tcp_info (linux/tcp.h)
+TCP_INFO_TOTAL_RETRANS = 100
+TCP_INFO_BYTES_ACKED = 120
+TCP_INFO_BYTES_RECEIVED = 128
+TCP_INFO_MIN_SIZE = 136
+
+
+def read_tcp_info(fd: int, family: int) -> Optional[Tuple[int, int, int]]:
+    """Return (bytes_acked, bytes_received, total_retrans) of a TCP socket owned by this process.
+
+    Returns None where TCP_INFO is unavailable (non-Linux) or the descriptor is no longer a TCP socket.
+    """
+    if not hasattr(socket, "TCP_INFO"):
+        return None
+    try:
+        sock = socket.socket(family, socket.SOCK_STREAM, fileno=os.dup(fd))
+    except OSError:
+        return None
+    try:
+        info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, 256)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    if len(info) < TCP_INFO_MIN_SIZE:
+        return None
+    (total_retrans,) = struct.unpack_from("I", info, TCP_INFO_TOTAL_RETRANS)
+    bytes_acked, bytes_received = struct.unpack_from("QQ", info, TCP_INFO_BYTES_ACKED)
+    return bytes_acked, bytes_received, total_retrans
+
+
+def read_tcp_retransmits(snmp_path: str = "/proc/net/snmp") -> Optional[int]:
+    """Host-wide count of retransmitted TCP segments, or None where /proc/net/snmp is unavailable."""
+    try:
+        with open(snmp_path) as snmp:
+            tcp_lines = [line.split() for line in snmp if line.startswith("Tcp:")]
+    except OSError:
+        return None
+    if len(tcp_lines) < 2:
+        return None
+    header, values = tcp_lines[0], tcp_lines[1]
+    if "RetransSegs" not in header:
+        return None
+    return int(values[header.index("RetransSegs")])
+
+
+def count_time_wait(remote_port: int, proc_net_dir: str = "/proc/net") -> Optional[int]:
+    """Count TIME_WAIT sockets toward `remote_port`.
+
+    TIME_WAIT sockets no longer belong to any process, so they are matched by the target port instead.
+    """
+    found = False
+    count = 0
+    for table in ("tcp", "tcp6"):
+        try:
+            with open(os.path.join(proc_net_dir, table)) as entries:
+                next(entries, None)  # Header line
+                found = True
+                for entry in entries:
+                    fields = entry.split()
+                    if len(fields) > 3 and fields[3] == TCP_TIME_WAIT and int(fields[2].rsplit(":", 1)[1], 16) == remote_port:
+                        count += 1
+        except OSError:
+            continue
+    return count if found else None
+
+
+class ProcessNetworkMonitor:
+    """Track the TCP sockets of one process between start() and delta().
+
+    Sockets are enumerated periodically by the caller with sample_sockets(). Each sample records the
+    socket count per TCP state and, via TCP_INFO, the bytes and retransmits of every open TCP socket;
+    per-socket figures are kept at their latest value and summed at the end. Sockets opened and closed
+    between two samples are missed, so pooled keep-alive connections are counted exactly and
+    connection-per-request traffic is a lower bound.
+    """
+
+    def __init__(self, process: psutil.Process):
+        self.process = process
+        self.remote_port: Optional[int] = None
+        self._initial_retransmits: Optional[int] = None
+        self._baseline: Dict[Tuple, Tuple[int, int, int]] = {}
+        self._sockets: Dict[Tuple, Tuple[int, int, int]] = {}
+        self._peak_states: Counter = Counter()
+        self._peak_open_sockets = 0
+        self._peak_time_wait: Optional[int] = None
+        self._tcp_info_available = False
+        self._lock = threading.Lock()
+
+    def start(self, remote_port: Optional[int] = None) -> None:
+        """Record starting counters; traffic of sockets that are already open counts from here on."""
+        baseline = self._read_sockets()[1]
+        with self._lock:
+            self.remote_port = remote_port
+            self._initial_retransmits = read_tcp_retransmits()
+            self._baseline = baseline
+            self._sockets = {}
+            self._peak_states = Counter()
+            self._peak_open_sockets = 0
+            self._peak_time_wait = None
+            self._tcp_info_available = False
+
+    def _read_sockets(self) -> Tuple[Dict[str, int], Dict[Tuple, Tuple[int, int, int]]]:
+        """Socket counts by state and TCP_INFO counters keyed by connection."""
+        list_connections = getattr(self.process, "net_connections", None) or self.process.connections
+        try:
+            connections = list_connections(kind="tcp")
+        except psutil.Error:
+            return {}, {}
+        states = Counter(connection.status for connection in connections)
+        counters = {}
+        for connection in connections:
+            if connection.fd < 0 or not connection.raddr:
+                continue
+            info = read_tcp_info(connection.fd, connection.family)
+            if info is not None:
+                counters[(connection.fd, connection.laddr, connection.raddr)] = info
+        return dict(states), counters
+
+    def sample_sockets(self) -> None:
+        """Sample open sockets by state, their TCP counters and TIME_WAIT toward the target.
+
+        Called from the monitoring thread and, at the end of the measured phase, from the runner.
+        """
+        states, counters = self._read_sockets()
+        time_wait = count_time_wait(self.remote_port) if self.remote_port else None
+        with self._lock:
+            for state, count in states.items():
+                self._peak_states[state] = max(self._peak_states[state], count)
+            self._peak_open_sockets = max(self._peak_open_sockets, sum(states.values()))
+            self._sockets.update(counters)
+            self._tcp_info_available = self._tcp_info_available or bool(counters)
+            if time_wait is not None:
+                self._peak_time_wait = max(self._peak_time_wait or 0, time_wait)
+
+    def delta(self) -> Dict[str, Any]:
+        """Per-process network statistics for the run."""
+        if not self._sockets and not self._peak_states:
+            self.sample_sockets()
+        totals = [0, 0, 0]
+        with self._lock:
+            for key, counters in self._sockets.items():
+                baseline = self._baseline.get(key, (0, 0, 0))
+                for index, value in enumerate(counters):
+                    totals[index] += value - baseline[index]
+        host_retransmits = read_tcp_retransmits()
+        return {
+            "bytes_sent": totals[0],
+            "bytes_recv": totals[1],
+            "tcp_retransmits": totals[2] if self._tcp_info_available else None,
+            "tcp_sockets_seen": len(self._sockets),
+            "open_sockets_max": self._peak_open_sockets,
+            "connections_max": dict(self._peak_states),
+            "time_wait_max": self._peak_time_wait,
+            "host_tcp_retransmits": host_retransmits - self._initial_retransmits if host_retransmits is not None and self._initial_retransmits is not None else None,
+        }
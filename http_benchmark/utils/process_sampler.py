@@ -0,0 +1,200 @@
+"""Out-of-process resource sampler for the HTTP benchmark framework.
+
+The sampler runs as ``python -m http_benchmark.utils.process_sampler <pid> <interval> [target-spec]`` and
+reads ``/proc/<pid>/stat``, ``status`` and ``io`` directly, so the measured process spends no CPU time and
+no GIL time on sampling. Samples are kept in the sampler's own buffer until the parent closes the
+sampler's stdin; they are then streamed back over stdout: one JSON header line followed by the samples
+as native doubles in ``SAMPLE_FIELDS`` order.
+"""
+
+import json
+import os
+import select
+import subprocess
+import sys
+import time
+from array import array
+from typing import Any, Dict, Optional
+
+from .sample_buffer import SampleBuffer
+
+# Fields of every resource sample, in order; shared with the in-process monitor thread
+SAMPLE_FIELDS = ("timestamp", "cpu_percent", "memory_percent", "memory_rss_mb")
+
+PROC_IO_FIELDS = ("rchar", "wchar", "read_bytes", "write_bytes")
+
+
+def read_proc_cpu_seconds(pid: int) -> float:
+    """User plus system CPU time of a process from /proc/<pid>/stat."""
+    with open(f"/proc/{pid}/stat") as stat:
+        # The command name may contain spaces and parentheses, so split after its closing parenthesis
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def read_proc_rss(pid: int) -> int:
+    """Resident set size of a process in bytes from /proc/<pid>/status."""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def read_proc_io(pid: int) -> Dict[str, int]:
+    """I/O counters of a process from /proc/<pid>/io (empty if not readable)."""
+    try:
+        with open(f"/proc/{pid}/io") as io:
+            counters = dict(line.split(":", 1) for line in io if ":" in line)
+    except OSError:
+        return {}
+    return {field: int(counters[field]) for field in PROC_IO_FIELDS if field in counters}
+
+
+def read_mem_total() -> int:
+    """Total system memory in bytes from /proc/meminfo."""
+    with open("/proc/meminfo") as meminfo:
+        for line in meminfo:
+            if line.startswith("MemTotal:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def is_supported() -> bool:
+    """Whether this platform exposes the /proc files the sampler reads."""
+    return os.path.exists(f"/proc/{os.getpid()}/stat")
+
+
+class ProcessSampler:
+    """Parent-side handle of a sampler process watching `pid`.
+
+    `target_spec` (``TargetMonitor.spec()``) makes the sampler monitor the target server as well.
+    """
+
+    def __init__(self, pid: int, interval: float, target_spec: Optional[Dict[str, Any]] = None, buffer_capacity: int = 4096, spill_dir: Optional[str] = None):
+        self.pid = pid
+        self.interval = interval
+        self.target_spec = target_spec
+        self.buffer_capacity = buffer_capacity
+        self.spill_dir = spill_dir
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        """Launch the sampler and wait until it has taken its first sample."""
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+        command = [sys.executable, "-m", "http_benchmark.utils.process_sampler", str(self.pid), str(self.interval)]
+        if self.target_spec:
+            command.append(json.dumps(self.target_spec))
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+        if self._process.stdout.readline().strip() != b"ready":
+            self._process.wait()
+            raise RuntimeError("Resource sampler process failed to start")
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop the sampler and collect its samples, target samples and summary."""
+        if self._process is None:
+            raise RuntimeError("Resource sampler process is not running")
+        process, self._process = self._process, None
+        process.stdin.close()
+        header = json.loads(process.stdout.readline())
+        samples = self._read_samples(process.stdout, header["sample_count"])
+        target_samples = self._read_samples(process.stdout, header["target_sample_count"])
+        process.wait()
+        header["samples"] = samples
+        header["target_samples"] = target_samples
+        return header
+
+    def _read_samples(self, stream, count: int) -> SampleBuffer:
+        buffer = SampleBuffer(SAMPLE_FIELDS, capacity=self.buffer_capacity, spill_dir=self.spill_dir)
+        row = array("d")
+        for _ in range(count):
+            del row[:]
+            row.fromfile(stream, len(SAMPLE_FIELDS))
+            buffer.append(row)
+        return buffer
+
+
+def _write_samples(stream, samples: SampleBuffer) -> None:
+    for sample in samples:
+        array("d", (sample[field] for field in SAMPLE_FIELDS)).tofile(stream)
+
+
+def main(argv) -> int:
+    """Sampler process entry point."""
+    pid, interval = int(argv[0]), float(argv[1])
+    target_spec = json.loads(argv[2]) if len(argv) > 2 else None
+
+    startup_cpu = time.process_time()
+    samples = SampleBuffer(SAMPLE_FIELDS)
+    target_samples = SampleBuffer(SAMPLE_FIELDS)
+    target = None
+    if target_spec:
+        from .target_monitor import TargetMonitor
+
+        target = TargetMonitor(**target_spec)
+        target.exclude_pids.add(pid)
+        target.start()
+    total_memory = read_mem_total() or 1
+    initial_io = read_proc_io(pid)
+    last_cpu = read_proc_cpu_seconds(pid)
+    last_wall = time.perf_counter()
+    loop_start_wall = last_wall
+    loop_start_cpu = time.process_time()
+    sample_time = 0.0
+    stdout = sys.stdout.buffer
+    stdout.write(b"ready\n")
+    stdout.flush()
+
+    next_sample = last_wall
+    while True:
+        sample_start = time.perf_counter()
+        try:
+            cpu = read_proc_cpu_seconds(pid)
+            rss = read_proc_rss(pid)
+        except OSError:
+            break  # The measured process exited
+        now = time.perf_counter()
+        cpu_percent = (cpu - last_cpu) / (now - last_wall) * 100 if samples and now > last_wall else 0.0
+        last_cpu, last_wall = cpu, now
+        samples.append((time.time(), cpu_percent, rss / total_memory * 100, rss / 1024 / 1024))
+        if target:
+            target_samples.append(target.sample())
+        sample_time += time.perf_counter() - sample_start
+
+        next_sample += interval
+        if next_sample < time.perf_counter():
+            next_sample = time.perf_counter()
+        # The parent closes stdin to stop sampling
+        readable, _, _ = select.select([sys.stdin], [], [], max(0.0, next_sample - time.perf_counter()))
+        if readable and not sys.stdin.buffer.read1(1):
+            break
+
+    wall = time.perf_counter() - loop_start_wall
+    loop_cpu = time.process_time() - loop_start_cpu
+    final_io = read_proc_io(pid)
+    header = {
+        "sample_count": len(samples),
+        "target_sample_count": len(target_samples),
+        "overhead": {
+            "sampler_pid": os.getpid(),
+            "sampler_cpu_seconds": loop_cpu,
+            "sampler_cpu_percent": loop_cpu / wall * 100 if wall > 0 else 0.0,
+            "sampler_startup_cpu_seconds": startup_cpu,
+            "sample_duration_avg_us": sample_time / len(samples) * 1_000_000 if samples else 0.0,
+        },
+        "io": {field: final_io[field] - initial_io[field] for field in final_io if field in initial_io},
+        "target_summary": target.summary() if target else {},
+    }
+    stdout.write(json.dumps(header).encode() + b"\n")
+    _write_samples(stdout, samples)
+    _write_samples(stdout, target_samples)
+    stdout.flush()
+    samples.close()
+    target_samples.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+"""Sampling profiler for the HTTP benchmark framework."""
+
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+# Leaf frames of threads that are parked waiting for work rather than executing client code
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("selectors.py", "select"),
+}
+
+
+class SamplingProfiler:
+    """Periodically sample the Python stacks of all threads and aggregate them as collapsed stacks.
+
+    Sampling runs in a background thread that reads ``sys._current_frames()``, so it sees worker threads
+    of sync runs as well as the coroutine currently executing on the event loop thread of async runs.
+    The output uses the folded format understood by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self._stacks: Counter = Counter()
+        self._sample_count = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_names: Dict[int, str] = {}
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._stacks = Counter()
+        self._sample_count = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="benchmark-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _sample_loop(self) -> None:
+        """Take a stack sample of every other thread each interval."""
+        own_ident = threading.get_ident()
+        while not self._stop_event.is_set():
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_ident:
+                    continue
+                stack = self._collapse(thread_id, frame)
+                if stack is not None:
+                    self._stacks[stack] += 1
+            self._sample_count += 1
+            self._stop_event.wait(timeout=self.interval)
+
+    def _collapse(self, thread_id: int, frame) -> Optional[Tuple[str, ...]]:
+        """Turn a frame chain into a root-first tuple of frame labels, or None for idle threads."""
+        code = frame.f_code
+        if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            return None
+
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            labels.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        labels.append(self._thread_names.get(thread_id, f"thread-{thread_id}"))
+        labels.reverse()
+        return tuple(labels)
+
+    @property
+    def sample_count(self) -> int:
+        """Number of sampling rounds taken."""
+        return self._sample_count
+
+    def get_collapsed_stacks(self) -> Dict[str, int]:
+        """Return the aggregated stacks as ``frame;frame;frame`` strings mapped to sample counts."""
+        # Semicolons separate frames in the folded format, so they must not appear inside a label
+        return {";".join(label.replace(";", ":") for label in stack): count for stack, count in self._stacks.items()}
+
+    def write_collapsed(self, path: str) -> str:
+        """Write the aggregated stacks in folded format and return the path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as output:
+            for stack, count in sorted(self.get_collapsed_stacks().items(), key=lambda item: item[1], reverse=True):
+                output.write(f"{stack} {count}\n")
+        return path
@@ -3,46 +3,143 @@
 import psutil
 import time
 import threading
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
+from .cgroup import read_cgroup_cpu_throttling
+from .cpu_affinity import cpu_budget
+from .network_stats import ProcessNetworkMonitor
+from .process_sampler import SAMPLE_FIELDS, ProcessSampler, is_supported as process_sampler_supported
+from .sample_buffer import SampleBuffer
+from .target_monitor import TargetMonitor
+
+
+# "thread" samples from a thread inside this process; "process" from a separate sampler process
+MONITOR_MODES = ("thread", "process")
+
+# Sampling faster than this mostly measures the sampler itself
+MIN_INTERVAL = 0.01
+
+# Listing sockets walks the process's file descriptors and the host TCP table, so it runs at a slower cadence
+SOCKET_SAMPLE_INTERVAL = 0.5
 
 
 class ResourceMonitor:
-    """Monitor system resources during benchmark execution."""
+    """Monitor system resources during benchmark execution.
+
+    In "process" mode the sampler runs out of process and the socket statistics are only sampled at the
+    start and end of the measured phase, since reading TCP_INFO needs this process's descriptors.
+    """
 
-    def __init__(self):
+    def __init__(self, interval: float = 0.2, buffer_capacity: int = 4096, spill_dir: Optional[str] = None):
         self.process = psutil.Process()
+        self.interval = interval
+        self.buffer_capacity = buffer_capacity
+        self.spill_dir = spill_dir
         self._lock = threading.Lock()
         self._stop_event = threading.Event()
-        self._samples: List[Dict[str, Any]] = []
+        self._samples = SampleBuffer(SAMPLE_FIELDS, capacity=buffer_capacity, spill_dir=spill_dir)
+        self._target: Optional[TargetMonitor] = None
+        self._target_samples = SampleBuffer(SAMPLE_FIELDS, capacity=buffer_capacity, spill_dir=spill_dir)
+        self._totals: Dict[str, float] = {}
+        self._maxima: Dict[str, float] = {}
+        self._sample_count = 0
         self._monitor_thread: Optional[threading.Thread] = None
+        self._sampler: Optional[ProcessSampler] = None
+        self._mode = "thread"
+        self._interval = interval
+        self._overhead: Dict[str, Any] = {}
+        self._target_summary: Dict[str, Any] = {}
+        self._io: Dict[str, int] = {}
+        self._cpu_budget: Dict[str, Any] = {}
+        self._throttling_start: Dict[str, float] = {}
+        self._throttling_end: Dict[str, float] = {}
         self._initial_net_io: Optional[Any] = None
+        self._network = ProcessNetworkMonitor(self.process)
+        self._total_memory = psutil.virtual_memory().total
         # Prime CPU percent (first call returns 0)
         self.process.cpu_percent()
 
-    def start_monitoring(self) -> None:
-        """Start background monitoring thread."""
+    def start_monitoring(self, interval: Optional[float] = None, remote_port: Optional[int] = None, target: Optional[TargetMonitor] = None, mode: str = "thread") -> None:
+        """Start background monitoring, sampling every `interval` seconds (default: the monitor's interval).
+
+        `remote_port` is the port of the benchmark target; TIME_WAIT sockets toward it are counted.
+        `target` is sampled on the same timeline as this process.
+        """
+        interval = self.interval if interval is None else interval
+        if interval < MIN_INTERVAL:
+            raise ValueError(f"Monitoring interval must be at least {MIN_INTERVAL}s")
+        if mode not in MONITOR_MODES:
+            raise ValueError(f"Unsupported monitor mode: {mode}")
+        if mode == "process" and not process_sampler_supported():
+            raise ValueError("Process monitor mode needs /proc (Linux)")
+        self._mode = mode
+        self._interval = interval
+        self._overhead = {}
+        self._target_summary = {}
+        self._io = {}
+        self._cpu_budget = cpu_budget()
+        self.reset_cpu_baseline()
         self._initial_net_io = psutil.net_io_counters()
+        self._network.start(remote_port)
+        self._target = target
+        if mode == "process":
+            with self._lock:
+                self._sample_count = 0
+            self._sampler = ProcessSampler(self.process.pid, interval, target.spec() if target else None, self.buffer_capacity, self.spill_dir)
+            self._sampler.start()
+            return
+        if target:
+            target.start()
         with self._lock:
-            self._samples = []
+            self._samples = SampleBuffer(SAMPLE_FIELDS, capacity=self.buffer_capacity, spill_dir=self.spill_dir)
+            self._target_samples = SampleBuffer(SAMPLE_FIELDS, capacity=self.buffer_capacity, spill_dir=self.spill_dir)
+            self._totals = {field: 0.0 for field in SAMPLE_FIELDS[1:]}
+            self._maxima = {field: 0.0 for field in SAMPLE_FIELDS[1:]}
+            self._sample_count = 0
         self._stop_event.clear()
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, args=(interval,), daemon=True)
         self._monitor_thread.start()
 
-    def _monitor_loop(self) -> None:
-        """Sample metrics every 200ms."""
+    def _monitor_loop(self, interval: float) -> None:
+        """Sample metrics every `interval` seconds on a fixed schedule."""
+        next_sample = time.perf_counter()
+        next_socket_sample = next_sample
+        loop_start = next_sample
+        loop_start_cpu = time.thread_time()
+        sample_time = 0.0
         while not self._stop_event.is_set():
-            memory_info = self.process.memory_info()
-            sample = {
-                "cpu_percent": self.process.cpu_percent(),
-                "memory_percent": self.process.memory_percent(),
-                "memory_rss_mb": memory_info.rss / 1024 / 1024,
-                "timestamp": time.time()
-            }
+            sample_start = time.perf_counter()
+            with self.process.oneshot():
+                cpu_percent = self.process.cpu_percent()
+                rss = self.process.memory_info().rss
+            sample = (time.time(), cpu_percent, rss / self._total_memory * 100, rss / 1024 / 1024)
+            target_sample = self._target.sample() if self._target else None
+            if time.perf_counter() >= next_socket_sample:
+                self._network.sample_sockets()
+                next_socket_sample = time.perf_counter() + SOCKET_SAMPLE_INTERVAL
             with self._lock:
                 self._samples.append(sample)
+                if target_sample:
+                    self._target_samples.append(target_sample)
+                for field, value in zip(SAMPLE_FIELDS[1:], sample[1:]):
+                    self._totals[field] += value
+                    self._maxima[field] = max(self._maxima[field], value)
+                self._sample_count += 1
+            sample_time += time.perf_counter() - sample_start
+            # Schedule against the start time so sampling cost does not stretch the interval
+            next_sample += interval
+            if next_sample < time.perf_counter():
+                next_sample = time.perf_counter()  # Fell behind; skip the missed ticks
             # Use wait with timeout instead of sleep for faster shutdown
-            self._stop_event.wait(timeout=0.2)
+            self._stop_event.wait(timeout=max(0.0, next_sample - time.perf_counter()))
+
+        wall = time.perf_counter() - loop_start
+        loop_cpu = time.thread_time() - loop_start_cpu
+        self._overhead = {
+            "sampler_cpu_seconds": loop_cpu,
+            "sampler_cpu_percent": loop_cpu / wall * 100 if wall > 0 else 0.0,
+            "sample_duration_avg_us": sample_time / self._sample_count * 1_000_000 if self._sample_count else 0.0,
+        }
 
     def stop_monitoring(self) -> Dict[str, Any]:
         """Stop monitoring and return aggregated metrics."""
@@ -50,47 +147,148 @@ class ResourceMonitor:
         if self._monitor_thread:
             self._monitor_thread.join(timeout=1.0)
             self._monitor_thread = None
+        self._throttling_end = self._read_throttling()
+        if self._sampler:
+            self._collect_sampler_output(self._sampler.stop())
+            self._sampler = None
+        elif self._target:
+            self._target_summary = self._target.summary()
         return self._aggregate_metrics()
 
+    def _collect_sampler_output(self, output: Dict[str, Any]) -> None:
+        """Take over the series, running totals and summaries produced by the sampler process."""
+        totals = {field: 0.0 for field in SAMPLE_FIELDS[1:]}
+        maxima = {field: 0.0 for field in SAMPLE_FIELDS[1:]}
+        for sample in output["samples"]:
+            for field in SAMPLE_FIELDS[1:]:
+                totals[field] += sample[field]
+                maxima[field] = max(maxima[field], sample[field])
+        with self._lock:
+            self._samples = output["samples"]
+            self._target_samples = output["target_samples"]
+            self._totals = totals
+            self._maxima = maxima
+            self._sample_count = len(output["samples"])
+        self._overhead = output["overhead"]
+        self._target_summary = output["target_summary"]
+        self._io = output["io"]
+
+    def get_monitor_stats(self) -> Dict[str, Any]:
+        """Describe how the last run was sampled and what the sampling itself cost."""
+        with self._lock:
+            sample_count = self._sample_count
+        stats = {"mode": self._mode, "interval": self._interval, "sample_count": sample_count}
+        stats.update(self._overhead)
+        if self._io:
+            stats["process_io"] = self._io
+        return stats
+
+    def get_target_summary(self) -> Dict[str, Any]:
+        """Summary of the monitored target of the last run, if any."""
+        return self._target_summary
+
+    def _read_throttling(self) -> Dict[str, float]:
+        cgroup = self._cpu_budget.get("cgroup")
+        return read_cgroup_cpu_throttling(cgroup) if cgroup else {}
+
+    def reset_cpu_baseline(self) -> None:
+        """Restart cgroup throttling accounting, e.g. at the end of warm-up."""
+        self._throttling_start = self._read_throttling()
+        self._throttling_end = {}
+
+    def get_cpu_budget(self) -> Dict[str, Any]:
+        """Cores this process could use during the last run and how long its cgroup was throttled."""
+        budget = dict(self._cpu_budget)
+        if self._throttling_start and self._throttling_end:
+            budget["throttling"] = {key: self._throttling_end[key] - self._throttling_start[key] for key in self._throttling_start}
+        else:
+            budget["throttling"] = {}
+        return budget
+
+    def reset_network_baseline(self) -> None:
+        """Restart per-process network accounting, e.g. at the end of warm-up."""
+        self._network.start(self._network.remote_port)
+
+    def sample_sockets(self) -> None:
+        """Take an extra socket sample, e.g. right before the client closes its connections."""
+        self._network.sample_sockets()
+
+    def take_samples(self) -> SampleBuffer:
+        """Hand over the full sample series of the last run; the next run starts a new buffer."""
+        with self._lock:
+            samples = self._samples
+            self._samples = SampleBuffer(SAMPLE_FIELDS, capacity=self.buffer_capacity, spill_dir=self.spill_dir)
+        return samples
+
+    def take_target_samples(self) -> SampleBuffer:
+        """Hand over the target's sample series of the last run, aligned with take_samples()."""
+        with self._lock:
+            samples = self._target_samples
+            self._target_samples = SampleBuffer(SAMPLE_FIELDS, capacity=self.buffer_capacity, spill_dir=self.spill_dir)
+        return samples
+
     def _aggregate_metrics(self) -> Dict[str, Any]:
-        """Calculate averages from collected samples."""
+        """Calculate averages from the running totals of all samples."""
         with self._lock:
-            if not self._samples:
-                return {"cpu_avg": 0.0, "memory_avg": 0.0, "memory_percent_avg": 0.0, "memory_mb_avg": 0.0, "cpu_max": 0.0, "memory_max": 0.0, "memory_mb_max": 0.0, "sample_count": 0}
-            cpu_values = [s["cpu_percent"] for s in self._samples]
-            mem_percent_values = [s["memory_percent"] for s in self._samples]
-            mem_mb_values = [s["memory_rss_mb"] for s in self._samples]
+            if not self._sample_count:
+                return {
+                    "cpu_avg": 0.0,
+                    "memory_avg": 0.0,
+                    "memory_percent_avg": 0.0,
+                    "memory_mb_avg": 0.0,
+                    "cpu_max": 0.0,
+                    "memory_max": 0.0,
+                    "memory_mb_max": 0.0,
+                    "cpu_normalized_avg": 0.0,
+                    "cpu_normalized_max": 0.0,
+                    "sample_count": 0,
+                }
+            count = self._sample_count
+            # cpu_percent is in percent of one core; normalized values are in percent of the cores actually available
+            budget_percent = self._cpu_budget.get("cores", 1.0) * 100
             return {
-                "cpu_avg": sum(cpu_values) / len(cpu_values),
-                "memory_avg": sum(mem_percent_values) / len(mem_percent_values),  # Kept for backward compatibility
-                "memory_percent_avg": sum(mem_percent_values) / len(mem_percent_values),  # Explicit name
-                "memory_mb_avg": sum(mem_mb_values) / len(mem_mb_values),  # New MB value
-                "cpu_max": max(cpu_values),
-                "memory_max": max(mem_percent_values),  # Kept for backward compatibility
-                "memory_percent_max": max(mem_percent_values),  # Explicit name
-                "memory_mb_max": max(mem_mb_values),  # New MB value
-                "sample_count": len(self._samples)
+                "cpu_avg": self._totals["cpu_percent"] / count,
+                "memory_avg": self._totals["memory_percent"] / count,  # Kept for backward compatibility
+                "memory_percent_avg": self._totals["memory_percent"] / count,  # Explicit name
+                "memory_mb_avg": self._totals["memory_rss_mb"] / count,  # New MB value
+                "cpu_max": self._maxima["cpu_percent"],
+                "memory_max": self._maxima["memory_percent"],  # Kept for backward compatibility
+                "memory_percent_max": self._maxima["memory_percent"],  # Explicit name
+                "memory_mb_max": self._maxima["memory_rss_mb"],  # New MB value
+                "cpu_normalized_avg": self._totals["cpu_percent"] / count / budget_percent * 100,
+                "cpu_normalized_max": self._maxima["cpu_percent"] / budget_percent * 100,
+                "sample_count": count,
             }
 
-    def get_network_io_delta(self) -> Dict[str, int]:
-        """Get network I/O delta since monitoring started."""
+    def get_network_io_delta(self) -> Dict[str, Any]:
+        """Get network I/O of this process since monitoring started.
+
+        Bytes, retransmits and socket counts are per process; packet counts are only available host-wide.
+        """
+        try:
+            network_io = self._network.delta()
+        except Exception:
+            network_io = {"bytes_sent": 0, "bytes_recv": 0}
         try:
             current = psutil.net_io_counters()
             if self._initial_net_io:
-                return {
-                    "bytes_sent": current.bytes_sent - self._initial_net_io.bytes_sent,
-                    "bytes_recv": current.bytes_recv - self._initial_net_io.bytes_recv,
-                    "packets_sent": current.packets_sent - self._initial_net_io.packets_sent,
-                    "packets_recv": current.packets_recv - self._initial_net_io.packets_recv,
-                }
-            return {"bytes_sent": 0, "bytes_recv": 0, "packets_sent": 0, "packets_recv": 0}
+                network_io["packets_sent"] = current.packets_sent - self._initial_net_io.packets_sent
+                network_io["packets_recv"] = current.packets_recv - self._initial_net_io.packets_recv
+                return network_io
         except Exception:
-            return {"bytes_sent": 0, "bytes_recv": 0, "packets_sent": 0, "packets_recv": 0}
+            pass
+        network_io.update({"packets_sent": 0, "packets_recv": 0})
+        return network_io
 
     def get_cpu_percent(self) -> float:
         """Get current CPU usage percentage."""
         return self.process.cpu_percent()
 
+    def get_cpu_times(self) -> Dict[str, float]:
+        """Get cumulative user and system CPU time of this process in seconds."""
+        cpu_times = self.process.cpu_times()
+        return {"user": cpu_times.user, "system": cpu_times.system}
+
     def get_memory_info(self) -> Dict[str, float]:
         """Get current memory usage information."""
         memory_info = self.process.memory_info()
@@ -102,6 +300,19 @@ class ResourceMonitor:
             "percent": memory_percent,
         }
 
+    def get_process_snapshot(self) -> Dict[str, float]:
+        """Get the resources this process holds right now: RSS, open file descriptors, TCP connections and threads."""
+        with self.process.oneshot():
+            rss = self.process.memory_info().rss
+            threads = self.process.num_threads()
+            open_fds = self.process.num_fds() if hasattr(self.process, "num_fds") else self.process.num_handles()
+        list_connections = getattr(self.process, "net_connections", None) or self.process.connections
+        try:
+            connections = len(list_connections(kind="tcp"))
+        except psutil.Error:
+            connections = 0
+        return {"memory_rss_mb": rss / 1024 / 1024, "open_fds": open_fds, "connections": connections, "threads": threads}
+
     def get_network_io(self) -> Dict[str, int]:
         """Get network I/O statistics."""
         try:
@@ -0,0 +1,73 @@
+"""Interpreter runtime information for the HTTP benchmark framework."""
+
+import hashlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import sysconfig
+from typing import Any, Dict, Optional
+
+
+def is_free_threaded_build() -> bool:
+    """Return True when the interpreter was built with the GIL disabled (e.g. CPython 3.13t)."""
+    return bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
+
+def is_gil_enabled() -> bool:
+    """Return True when the GIL is active; free-threaded builds can still re-enable it at runtime."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return check() if check else True
+
+
+def get_git_sha(path: Optional[str] = None) -> Optional[str]:
+    """Commit checked out in `path` (default: the working directory), or None outside a git checkout."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    sha = completed.stdout.strip()
+    return sha if completed.returncode == 0 and sha else None
+
+
+def get_cpu_model() -> str:
+    """CPU model name from /proc/cpuinfo, falling back to platform.processor()."""
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def environment_fingerprint(runtime_info: Dict[str, Any]) -> str:
+    """Short hash of what makes results comparable across runs: interpreter, OS, architecture and CPU."""
+    facts = {
+        "python_version": runtime_info["python_version"],
+        "implementation": runtime_info["implementation"],
+        "free_threaded_build": runtime_info["free_threaded_build"],
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "cpu_model": get_cpu_model(),
+        "cpu_count": os.cpu_count(),
+    }
+    return hashlib.sha256(json.dumps(facts, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def get_runtime_info() -> Dict[str, Any]:
+    """Describe the interpreter and host a benchmark ran on."""
+    info = {
+        "python_version": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "free_threaded_build": is_free_threaded_build(),
+        "gil_enabled": is_gil_enabled(),
+        "host": socket.gethostname(),
+        "git_sha": get_git_sha(),
+    }
+    info["environment_fingerprint"] = environment_fingerprint(info)
+    return info
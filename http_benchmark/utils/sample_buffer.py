@@ -0,0 +1,97 @@
+"""Fixed-size sample buffer for the HTTP benchmark framework."""
+
+import os
+import tempfile
+import weakref
+from array import array
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+
+class SampleBuffer:
+    """Array-backed buffer of fixed-width numeric samples with a bounded memory footprint.
+
+    Samples are stored interleaved in a preallocated ``array('d')``. When the buffer is full it either
+    spills its contents to a temporary file and starts over (``spill=True``), so no sample is lost, or
+    behaves as a ring buffer and overwrites the oldest samples. Iterating yields every retained sample
+    as a dict in insertion order, reading spilled samples back from disk.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int = 4096, spill: bool = True, spill_dir: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("Sample buffer capacity must be at least 1")
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.spill = spill
+        self.spill_dir = spill_dir
+        self._width = len(self.fields)
+        self._data = array("d", bytes(8 * capacity * self._width))
+        self._next = 0
+        self._filled = 0
+        self._spilled = 0
+        self._dropped = 0
+        self._spill_path: Optional[str] = None
+        self._finalizer = None
+
+    def append(self, values: Sequence[float]) -> None:
+        """Add one sample; values are given in field order."""
+        if self._filled == self.capacity:
+            if self.spill:
+                self._spill_to_disk()
+            else:
+                self._dropped += 1
+        start = self._next * self._width
+        end = start + self._width
+        self._data[start:end] = array("d", values)
+        self._next = (self._next + 1) % self.capacity
+        self._filled = min(self._filled + 1, self.capacity)
+
+    def _spill_to_disk(self) -> None:
+        """Append the full in-memory buffer to the spill file and empty it."""
+        if self._spill_path is None:
+            fd, self._spill_path = tempfile.mkstemp(prefix="benchmark-samples-", suffix=".bin", dir=self.spill_dir)
+            os.close(fd)
+            self._finalizer = weakref.finalize(self, _remove_file, self._spill_path)
+        with open(self._spill_path, "ab") as spill_file:
+            self._data.tofile(spill_file)
+        self._spilled += self.capacity
+        self._next = 0
+        self._filled = 0
+
+    def __len__(self) -> int:
+        return self._spilled + self._filled
+
+    @property
+    def dropped(self) -> int:
+        """Number of samples overwritten because spilling is disabled."""
+        return self._dropped
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        if self._spill_path and self._spilled:
+            chunk = array("d")
+            with open(self._spill_path, "rb") as spill_file:
+                for _ in range(self._spilled // self.capacity):
+                    del chunk[:]
+                    chunk.fromfile(spill_file, self.capacity * self._width)
+                    yield from self._rows(chunk, range(self.capacity))
+        # Oldest in-memory sample sits at _next once the ring has wrapped
+        first = self._next if self._filled == self.capacity else 0
+        positions = ((first + index) % self.capacity for index in range(self._filled))
+        yield from self._rows(self._data, positions)
+
+    def _rows(self, data: array, positions: Iterable[int]) -> Iterator[Dict[str, float]]:
+        for position in positions:
+            start = position * self._width
+            end = start + self._width
+            yield dict(zip(self.fields, data[start:end]))
+
+    def close(self) -> None:
+        """Delete the spill file, if any."""
+        if self._finalizer:
+            self._finalizer()
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,163 @@
+"""Significance tests for comparing benchmark runs."""
+
+import math
+import random
+from statistics import mean, variance
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+from .histogram import LatencyHistogram
+
+
+def _normal_sf(z: float) -> float:
+    """Upper tail probability of the standard normal distribution."""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction of the incomplete beta function (modified Lentz's method)."""
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)), -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return result
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1 - x) / b
+
+
+def t_sf(t: float, df: float) -> float:
+    """Upper tail probability of Student's t distribution with `df` degrees of freedom."""
+    tail = 0.5 * _betainc(df / 2, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1.0 - tail
+
+
+def t_isf(tail: float, df: float) -> float:
+    """Value of Student's t distribution with `df` degrees of freedom whose upper tail probability is `tail`."""
+    if not 0 < tail < 1:
+        raise ValueError("Tail probability must be between 0 and 1")
+    if tail > 0.5:
+        return -t_isf(1 - tail, df)
+    low, high = 0.0, 1.0
+    while t_sf(high, df) > tail:
+        low, high = high, high * 2
+    for _ in range(100):
+        middle = (low + high) / 2
+        if t_sf(middle, df) > tail:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def _p_value(upper_tail: Callable[[float], float], statistic: float, alternative: str) -> float:
+    """p-value of `statistic` from its upper tail function; "greater" tests the upper tail only."""
+    if alternative == "two-sided":
+        return min(1.0, 2 * upper_tail(abs(statistic)))
+    if alternative == "greater":
+        return upper_tail(statistic)
+    raise ValueError(f"Unknown alternative: {alternative}")
+
+
+def welch_t_test(baseline: Sequence[float], candidate: Sequence[float], alternative: str = "greater") -> Dict[str, Any]:
+    """Welch's t-test of the baseline's mean minus the candidate's; by default one-sided, that the candidate's mean is lower.
+
+    Suited to per-run throughput, where each run's RPS is already an average over many requests. Needs
+    at least two values on each side; the p-value is None otherwise. `alternative` is "greater" or "two-sided".
+    """
+    if len(baseline) < 2 or len(candidate) < 2:
+        return {"t": None, "df": None, "p_value": None}
+    baseline_error = variance(baseline) / len(baseline)
+    candidate_error = variance(candidate) / len(candidate)
+    difference = mean(baseline) - mean(candidate)
+    if baseline_error + candidate_error == 0:
+        significant = difference > 0 or (difference != 0 and alternative == "two-sided")
+        return {"t": math.copysign(math.inf, difference) if difference else 0.0, "df": None, "p_value": 0.0 if significant else 1.0}
+    t = difference / math.sqrt(baseline_error + candidate_error)
+    df = (baseline_error + candidate_error) ** 2 / (baseline_error**2 / (len(baseline) - 1) + candidate_error**2 / (len(candidate) - 1))
+    return {"t": t, "df": df, "p_value": _p_value(lambda value: t_sf(value, df), t, alternative)}
+
+
+def mann_whitney_histograms(baseline: LatencyHistogram, candidate: LatencyHistogram, alternative: str = "greater") -> Dict[str, Any]:
+    """Mann-Whitney U test that candidate latencies are stochastically larger (or, "two-sided", different), computed from bucket counts.
+
+    Values in the same bucket count as ties, so the test runs in time proportional to the number of buckets
+    rather than requests. `effect` is U / (n1 * n2), the probability that a random candidate request is
+    slower than a random baseline request: 0.5 means no shift.
+    """
+    n1, n2 = baseline.count, candidate.count
+    if not n1 or not n2:
+        return {"u": None, "z": None, "p_value": None, "effect": None}
+    baseline_counts = baseline.bucket_counts()
+    candidate_counts = candidate.bucket_counts()
+    u = 0.0
+    baseline_below = 0
+    tie_term = 0
+    for index in sorted(set(baseline_counts) | set(candidate_counts)):
+        in_baseline = baseline_counts.get(index, 0)
+        in_candidate = candidate_counts.get(index, 0)
+        u += in_candidate * (baseline_below + 0.5 * in_baseline)
+        baseline_below += in_baseline
+        tied = in_baseline + in_candidate
+        tie_term += tied**3 - tied
+    total = n1 + n2
+    variance_u = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    z = (u - n1 * n2 / 2) / math.sqrt(variance_u) if variance_u > 0 else 0.0
+    return {"u": u, "z": z, "p_value": _p_value(_normal_sf, z, alternative) if variance_u > 0 else 1.0, "effect": u / (n1 * n2)}
+
+
+def tail_exceedance_test(baseline: LatencyHistogram, candidate: LatencyHistogram, percentile: float = 0.99) -> Dict[str, Any]:
+    """One-sided two-proportion z-test on the share of requests slower than the baseline's `percentile`.
+
+    If the tail has not moved, about ``1 - percentile`` of the candidate's requests land above the baseline's
+    percentile, as they do for the baseline; a significantly larger share means the tail got slower.
+    """
+    if not baseline.count or not candidate.count:
+        return {"threshold": None, "baseline_share": None, "candidate_share": None, "z": None, "p_value": None}
+    threshold = baseline.percentile(percentile)
+    baseline_share = baseline.count_above(threshold) / baseline.count
+    candidate_share = candidate.count_above(threshold) / candidate.count
+    pooled = (baseline_share * baseline.count + candidate_share * candidate.count) / (baseline.count + candidate.count)
+    error = math.sqrt(pooled * (1 - pooled) * (1 / baseline.count + 1 / candidate.count))
+    z = (candidate_share - baseline_share) / error if error > 0 else 0.0
+    return {
+        "threshold": threshold,
+        "baseline_share": baseline_share,
+        "candidate_share": candidate_share,
+        "z": z,
+        "p_value": _normal_sf(z) if error > 0 else 1.0,
+    }
+
+
+def bootstrap_ci(values: Sequence[float], statistic: Callable[[Sequence[float]], float] = mean, confidence: float = 0.95, resamples: int = 2000, seed: int = 0) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of `statistic` over `values`.
+
+    Resamples are drawn from a generator seeded with `seed`, so the same trials always give the same interval.
+    With only a handful of trials the interval is rough and tends to be too narrow.
+    """
+    if not values:
+        return (0.0, 0.0)
+    if len(values) == 1:
+        return (values[0], values[0])
+    rng = random.Random(seed)
+    estimates = sorted(statistic(rng.choices(values, k=len(values))) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    return (estimates[int(tail * (resamples - 1))], estimates[math.ceil((1 - tail) * (resamples - 1))])
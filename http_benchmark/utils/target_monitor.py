@@ -0,0 +1,226 @@
+"""Monitoring of the benchmark target (server or proxy processes) for the HTTP benchmark framework."""
+
+import fnmatch
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import psutil
+
+from .cgroup import read_cgroup_cpu_limit, read_cgroup_cpu_throttling, read_cgroup_cpu_usage, read_cgroup_memory, read_cgroup_pids, resolve_cgroup_path
+from .cpu_affinity import format_cpu_set, get_affinity
+
+# A target using at least this share of its CPU capacity is considered saturated
+SATURATION_THRESHOLD = 0.9
+
+# Matching process names and cgroup members is repeated at this cadence to pick up new workers
+REFRESH_INTERVAL = 1.0
+
+
+class TargetMonitor:
+    """Sample CPU and memory of the processes serving the benchmark target.
+
+    Targets are given as PIDs, process name patterns (``fnmatch`` style, matched against the process
+    name and the first command line argument) and/or a cgroup. CPU usage is derived from cumulative
+    CPU time between samples, so processes that appear mid-run are counted from their first sample;
+    with a cgroup its own accounting (``cpu.stat``, ``memory.current``) is used, which also covers
+    short-lived children.
+
+    A process is pegged when it uses ``SATURATION_THRESHOLD`` of the cores it can use (its thread count,
+    capped at the CPUs in its affinity mask); the target is saturated when a process is pegged or the
+    targets together use that share of their capacity (the CPUs they are allowed to run on, capped by
+    the cgroup's CPU limit).
+    """
+
+    def __init__(self, pids: Optional[Sequence[int]] = None, name_patterns: Optional[Sequence[str]] = None, cgroup: Optional[str] = None):
+        if not (pids or name_patterns or cgroup):
+            raise ValueError("Target monitoring needs at least one PID, process name pattern or cgroup")
+        self.pids = list(pids or [])
+        self.name_patterns = list(name_patterns or [])
+        self.cgroup = resolve_cgroup_path(cgroup) if cgroup else None
+        # Never count the benchmark (or its sampler) as part of the target
+        self.exclude_pids = {os.getpid()}
+        self._cpu_count = psutil.cpu_count() or 1
+        self._total_memory = psutil.virtual_memory().total
+        self._reset()
+
+    def spec(self) -> Dict[str, Any]:
+        """Constructor arguments, used to recreate the monitor in the out-of-process sampler."""
+        return {"pids": self.pids, "name_patterns": self.name_patterns, "cgroup": self.cgroup}
+
+    def _reset(self) -> None:
+        self._processes: Dict[int, psutil.Process] = {}
+        self._cpu_first: Dict[int, float] = {}
+        self._cpu_last: Dict[int, float] = {}
+        self._threads: Dict[int, int] = {}
+        self._names: Dict[int, str] = {}
+        self._affinity: Dict[int, Set[int]] = {}
+        self._throttling_start: Dict[str, float] = {}
+        self._next_refresh = 0.0
+        self._last_wall: Optional[float] = None
+        self._start_wall: Optional[float] = None
+        self._cgroup_usage_start: Optional[float] = None
+        self._cgroup_usage_last: Optional[float] = None
+        self._totals = {"cpu_percent": 0.0, "memory_rss_mb": 0.0}
+        self._maxima = {"cpu_percent": 0.0, "memory_rss_mb": 0.0}
+        self._sample_count = 0
+        self._saturated_samples = 0
+        self._process_count_max = 0
+
+    def start(self) -> None:
+        """Resolve the target processes and take the first reading."""
+        self._reset()
+        self._start_wall = self._last_wall = time.perf_counter()
+        if self.cgroup:
+            self._cgroup_usage_start = self._cgroup_usage_last = read_cgroup_cpu_usage(self.cgroup)
+            self._throttling_start = read_cgroup_cpu_throttling(self.cgroup)
+        self._refresh()
+        for pid in list(self._processes):
+            self._read_process(pid)
+
+    def resolve_pids(self) -> List[int]:
+        """PIDs of the target processes right now."""
+        return self._matching_pids()
+
+    def _matching_pids(self) -> List[int]:
+        pids = set(self.pids)
+        if self.cgroup:
+            pids.update(read_cgroup_pids(self.cgroup))
+        if self.name_patterns:
+            for process in psutil.process_iter(["name", "cmdline"]):
+                names = [process.info["name"] or ""]
+                if process.info["cmdline"]:
+                    names.append(os.path.basename(process.info["cmdline"][0]))
+                if any(fnmatch.fnmatch(name, pattern) for name in names for pattern in self.name_patterns):
+                    pids.add(process.pid)
+        return sorted(pids - self.exclude_pids)
+
+    def _refresh(self) -> None:
+        """Pick up new target processes; processes that exited keep their last reading."""
+        for pid in self._matching_pids():
+            if pid in self._processes:
+                continue
+            try:
+                process = psutil.Process(pid)
+                self._names[pid] = process.name()
+                self._affinity[pid] = get_affinity(pid)
+            except (psutil.Error, OSError):
+                continue
+            self._processes[pid] = process
+        self._next_refresh = time.perf_counter() + REFRESH_INTERVAL
+
+    def _read_process(self, pid: int) -> Optional[int]:
+        """Update the CPU time of one process and return its RSS, or None if it exited."""
+        process = self._processes[pid]
+        try:
+            with process.oneshot():
+                cpu_times = process.cpu_times()
+                rss = process.memory_info().rss
+                self._threads[pid] = process.num_threads()
+        except psutil.Error:
+            del self._processes[pid]
+            return None
+        cpu = cpu_times.user + cpu_times.system
+        self._cpu_first.setdefault(pid, cpu)
+        self._cpu_last[pid] = cpu
+        return rss
+
+    def sample(self) -> Tuple[float, float, float, float]:
+        """Take one sample: (timestamp, cpu_percent, memory_percent, memory_rss_mb) summed over the targets."""
+        now = time.perf_counter()
+        if self.name_patterns or self.cgroup:
+            if now >= self._next_refresh:
+                self._refresh()
+
+        cpu_before = sum(self._cpu_last.values())
+        new_pids = [pid for pid in self._processes if pid not in self._cpu_last]
+        rss = 0
+        for pid in list(self._processes):
+            rss += self._read_process(pid) or 0
+        # Processes seen for the first time have no earlier reading to diff against
+        cpu_after = sum(cpu for pid, cpu in self._cpu_last.items() if pid not in new_pids)
+        cpu_seconds = cpu_after - cpu_before
+
+        if self.cgroup:
+            usage = read_cgroup_cpu_usage(self.cgroup)
+            if usage is not None and self._cgroup_usage_last is not None:
+                cpu_seconds = usage - self._cgroup_usage_last
+            self._cgroup_usage_last = usage
+            memory = read_cgroup_memory(self.cgroup)
+            if memory is not None:
+                rss = memory
+
+        wall = now - self._last_wall if self._last_wall is not None else 0.0
+        self._last_wall = now
+        cpu_percent = cpu_seconds / wall * 100 if wall > 0 else 0.0
+        rss_mb = rss / 1024 / 1024
+
+        self._totals["cpu_percent"] += cpu_percent
+        self._totals["memory_rss_mb"] += rss_mb
+        self._maxima["cpu_percent"] = max(self._maxima["cpu_percent"], cpu_percent)
+        self._maxima["memory_rss_mb"] = max(self._maxima["memory_rss_mb"], rss_mb)
+        self._sample_count += 1
+        if cpu_percent >= SATURATION_THRESHOLD * self.cpu_capacity_percent():
+            self._saturated_samples += 1
+        self._process_count_max = max(self._process_count_max, len(self._processes))
+        return (time.time(), cpu_percent, rss / self._total_memory * 100, rss_mb)
+
+    def _allowed_cpus(self) -> Set[int]:
+        """CPUs any of the target processes may run on."""
+        allowed: Set[int] = set()
+        for cpus in self._affinity.values():
+            allowed |= cpus
+        return allowed or set(range(self._cpu_count))
+
+    def cpu_capacity_percent(self) -> float:
+        """CPU the targets can use at most, in percent of one core."""
+        cpus = len(self._allowed_cpus())
+        limit = read_cgroup_cpu_limit(self.cgroup) if self.cgroup else None
+        if limit is not None:
+            return min(limit, cpus) * 100
+        return cpus * 100.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Average and peak usage of the targets over the run and whether they were saturated."""
+        wall = (self._last_wall - self._start_wall) if self._start_wall is not None and self._last_wall is not None else 0.0
+        processes = []
+        for pid, first in self._cpu_first.items():
+            capacity = min(self._threads.get(pid, 1), len(self._affinity.get(pid, ())) or self._cpu_count) * 100
+            cpu_percent = (self._cpu_last[pid] - first) / wall * 100 if wall > 0 else 0.0
+            processes.append(
+                {
+                    "pid": pid,
+                    "name": self._names.get(pid, ""),
+                    "cpu_percent_avg": cpu_percent,
+                    "threads": self._threads.get(pid, 1),
+                    "pegged": cpu_percent >= SATURATION_THRESHOLD * capacity,
+                }
+            )
+        processes.sort(key=lambda process: process["cpu_percent_avg"], reverse=True)
+
+        if self.cgroup and self._cgroup_usage_start is not None and self._cgroup_usage_last is not None:
+            cpu_avg = (self._cgroup_usage_last - self._cgroup_usage_start) / wall * 100 if wall > 0 else 0.0
+        else:
+            cpu_avg = sum(process["cpu_percent_avg"] for process in processes)
+        capacity = self.cpu_capacity_percent()
+        count = self._sample_count
+        throttling = {}
+        if self.cgroup and self._throttling_start:
+            throttling_end = read_cgroup_cpu_throttling(self.cgroup)
+            throttling = {key: throttling_end[key] - self._throttling_start[key] for key in self._throttling_start if key in throttling_end}
+        return {
+            "sources": {"pids": self.pids, "process_patterns": self.name_patterns, "cgroup": self.cgroup},
+            "process_count_max": self._process_count_max,
+            "cpu_avg": cpu_avg,
+            "cpu_max": self._maxima["cpu_percent"],
+            "memory_mb_avg": self._totals["memory_rss_mb"] / count if count else 0.0,
+            "memory_mb_max": self._maxima["memory_rss_mb"],
+            "cpu_capacity_percent": capacity,
+            "cpu_affinity": format_cpu_set(self._allowed_cpus()),
+            "throttling": throttling,
+            "cpu_utilization": cpu_avg / capacity if capacity else 0.0,
+            "saturated_sample_share": self._saturated_samples / count if count else 0.0,
+            "server_saturated": cpu_avg >= SATURATION_THRESHOLD * capacity or any(process["pegged"] for process in processes),
+            "sample_count": count,
+            "processes": processes[:10],
+        }
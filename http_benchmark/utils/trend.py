@@ -0,0 +1,42 @@
+"""Non-parametric trend tests for the HTTP benchmark framework."""
+
+import math
+from collections import Counter
+from typing import Any, Dict, Sequence
+
+
+def sens_slope(values: Sequence[float]) -> float:
+    """Sen's slope: the median of the slopes between all pairs of points, robust to outliers."""
+    slopes = sorted((values[j] - values[i]) / (j - i) for i in range(len(values)) for j in range(i + 1, len(values)))
+    if not slopes:
+        return 0.0
+    middle = len(slopes) // 2
+    return slopes[middle] if len(slopes) % 2 else (slopes[middle - 1] + slopes[middle]) / 2
+
+
+def mann_kendall(values: Sequence[float], alpha: float = 0.05) -> Dict[str, Any]:
+    """Mann-Kendall test for a monotonic trend in an evenly spaced series.
+
+    Returns the S statistic, its normal approximation Z (with the tie correction), the two-sided p-value,
+    the trend direction at significance `alpha` ("increasing", "decreasing" or "none") and Sen's slope
+    in units per step. Series shorter than four points never show a trend.
+    """
+    n = len(values)
+    s = sum((values[j] > values[i]) - (values[j] < values[i]) for i in range(n) for j in range(i + 1, n))
+    variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in Counter(values).values() if t > 1)) / 18
+    if n < 4 or variance <= 0:
+        z = 0.0
+    elif s > 0:
+        z = (s - 1) / math.sqrt(variance)
+    elif s < 0:
+        z = (s + 1) / math.sqrt(variance)
+    else:
+        z = 0.0
+    p_value = math.erfc(abs(z) / math.sqrt(2))
+    if p_value < alpha and z > 0:
+        trend = "increasing"
+    elif p_value < alpha and z < 0:
+        trend = "decreasing"
+    else:
+        trend = "none"
+    return {"n": n, "s": s, "z": z, "p_value": p_value, "trend": trend, "slope": sens_slope(values)}
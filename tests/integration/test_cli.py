@@ -1,3 +1,6 @@
+import contextlib
+import io
+import os
 import unittest
 import subprocess
 import sys
@@ -73,6 +76,32 @@ class TestCLIIntegration(unittest.TestCase):
         mock_args.is_async = False
         mock_args.output = None
         mock_args.verify_ssl = False
+        mock_args.profile = False
+        mock_args.profile_dir = "profiles"
+        mock_args.warmup = 0
+        mock_args.gc_mode = "default"
+        mock_args.gc_thresholds = None
+        mock_args.track_allocations = False
+        mock_args.monitor_interval = 0.2
+        mock_args.monitor_mode = "thread"
+        mock_args.loop_debug = False
+        mock_args.cpu_set = None
+        mock_args.target_cpu_set = None
+        mock_args.soak_window = None
+        mock_args.tag = None
+        mock_args.repeat = 1
+        mock_args.interleave = None
+        mock_args.target_precision = None
+        mock_args.batch_seconds = 1.0
+        mock_args.isolate = False
+        mock_args.scenario_path = None
+        mock_args.scenario_mode = "weighted"
+        mock_args.scenario_seed = None
+        mock_args.replay_path = None
+        mock_args.replay_speedup = 1.0
+        mock_args.monitor_pids = None
+        mock_args.monitor_processes = None
+        mock_args.monitor_cgroup = None
 
         # Mock the configuration
         mock_config = MagicMock()
@@ -95,22 +124,51 @@ class TestCLIIntegration(unittest.TestCase):
         mock_result.error_rate = 0.0
         mock_result.cpu_usage_avg = 15.0
         mock_result.memory_usage_avg = 50.0
+        mock_result.cpu_time_user = 0.4
+        mock_result.cpu_time_system = 0.1
+        mock_result.cpu_us_per_request = 50000.0
+        mock_result.adapter_cpu_us_per_request = 45000.0
+        mock_result.requests_per_cpu_second = 20.0
+        mock_result.gc_stats = {"mode": "default", "collections": 2, "total_pause": 0.001, "max_pause": 0.0008}
+        mock_result.allocation_stats = {}
+        mock_result.profile_path = None
+        mock_result.target_metrics = {}
+        mock_result.event_loop_stats = {}
+        mock_result.cpu_budget = {}
+        mock_result.soak_stats = {}
+        mock_result.convergence_stats = {}
+        mock_result.endpoint_stats = {}
+        mock_result.replay_stats = {}
+        mock_result.network_io = {
+            "bytes_sent": 1200,
+            "bytes_recv": 4800,
+            "open_sockets_max": 1,
+            "connections_max": {"ESTABLISHED": 1},
+            # Hosts without TCP_INFO or /proc/net report these as None
+            "time_wait_max": None,
+            "tcp_retransmits": None,
+        }
         mock_result.id = "test-id"
         mock_runner.run.return_value = mock_result
         mock_runner_class.return_value = mock_runner
 
         # Mock the storage
         mock_storage = MagicMock()
-        mock_storage_class.return_value = mock_storage
+        mock_storage_class.return_value.__enter__.return_value = mock_storage
 
         # Call the function
-        run_single_benchmark(mock_args)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_single_benchmark(mock_args)
+        self.assertIn("n/a TCP retransmits", output.getvalue())
+        self.assertIn("n/a in TIME_WAIT", output.getvalue())
 
         # Verify the mocks were called
         mock_config_class.assert_called_once()
         mock_runner_class.assert_called_once()
         mock_runner.run.assert_called_once()
         mock_storage.save_result.assert_called_once()
+        mock_storage_class.return_value.__exit__.assert_called_once()  # Closed, flushing the background writer
 
     @patch("http_benchmark.cli.BenchmarkRunner")
     @patch("http_benchmark.cli.BenchmarkConfiguration")
@@ -128,7 +186,36 @@ class TestCLIIntegration(unittest.TestCase):
         mock_args.duration = 5
         mock_args.is_async = False
         mock_args.compare = ["httpx", "requests"]
+        mock_args.client = None
+        mock_args.headers = '{"X-Trace": "1"}'
+        mock_args.body = None
         mock_args.verify_ssl = False
+        mock_args.profile = False
+        mock_args.profile_dir = "profiles"
+        mock_args.warmup = 0
+        mock_args.gc_mode = "default"
+        mock_args.gc_thresholds = None
+        mock_args.track_allocations = False
+        mock_args.monitor_interval = 0.2
+        mock_args.monitor_mode = "thread"
+        mock_args.loop_debug = False
+        mock_args.cpu_set = None
+        mock_args.target_cpu_set = None
+        mock_args.soak_window = None
+        mock_args.tag = None
+        mock_args.repeat = 1
+        mock_args.interleave = None
+        mock_args.target_precision = None
+        mock_args.batch_seconds = 1.0
+        mock_args.isolate = False
+        mock_args.scenario_path = None
+        mock_args.scenario_mode = "weighted"
+        mock_args.scenario_seed = None
+        mock_args.replay_path = None
+        mock_args.replay_speedup = 1.0
+        mock_args.monitor_pids = None
+        mock_args.monitor_processes = None
+        mock_args.monitor_cgroup = None
 
         # Mock the configuration
         mock_config = MagicMock()
@@ -151,22 +238,73 @@ class TestCLIIntegration(unittest.TestCase):
         mock_result.error_rate = 0.0
         mock_result.cpu_usage_avg = 15.0
         mock_result.memory_usage_avg = 50.0
+        mock_result.cpu_time_user = 0.4
+        mock_result.cpu_time_system = 0.1
+        mock_result.cpu_us_per_request = 50000.0
+        mock_result.adapter_cpu_us_per_request = 45000.0
+        mock_result.requests_per_cpu_second = 20.0
+        mock_result.gc_stats = {"mode": "default", "collections": 2, "total_pause": 0.001, "max_pause": 0.0008}
+        mock_result.allocation_stats = {}
+        mock_result.profile_path = None
         mock_result.id = "test-id"
         mock_runner.run.return_value = mock_result
         mock_runner_class.return_value = mock_runner
 
         # Mock the storage
         mock_storage = MagicMock()
-        mock_storage_class.return_value = mock_storage
+        mock_storage_class.return_value.__enter__.return_value = mock_storage
 
         # Call the function
         compare_clients(mock_args)
 
         # Verify the mocks were called for each client
         self.assertEqual(mock_config_class.call_count, 2)  # Called once for each client
+        self.assertEqual([call.kwargs["client_library"] for call in mock_config_class.call_args_list], ["httpx", "requests"])
+        self.assertEqual(mock_config_class.call_args.kwargs["headers"], {"X-Trace": "1"})  # Options shared with single runs apply to every client
         self.assertEqual(mock_runner_class.call_count, 2)  # Called once for each client
         self.assertEqual(mock_runner.run.call_count, 2)  # Called once for each client
         self.assertEqual(mock_storage.save_result.call_count, 2)  # Called once for each client
+        mock_storage_class.assert_called_once()  # One storage shared by all clients
+        mock_storage_class.return_value.__exit__.assert_called_once()
+
+    @patch("http_benchmark.cli.format_report", return_value="")
+    @patch("http_benchmark.cli.check_regression", return_value={"regression": False})
+    @patch("http_benchmark.cli.BenchmarkRunner")
+    @patch("http_benchmark.cli.ResultStorage")
+    def test_check_matches_baseline_workload(self, mock_storage_class, mock_runner_class, mock_check_regression, mock_format_report):
+        """Test that check looks up baselines under the stored method label and the same scenario file or capture."""
+        import argparse
+        import tempfile
+        from http_benchmark.cli import _add_benchmark_arguments, check_against_baseline
+
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write('{"url": "/users"}\n{"method": "POST", "url": "/users"}\n')
+        self.addCleanup(os.remove, f.name)
+        parser = argparse.ArgumentParser()
+        _add_benchmark_arguments(parser)
+        args = parser.parse_args(["--url", "http://localhost/", "--client", "httpx", "--scenario", f.name])
+        args.baseline, args.runs, args.alpha, args.tolerance, args.tag = "main", 1, 0.05, 0.05, None
+
+        storage = mock_storage_class.return_value.__enter__.return_value
+        same = MagicMock(client_type="sync", config_snapshot={"scenario_path": f.name})
+        other = MagicMock(client_type="sync", config_snapshot={"scenario_path": "other.jsonl"})
+        plain = MagicMock(client_type="sync", config_snapshot={})
+        storage.iter_results.return_value = [other, same, plain]
+        check_against_baseline(args)
+        self.assertEqual(storage.iter_results.call_args.kwargs["http_method"], "MIXED")
+        self.assertEqual(mock_check_regression.call_args[0][0], [same])
+
+        storage.iter_results.return_value = [other, plain]
+        with self.assertRaisesRegex(ValueError, "No runs tagged"):
+            check_against_baseline(args)
+
+        args.scenario_path, args.replay_path = None, "access.log"
+        replay = MagicMock(client_type="sync", config_snapshot={"replay_path": "access.log", "replay_speedup": 1.0})
+        faster = MagicMock(client_type="sync", config_snapshot={"replay_path": "access.log", "replay_speedup": 2.0})
+        storage.iter_results.return_value = [plain, faster, replay]
+        check_against_baseline(args)
+        self.assertEqual(storage.iter_results.call_args.kwargs["http_method"], "REPLAY")
+        self.assertEqual(mock_check_regression.call_args[0][0], [replay])
 
 
 class TestCLIStructure(unittest.TestCase):
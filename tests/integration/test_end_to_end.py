@@ -15,6 +15,7 @@ class TestEndToEndFunctionality(unittest.TestCase):
 
     def tearDown(self):
         """Clean up temporary database."""
+        self.storage.close()
         if os.path.exists(self.temp_db.name):
             os.unlink(self.temp_db.name)
 
@@ -142,6 +143,7 @@ class TestStorageIntegration(unittest.TestCase):
 
     def tearDown(self):
         """Clean up temporary database."""
+        self.storage.close()
         if os.path.exists(self.temp_db.name):
             os.unlink(self.temp_db.name)
 
@@ -0,0 +1,51 @@
+"""Shared test data for the unit tests."""
+
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from http_benchmark.models.benchmark_result import BenchmarkResult
+from http_benchmark.utils.histogram import LatencyHistogram
+
+
+def make_result(latencies: Optional[Sequence[float]] = None, **overrides: Any) -> BenchmarkResult:
+    """A one-second sync GET result of 100 requests at 10ms without errors, with any field overridden.
+
+    With `latencies`, the request count, latency statistics and histogram are computed from them.
+    """
+    fields = {
+        "name": "Benchmark",
+        "client_library": "httpx",
+        "client_type": "sync",
+        "http_method": "GET",
+        "url": "https://example.com",
+        "start_time": datetime.now(),
+        "end_time": datetime.now(),
+        "duration": 1.0,
+        "requests_count": 100,
+        "requests_per_second": 100.0,
+        "avg_response_time": 0.01,
+        "min_response_time": 0.01,
+        "max_response_time": 0.01,
+        "p95_response_time": 0.01,
+        "p99_response_time": 0.01,
+        "cpu_usage_avg": 0.0,
+        "memory_usage_avg": 0.0,
+        "network_io": {},
+        "error_count": 0,
+        "error_rate": 0.0,
+        "concurrency_level": 1,
+        "config_snapshot": {},
+    }
+    if latencies is not None:
+        ordered = sorted(latencies)
+        fields.update(
+            requests_count=len(ordered),
+            avg_response_time=sum(ordered) / len(ordered),
+            min_response_time=ordered[0],
+            max_response_time=ordered[-1],
+            p95_response_time=ordered[int(0.95 * (len(ordered) - 1))],
+            p99_response_time=ordered[int(0.99 * (len(ordered) - 1))],
+            latency_histogram=LatencyHistogram.from_values(ordered),
+        )
+    fields.update(overrides)
+    return BenchmarkResult(**fields)
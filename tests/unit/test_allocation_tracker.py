@@ -0,0 +1,60 @@
+import json
+import os
+import tracemalloc
+import unittest
+from http_benchmark.utils.allocation_tracker import AllocationTracker, package_locations
+
+
+class TestPackageLocations(unittest.TestCase):
+    def test_resolves_package_directory(self):
+        """Test that a package name resolves to its source directory."""
+        locations = package_locations(["json"])
+        self.assertEqual(len(locations), 1)
+        self.assertTrue(os.path.dirname(json.__file__).startswith(locations[0].rstrip(os.sep)))
+
+    def test_skips_unknown_packages(self):
+        """Test that packages that cannot be found are ignored."""
+        self.assertEqual(package_locations(["definitely_not_an_installed_package"]), [])
+
+
+class TestAllocationTracker(unittest.TestCase):
+    def tearDown(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def test_per_request_allocations_and_sites(self):
+        """Test that retained allocations are divided by request count and attributed to tracked files."""
+        tracker = AllocationTracker([__file__], frames=5)
+        tracker.start()
+        tracker.warmup_complete()
+        retained = [bytearray(1024) for _ in range(100)]
+        tracker.measurement_complete()
+        stats = tracker.stop(requests_count=10)
+
+        self.assertEqual(stats["requests_count"], 10)
+        self.assertGreaterEqual(stats["net_bytes"], 100 * 1024)
+        self.assertGreaterEqual(stats["bytes_per_request"], 10 * 1024)
+        self.assertGreaterEqual(stats["library_bytes_per_request"], 10 * 1024)
+        self.assertTrue(stats["top_sites"])
+        self.assertTrue(stats["top_sites"][0]["site"].startswith(__file__))
+        self.assertFalse(tracemalloc.is_tracing())
+        del retained
+
+    def test_existing_tracing_is_left_running(self):
+        """Test that the tracker does not stop tracemalloc if it was already tracing."""
+        tracemalloc.start()
+        tracker = AllocationTracker([__file__])
+        tracker.start()
+        tracker.warmup_complete()
+        tracker.stop(requests_count=1)
+        self.assertTrue(tracemalloc.is_tracing())
+
+    def test_stop_without_warmup_returns_empty(self):
+        """Test that no statistics are reported without a baseline snapshot."""
+        tracker = AllocationTracker([__file__])
+        tracker.start()
+        self.assertEqual(tracker.stop(requests_count=5), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from http_benchmark.convergence import MAX_BATCHES, MIN_BATCHES, ConvergenceMonitor, relative_half_width
+
+
+class TestConvergence(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        patcher = patch("http_benchmark.convergence.time")
+        patcher.start().perf_counter.side_effect = lambda: self.now
+        self.addCleanup(patcher.stop)
+
+    def _run_batches(self, monitor, batches, latencies, errors=0):
+        """Feed `batches` one-second batches; `latencies(batch)` gives the successful latencies of each."""
+        for batch in range(batches):
+            for latency in latencies(batch):
+                monitor.record(latency)
+            self.now += 1.0
+            monitor.tick(errors)
+            if monitor.converged:
+                return batch + 1
+        return batches
+
+    def test_relative_half_width(self):
+        """Test the t interval of the mean relative to the mean."""
+        self.assertIsNone(relative_half_width([10.0]))
+        self.assertEqual(relative_half_width([10.0, 10.0, 10.0]), 0.0)
+        # t(0.975, 1) = 12.706, stdev 1.414, n 2: 12.706 * 1.414 / 1.414 / 10
+        self.assertAlmostEqual(relative_half_width([9.0, 11.0]), 1.2706, places=3)
+
+    def test_steady_run_converges_after_min_batches(self):
+        """Test that stable batches converge as soon as enough of them are closed, and the trace covers each batch."""
+        rng = random.Random(1)
+        monitor = ConvergenceMonitor(0.02)
+        monitor.start()
+        closed = self._run_batches(monitor, 50, lambda batch: [0.010 + rng.random() * 0.0001 for _ in range(200)])
+
+        self.assertTrue(monitor.converged)
+        self.assertEqual(closed, MIN_BATCHES)
+        summary = monitor.summary()
+        self.assertEqual(len(summary["trace"]), MIN_BATCHES)
+        self.assertIsNone(summary["trace"][0]["requests_per_second_precision"])
+        self.assertEqual(summary["trace"][-1]["requests_per_second"], 200)
+        self.assertLessEqual(summary["precision"]["p99_response_time"], 0.02)
+
+    def test_noisy_run_does_not_converge(self):
+        """Test that batches whose throughput and tail swing widely keep the run going."""
+        rng = random.Random(2)
+        monitor = ConvergenceMonitor(0.01)
+        monitor.start()
+        self._run_batches(monitor, 30, lambda batch: [rng.uniform(0.005, 0.05) for _ in range(rng.randint(50, 300))])
+
+        self.assertFalse(monitor.converged)
+        self.assertGreater(monitor.summary()["precision"]["requests_per_second"], 0.01)
+
+    def test_batches_merge_in_pairs_at_the_limit(self):
+        """Test that reaching MAX_BATCHES halves the batch count, doubles the batch length and keeps the request totals."""
+        monitor = ConvergenceMonitor(0.0001)
+        monitor.start()
+        self._run_batches(monitor, MAX_BATCHES, lambda batch: [0.01 * (1 + batch % 2)] * 100, errors=0)
+
+        summary = monitor.summary()
+        self.assertEqual(summary["batches"], MAX_BATCHES // 2)
+        self.assertEqual(summary["batch_seconds"], 2.0)
+        self.assertEqual(summary["trace"][-1]["requests_per_second"], 100)
+        # Pairs mix a fast and a slow batch, so every merged batch has the same p99
+        self.assertEqual(summary["precision"]["p99_response_time"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from http_benchmark.utils.cpu_affinity import cpu_budget, format_cpu_set, get_affinity, is_supported, parse_cpu_set, pin_process
+
+
+class TestCpuAffinity(unittest.TestCase):
+    def test_parse_and_format_cpu_sets(self):
+        """Test the kernel cpuset notation in both directions."""
+        self.assertEqual(parse_cpu_set("0-3,6"), [0, 1, 2, 3, 6])
+        self.assertEqual(parse_cpu_set(" 2, 1,1 "), [1, 2])
+        self.assertEqual(format_cpu_set([6, 0, 1, 2, 3]), "0-3,6")
+        self.assertEqual(format_cpu_set([4]), "4")
+        for spec in ("", "a", "3-1", "-1"):
+            with self.assertRaises(ValueError):
+                parse_cpu_set(spec)
+
+    def test_budget_is_capped_by_cgroup_quota(self):
+        """Test that a CPU quota below the affinity mask sets the budget."""
+        with tempfile.TemporaryDirectory() as cgroup:
+            with open(os.path.join(cgroup, "cpu.max"), "w") as cpu_max:
+                cpu_max.write("50000 100000\n")
+            budget = cpu_budget(cgroup=cgroup)
+        self.assertEqual(budget["cores"], 0.5)
+        self.assertEqual(budget["cgroup_limit_cores"], 0.5)
+        self.assertEqual(budget["affinity_cpus"], len(get_affinity()))
+
+    @unittest.skipUnless(is_supported(), "CPU affinity is not supported on this platform")
+    def test_pin_process_covers_all_threads(self):
+        """Test that pinning applies to the existing threads of the process and returns the previous affinity."""
+        cpu = min(get_affinity())
+        previous = pin_process(os.getpid(), [cpu])
+        try:
+            for tid in os.listdir(f"/proc/{os.getpid()}/task"):
+                self.assertEqual(os.sched_getaffinity(int(tid)), {cpu})
+            self.assertEqual(cpu_budget()["affinity"], str(cpu))
+        finally:
+            pin_process(os.getpid(), previous)
+        self.assertEqual(get_affinity(), previous)
+
+
+if __name__ == "__main__":
+    unittest.main()
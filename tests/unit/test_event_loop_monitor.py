@@ -0,0 +1,50 @@
+import asyncio
+import time
+import unittest
+
+from http_benchmark.utils.event_loop_monitor import EventLoopMonitor
+
+
+class TestEventLoopMonitor(unittest.TestCase):
+    def test_blocking_callback_shows_up_as_lag(self):
+        """Test that blocking the loop is measured by the lag probe and as scheduling delay."""
+
+        async def scenario():
+            monitor = EventLoopMonitor(probe_interval=0.002)
+            monitor.start()
+            await asyncio.sleep(0.05)
+            tracked = asyncio.create_task(monitor.track(asyncio.sleep(0)))
+            time.sleep(0.05)  # Block the loop
+            await tracked
+            await asyncio.sleep(0.02)
+            return await monitor.stop()
+
+        stats = asyncio.run(scenario())
+        self.assertGreater(stats["lag"]["count"], 5)
+        self.assertGreaterEqual(stats["lag"]["max"], 0.04)
+        self.assertEqual(stats["scheduling_delay"]["count"], 1)
+        self.assertGreaterEqual(stats["scheduling_delay"]["max"], 0.04)
+        self.assertIsNone(stats["slow_callbacks"])
+
+    def test_debug_mode_counts_slow_callbacks(self):
+        """Test that loop debug mode reports callbacks blocking longer than the threshold and is restored afterwards."""
+
+        async def blocking():
+            time.sleep(0.03)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            monitor = EventLoopMonitor(debug=True, slow_callback_duration=0.01)
+            monitor.start()
+            await asyncio.create_task(blocking())
+            stats = await monitor.stop()
+            return stats, loop.get_debug()
+
+        stats, debug_after = asyncio.run(scenario())
+        self.assertGreaterEqual(stats["slow_callbacks"], 1)
+        self.assertGreaterEqual(stats["slowest_callbacks"][0]["duration"], 0.02)
+        self.assertFalse(debug_after)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import gc
+import unittest
+from http_benchmark.utils.gc_monitor import GCMonitor, TUNED_THRESHOLDS
+
+
+class TestGCMonitor(unittest.TestCase):
+    def setUp(self):
+        self.original_thresholds = gc.get_threshold()
+        self.original_enabled = gc.isenabled()
+
+    def tearDown(self):
+        gc.set_threshold(*self.original_thresholds)
+        if self.original_enabled:
+            gc.enable()
+
+    def test_records_collections(self):
+        """Test that collections during the measured phase are recorded with generation and duration."""
+        monitor = GCMonitor()
+        monitor.start()
+        monitor.warmup_complete()
+        gc.collect(0)
+        gc.collect(2)
+        stats = monitor.stop()
+
+        self.assertGreaterEqual(stats["collections"], 2)
+        self.assertGreaterEqual(stats["collections_by_generation"]["0"], 1)
+        self.assertGreaterEqual(stats["collections_by_generation"]["2"], 1)
+        self.assertGreaterEqual(stats["total_pause"], stats["max_pause"])
+        self.assertEqual(len(stats["events"]), stats["collections"])
+        for event in stats["events"]:
+            self.assertIn(event["generation"], (0, 1, 2))
+            self.assertGreaterEqual(event["duration"], 0)
+            self.assertGreaterEqual(event["offset"], 0)
+
+    def test_warmup_complete_resets_timeline(self):
+        """Test that collections during warm-up are not counted."""
+        monitor = GCMonitor()
+        monitor.start()
+        gc.collect()
+        monitor.warmup_complete()
+        stats = monitor.stop()
+        self.assertEqual(stats["collections"], 0)
+        self.assertEqual(stats["events"], [])
+
+    def test_callback_removed_after_stop(self):
+        """Test that the gc callback is unregistered when monitoring stops."""
+        monitor = GCMonitor()
+        monitor.start()
+        self.assertIn(monitor._callback, gc.callbacks)
+        monitor.stop()
+        self.assertNotIn(monitor._callback, gc.callbacks)
+
+    def test_disable_mode_restores_collector(self):
+        """Test that disable mode turns the collector off for the run only."""
+        gc.enable()
+        monitor = GCMonitor(mode="disable")
+        monitor.start()
+        self.assertFalse(gc.isenabled())
+        monitor.stop()
+        self.assertTrue(gc.isenabled())
+
+    def test_tuned_mode_thresholds(self):
+        """Test that tuned mode applies default or explicit thresholds and restores them."""
+        monitor = GCMonitor(mode="tuned")
+        monitor.start()
+        self.assertEqual(gc.get_threshold(), TUNED_THRESHOLDS)
+        monitor.stop()
+        self.assertEqual(gc.get_threshold(), self.original_thresholds)
+
+        monitor = GCMonitor(mode="tuned", thresholds=[1000, 5, 5])
+        monitor.start()
+        self.assertEqual(gc.get_threshold(), (1000, 5, 5))
+        self.assertEqual(monitor.stop()["thresholds"], [1000, 5, 5])
+
+    def test_freeze_mode(self):
+        """Test that freeze mode freezes after warm-up and unfreezes on stop."""
+        monitor = GCMonitor(mode="freeze")
+        monitor.start()
+        self.assertEqual(gc.get_freeze_count(), 0)
+        monitor.warmup_complete()
+        self.assertGreater(gc.get_freeze_count(), 0)
+        monitor.stop()
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_invalid_mode(self):
+        """Test that an unknown GC mode is rejected."""
+        with self.assertRaises(ValueError):
+            GCMonitor(mode="aggressive")
+
+
+if __name__ == "__main__":
+    unittest.main()
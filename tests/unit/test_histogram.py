@@ -0,0 +1,51 @@
+import random
+import unittest
+
+from http_benchmark.utils.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        """Test that percentiles read back from the buckets are within the configured relative error."""
+        rng = random.Random(42)
+        values = sorted(rng.lognormvariate(-5, 1) for _ in range(10_000))
+        histogram = LatencyHistogram(precision=0.01)
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (0.5, 0.9, 0.99):
+            exact = values[int(percentile * (len(values) - 1))]
+            self.assertAlmostEqual(histogram.percentile(percentile) / exact, 1.0, delta=0.011)
+        self.assertEqual(histogram.count, 10_000)
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values))
+        self.assertEqual(histogram.max, values[-1])
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros."""
+        summary = LatencyHistogram().summary()
+        self.assertEqual(summary["count"], 0)
+        self.assertEqual(summary["p99"], 0.0)
+        self.assertEqual(summary["max"], 0.0)
+
+    def test_merge_and_round_trip(self):
+        """Test that merged histograms equal one histogram of all values and survive serialization."""
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for index in range(1, 1001):
+            value = index / 1000
+            (first if index % 2 else second).record(value)
+            combined.record(value)
+        first.merge(second)
+        for key, value in combined.summary().items():
+            self.assertAlmostEqual(first.summary()[key], value)
+
+        restored = LatencyHistogram.from_dict(first.to_dict())
+        self.assertEqual(restored.summary(), first.summary())
+        self.assertEqual(LatencyHistogram.from_bytes(first.to_bytes()).to_dict(), first.to_dict())
+        self.assertEqual(LatencyHistogram.from_bytes(LatencyHistogram().to_bytes()).summary(), LatencyHistogram().summary())
+        self.assertLess(len(first.to_bytes()), len(str(first.to_dict())) / 2)
+        with self.assertRaises(ValueError):
+            first.merge(LatencyHistogram(precision=0.05))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+
+from http_benchmark.interleave import estimate_drift, merge_slices, run_interleaved, slice_durations, slice_schedule
+from http_benchmark.models.benchmark_configuration import BenchmarkConfiguration
+
+from factories import make_result
+
+
+class TestInterleave(unittest.TestCase):
+    def test_slices_and_schedule(self):
+        """Test that slices add up to the duration and every round shuffles the clients reproducibly."""
+        self.assertEqual(slice_durations(10, 3), [3, 3, 3, 1])
+        self.assertEqual(slice_durations(9, 3), [3, 3, 3])
+        schedule = slice_schedule(["a", "b", "c"], 20, seed=1)
+        self.assertEqual(schedule, slice_schedule(["a", "b", "c"], 20, seed=1))
+        self.assertTrue(all(sorted(order) == ["a", "b", "c"] for order in schedule))
+        self.assertEqual({order[0] for order in schedule}, {"a", "b", "c"})
+
+    @patch("http_benchmark.interleave.BenchmarkRunner")
+    def test_run_interleaved_runs_one_slice_per_client_per_round(self, mock_runner_class):
+        """Test that each client runs its whole duration in slices and gets one merged result."""
+        runs = []
+        mock_runner_class.side_effect = lambda config: type(
+            "Runner", (), {"run": lambda self: runs.append((config.client_library, config.duration_seconds)) or make_result(config_snapshot={"duration_seconds": config.duration_seconds})}
+        )()
+        configs = {client: BenchmarkConfiguration(target_url="https://example.com", client_library=client, duration_seconds=5) for client in ("httpx", "requests")}
+
+        interleaved = run_interleaved(configs, 2, seed=0)
+
+        self.assertEqual(len(runs), 6)
+        self.assertEqual(sorted(client for client, _ in runs[:2]), ["httpx", "requests"])
+        self.assertEqual([duration for client, duration in runs if client == "httpx"], [2, 2, 1])
+        self.assertEqual(interleaved["results"]["httpx"].requests_count, 300)
+        self.assertEqual(interleaved["results"]["httpx"].config_snapshot["duration_seconds"], 5)
+
+    def test_estimate_drift_finds_common_decline(self):
+        """Test that a throughput decline shared by all clients shows up as drift, independent of client speed."""
+        slices = {
+            "fast": [make_result(requests_per_second=200 * (1 - 0.02 * index)) for index in range(8)],
+            "slow": [make_result(requests_per_second=100 * (1 - 0.02 * index)) for index in range(8)],
+        }
+        drift = estimate_drift(slices)
+        self.assertEqual(drift["trend"], "decreasing")
+        self.assertAlmostEqual(drift["slope_percent_per_round"], -2.0 / 0.93, places=1)
+        self.assertEqual(estimate_drift({"flat": [make_result() for _ in range(8)]})["trend"], "none")
+
+    def test_merge_slices(self):
+        """Test that slice counts are summed and throughput is total requests over total measured time."""
+        # 100 requests per slice, one of them an error
+        counts = {"requests_count": 100, "error_count": 1, "cpu_time_user": 0.1, "cpu_time_system": 0.1, "network_io": {"bytes_sent": 10, "bytes_recv": 20}}
+        gc_stats = {"mode": "default", "collections": 1, "total_pause": 0.001, "max_pause": 0.001}
+        merged = merge_slices([make_result([0.01] * 99, requests_per_second=100.0, gc_stats=gc_stats, **counts), make_result([0.02] * 99, requests_per_second=50.0, gc_stats=gc_stats, **counts)])
+        self.assertEqual((merged.requests_count, merged.error_count), (200, 2))
+        self.assertAlmostEqual(merged.requests_per_second, 200 / 3)
+        self.assertAlmostEqual(merged.cpu_us_per_request, 0.4 / 200 * 1_000_000)
+        self.assertEqual(merged.network_io, {"bytes_sent": 20, "bytes_recv": 40})
+        self.assertEqual(merged.gc_stats["collections"], 2)
+        self.assertAlmostEqual(merged.p99_response_time, 0.02, delta=0.0004)
+
+    def test_merge_slices_without_tcp_info(self):
+        """Test that slices whose retransmits could not be read are skipped, and all-None stays None."""
+        slices = [make_result(network_io={"tcp_retransmits": None}), make_result(network_io={"tcp_retransmits": 3})]
+        self.assertEqual(merge_slices(slices).network_io["tcp_retransmits"], 3)
+        slices[1].network_io["tcp_retransmits"] = None
+        self.assertIsNone(merge_slices(slices).network_io["tcp_retransmits"])
+
+
+if __name__ == "__main__":
+    unittest.main()
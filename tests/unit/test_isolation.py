@@ -0,0 +1,67 @@
+import json
+import subprocess
+import unittest
+from unittest.mock import MagicMock, patch
+
+from http_benchmark.benchmark import BenchmarkRunner
+from http_benchmark.isolation import START_METHOD, _child_main, _run_child, run_isolated
+from http_benchmark.models.benchmark_configuration import BenchmarkConfiguration
+from http_benchmark.models.benchmark_result import BenchmarkResult
+
+from factories import make_result
+
+# Resource samples the child ships back with its result
+SAMPLES = [{"timestamp": 1.0, "cpu_percent": 5.0, "memory_rss_mb": 40.0, "memory_percent": 1.0}]
+
+
+def _run_inline(args, input, text, env):
+    """Stands in for the child interpreter: runs its entry point in this process."""
+    _child_main(args[-1], json.loads(input))
+    return subprocess.CompletedProcess(args, 0)
+
+
+class TestIsolation(unittest.TestCase):
+    def setUp(self):
+        self.config = BenchmarkConfiguration(target_url="https://example.com", client_library="httpx", isolate=True)
+
+    @patch("http_benchmark.benchmark.BenchmarkRunner")
+    def test_child_runs_without_isolation_and_ships_plain_data(self, mock_runner_class):
+        """Test that the child runs the configuration in-process and returns the result, samples and RSS baselines."""
+        mock_runner_class.side_effect = lambda config, storage=None: MagicMock(run=lambda: make_result([0.01] * 3, resource_samples=SAMPLES))
+        payload = _run_child({**self.config.to_dict(), "isolate": False}, None)
+
+        config = mock_runner_class.call_args[0][0]
+        self.assertFalse(config.isolate)
+        self.assertEqual(config.client_library, "httpx")
+        self.assertEqual(payload["result"]["requests_count"], 3)
+        self.assertIsInstance(payload["result"]["latency_histogram"], dict)
+        self.assertEqual(payload["resource_samples"][0]["memory_rss_mb"], 40.0)
+        isolation = payload["isolation"]
+        self.assertEqual(isolation["start_method"], START_METHOD)
+        self.assertGreater(isolation["rss_baseline_mb"], 0)
+        self.assertAlmostEqual(isolation["import_mb"], isolation["rss_after_import_mb"] - isolation["rss_baseline_mb"])
+
+    @patch("http_benchmark.benchmark.BenchmarkRunner")
+    @patch("http_benchmark.isolation.subprocess.run", side_effect=_run_inline)
+    def test_result_is_rebuilt_in_the_parent(self, mock_run, mock_runner_class):
+        """Test that the parent starts a fresh interpreter and gets a full BenchmarkResult back, with its histogram, samples and isolation record."""
+        mock_runner_class.side_effect = lambda config, storage=None: MagicMock(run=lambda: make_result([0.01] * 3, resource_samples=SAMPLES))
+        result = run_isolated(self.config)
+
+        self.assertEqual(mock_run.call_args[0][0][1:3], ["-m", "http_benchmark.isolation"])
+        self.assertIsInstance(result, BenchmarkResult)
+        self.assertEqual(result.latency_histogram.count, 3)
+        self.assertEqual(len(list(result.iter_resource_metrics())), 1)
+        self.assertTrue(result.config_snapshot["isolate"])
+        self.assertIn("rss_baseline_mb", result.config_snapshot["isolation"])
+
+    @patch("http_benchmark.benchmark.run_isolated")
+    def test_runner_delegates_isolated_configurations(self, mock_run_isolated):
+        """Test that BenchmarkRunner hands isolated configurations to a subprocess, with its storage's database for soak windows."""
+        storage = MagicMock(db_path="results.db")
+        BenchmarkRunner(self.config, storage=storage).run()
+        mock_run_isolated.assert_called_once_with(self.config, "results.db")
+
+
+if __name__ == "__main__":
+    unittest.main()
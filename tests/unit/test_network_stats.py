@@ -0,0 +1,106 @@
+import os
+import socket
+import tempfile
+import unittest
+
+import psutil
+
+from http_benchmark.utils.network_stats import ProcessNetworkMonitor, count_time_wait, read_tcp_info, read_tcp_retransmits
+
+
+class TestNetworkStats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as output:
+            output.write(content)
+        return path
+
+    def test_read_tcp_retransmits(self):
+        """Test that RetransSegs is read from the Tcp section of /proc/net/snmp."""
+        path = self._write(
+            "snmp",
+            "Ip: Forwarding DefaultTTL\nIp: 1 64\nTcp: RtoAlgorithm ActiveOpens RetransSegs InErrs\nTcp: 1 120 37 0\n",
+        )
+        self.assertEqual(read_tcp_retransmits(path), 37)
+        self.assertIsNone(read_tcp_retransmits(os.path.join(self.tmpdir.name, "missing")))
+
+    def test_count_time_wait_matches_remote_port(self):
+        """Test that only TIME_WAIT sockets toward the target port are counted."""
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+        self._write(
+            "tcp",
+            header
+            + "   0: 0100007F:D431 0100007F:1F90 06 00000000:00000000 03:00000F2D 00000000     0        0 0\n"
+            + "   1: 0100007F:D432 0100007F:1F90 01 00000000:00000000 00:00000000 00000000     0        0 1\n"
+            + "   2: 0100007F:D433 0100007F:0050 06 00000000:00000000 03:00000F2D 00000000     0        0 0\n",
+        )
+        self._write("tcp6", header + "   0: 00000000000000000000000001000000:D434 00000000000000000000000001000000:1F90 06 0 0 0 0 0 0\n")
+        self.assertEqual(count_time_wait(8080, self.tmpdir.name), 2)
+        self.assertEqual(count_time_wait(80, self.tmpdir.name), 1)
+        self.assertIsNone(count_time_wait(8080, os.path.join(self.tmpdir.name, "missing")))
+
+    @unittest.skipUnless(hasattr(socket, "TCP_INFO"), "TCP_INFO is Linux-only")
+    def test_read_tcp_info(self):
+        """Test that acknowledged and received bytes are read per socket."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        client = socket.create_connection(listener.getsockname())
+        server, _ = listener.accept()
+        try:
+            client.sendall(b"x" * 5000)
+            received = 0
+            while received < 5000:
+                received += len(server.recv(8192))
+            bytes_acked, _, total_retrans = read_tcp_info(client.fileno(), socket.AF_INET)
+            _, bytes_received, _ = read_tcp_info(server.fileno(), socket.AF_INET)
+            self.assertGreaterEqual(bytes_acked, 5000)
+            self.assertEqual(bytes_received, 5000)
+            self.assertEqual(total_retrans, 0)
+        finally:
+            client.close()
+            server.close()
+            listener.close()
+
+    def test_monitor_reports_process_bytes_and_sockets(self):
+        """Test that bytes exchanged by this process and its established sockets are reported."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        monitor = ProcessNetworkMonitor(psutil.Process())
+        monitor.start(remote_port=listener.getsockname()[1])
+        client = socket.create_connection(listener.getsockname())
+        server, _ = listener.accept()
+        try:
+            client.sendall(b"x" * 1024)
+            received = 0
+            while received < 1024:
+                received += len(server.recv(4096))
+            monitor.sample_sockets()
+        finally:
+            client.close()
+            server.close()
+            listener.close()
+        delta = monitor.delta()
+
+        # The listener and both ends of the connection are owned by this process
+        self.assertGreaterEqual(delta["open_sockets_max"], 3)
+        self.assertGreaterEqual(delta["connections_max"].get(psutil.CONN_ESTABLISHED, 0), 2)
+        self.assertIn("time_wait_max", delta)
+        self.assertIn("host_tcp_retransmits", delta)
+        if hasattr(socket, "TCP_INFO"):
+            # The payload is counted once as sent by the client and once as received by the server
+            self.assertGreaterEqual(delta["bytes_sent"], 1024)
+            self.assertGreaterEqual(delta["bytes_recv"], 1024)
+            self.assertEqual(delta["tcp_retransmits"], 0)
+            self.assertGreaterEqual(delta["tcp_sockets_seen"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
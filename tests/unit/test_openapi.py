@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from http_benchmark.openapi import compile_scenario, generate_scenario, load_spec, parse_weights, synthesize
+from http_benchmark.scenario import load_scenario
+
+SPEC_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "api.spec.json")
+
+OPENAPI_SPEC = {
+    "openapi": "3.0.0",
+    "servers": [{"url": "https://api.example/v2"}],
+    "components": {
+        "schemas": {
+            "Named": {"type": "object", "required": ["name"], "properties": {"name": {"type": "string", "minLength": 6}, "nickname": {"type": "string"}}},
+            "Pet": {"allOf": [{"$ref": "#/components/schemas/Named"}, {"required": ["tags"], "properties": {"tags": {"type": "array", "items": {"type": "string"}}}}]},
+        }
+    },
+    "paths": {
+        "/pets/{petId}": {
+            "parameters": [{"name": "petId", "in": "path", "required": True, "schema": {"type": "integer", "minimum": 10}}],
+            "get": {
+                "operationId": "getPet",
+                "parameters": [
+                    {"name": "fields", "in": "query", "required": True, "schema": {"type": "string", "enum": ["all", "short"]}},
+                    {"name": "verbose", "in": "query", "schema": {"type": "boolean"}},
+                    {"name": "X-Request-Id", "in": "header", "required": True, "schema": {"type": "string", "format": "uuid"}},
+                ],
+            },
+            "put": {"x-benchmark-weight": 3, "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}}},
+            "delete": {"x-benchmark-weight": 0},
+        }
+    },
+}
+
+
+class TestOpenAPI(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_generate_openapi3(self):
+        """Test parameters, $ref/allOf bodies and weights of an OpenAPI 3 spec."""
+        lines = {line["name"]: line for line in generate_scenario(OPENAPI_SPEC)}
+
+        self.assertEqual(set(lines), {"getPet", "PUT /pets/{petId}"})
+        self.assertEqual(lines["getPet"]["url"], "v2/pets/10?fields=all")
+        self.assertEqual(lines["getPet"]["headers"], {"X-Request-Id": "00000000-0000-4000-8000-000000000000"})
+        self.assertEqual(lines["PUT /pets/{petId}"]["weight"], 3.0)
+        self.assertEqual(lines["PUT /pets/{petId}"]["body"], {"name": "namexx", "tags": ["tags"]})
+
+        lines = generate_scenario(OPENAPI_SPEC, exclude=["PUT *"], weights={"get*": 5})
+        self.assertEqual([(line["name"], line["weight"]) for line in lines], [("getPet", 5.0)])
+        with self.assertRaises(ValueError):
+            generate_scenario(OPENAPI_SPEC, exclude=["/pets/*"])
+
+    def test_generate_swagger_spec(self):
+        """Test that every operation of the bundled httpbin Swagger spec becomes a loadable scenario request."""
+        spec = load_spec(SPEC_PATH)
+        lines = generate_scenario(spec, exclude=["/delay/*"])
+        names = [line["name"] for line in lines]
+
+        self.assertIn("GET /get", names)
+        self.assertNotIn("GET /delay/{delay}", names)
+        by_name = dict(zip(names, lines))
+        self.assertEqual(by_name["GET /bytes/{n}"]["url"], "bytes/1")
+        self.assertEqual(by_name["GET /anything/{anything}"]["url"], "anything/anything")
+        self.assertEqual(by_name["GET /redirect-to"]["url"], "redirect-to?url=url")
+        self.assertEqual(by_name["POST /redirect-to"]["body"], "url=url")
+
+        path = os.path.join(self.directory, "httpbin.jsonl")
+        with open(path, "w") as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+        requests = load_scenario(path, "http://localhost:8080/")
+        self.assertEqual(len(requests), len(lines))
+        self.assertTrue(all(request.url.startswith("http://localhost:8080/") for request in requests))
+
+    def test_compile_scenario_cache(self):
+        """Test that a compiled scenario is reused until the spec or the options change."""
+        spec_path = os.path.join(self.directory, "pets.json")
+        with open(spec_path, "w") as f:
+            json.dump(OPENAPI_SPEC, f)
+        cache = os.path.join(self.directory, "cache")
+
+        path = compile_scenario(spec_path, cache_dir=cache)
+        os.utime(path, (0, 0))
+        self.assertEqual(compile_scenario(spec_path, cache_dir=cache), path)
+        self.assertEqual(os.stat(path).st_mtime, 0)
+        self.assertNotEqual(compile_scenario(spec_path, weights={"getPet": 2}, cache_dir=cache), path)
+        self.assertEqual(len(os.listdir(cache)), 2)
+
+    def test_synthesize_and_weights(self):
+        """Test values synthesized for scalar schemas and parsing of PATTERN=WEIGHT options."""
+        self.assertEqual(synthesize({}, {"type": "integer", "minimum": 0, "maximum": 0}), 0)
+        self.assertEqual(synthesize({}, {"type": "number"}), 1.0)
+        self.assertEqual(synthesize({}, {"type": "string", "format": "date"}), "2024-01-01")
+        self.assertEqual(synthesize({}, {"type": "string", "example": "abc"}, "name"), "abc")
+        self.assertEqual(synthesize({}, {"oneOf": [{"type": "boolean"}, {"type": "string"}]}), True)
+
+        self.assertEqual(parse_weights(["GET /get=10", "/status/*=0"]), {"GET /get": 10.0, "/status/*": 0.0})
+        with self.assertRaises(ValueError):
+            parse_weights(["/get"])
+
+
+if __name__ == "__main__":
+    unittest.main()
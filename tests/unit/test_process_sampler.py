@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from http_benchmark.utils.process_sampler import ProcessSampler, is_supported, read_proc_cpu_seconds, read_proc_io, read_proc_rss
+from http_benchmark.utils.resource_monitor import ResourceMonitor
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@unittest.skipUnless(is_supported(), "The out-of-process sampler reads /proc")
+class TestProcessSampler(unittest.TestCase):
+    def test_proc_readers(self):
+        """Test reading CPU time, RSS and I/O counters of this process from /proc."""
+        before = read_proc_cpu_seconds(os.getpid())
+        _spin(0.1)
+        self.assertGreater(read_proc_cpu_seconds(os.getpid()), before)
+        self.assertGreater(read_proc_rss(os.getpid()), 0)
+        self.assertIn("rchar", read_proc_io(os.getpid()))
+
+    def test_samples_streamed_back_on_stop(self):
+        """Test that the sampler process samples this process and returns the series and its overhead."""
+        sampler = ProcessSampler(os.getpid(), 0.01)
+        sampler.start()
+        _spin(0.3)
+        output = sampler.stop()
+
+        samples = list(output["samples"])
+        self.assertEqual(len(samples), output["sample_count"])
+        self.assertGreaterEqual(len(samples), 10)
+        self.assertEqual(set(samples[0]), {"timestamp", "cpu_percent", "memory_percent", "memory_rss_mb"})
+        # This process was spinning on a core, so the sampled CPU usage is high
+        self.assertGreater(max(sample["cpu_percent"] for sample in samples), 50)
+        self.assertGreater(samples[-1]["memory_rss_mb"], 0)
+        self.assertNotEqual(output["overhead"]["sampler_pid"], os.getpid())
+        self.assertIn("sampler_cpu_percent", output["overhead"])
+        self.assertEqual(len(output["target_samples"]), 0)
+
+    def test_sampler_monitors_target(self):
+        """Test that the sampler process also samples a target process."""
+        idle = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            sampler = ProcessSampler(os.getpid(), 0.02, target_spec={"pids": [idle.pid]})
+            sampler.start()
+            time.sleep(0.2)
+            output = sampler.stop()
+        finally:
+            idle.kill()
+            idle.wait()
+
+        self.assertGreater(len(output["target_samples"]), 0)
+        self.assertEqual(output["target_summary"]["processes"][0]["pid"], idle.pid)
+
+    def test_resource_monitor_process_mode(self):
+        """Test that the resource monitor hands over samples and overhead from the sampler process."""
+        monitor = ResourceMonitor()
+        monitor.start_monitoring(interval=0.01, mode="process")
+        time.sleep(0.3)
+        metrics = monitor.stop_monitoring()
+        samples = monitor.take_samples()
+        stats = monitor.get_monitor_stats()
+
+        self.assertGreaterEqual(metrics["sample_count"], 10)
+        self.assertEqual(len(samples), metrics["sample_count"])
+        self.assertAlmostEqual(metrics["memory_mb_avg"], sum(s["memory_rss_mb"] for s in samples) / len(samples))
+        self.assertEqual(stats["mode"], "process")
+        self.assertEqual(stats["sample_count"], metrics["sample_count"])
+        self.assertIn("process_io", stats)
+
+    def test_unknown_mode_rejected(self):
+        """Test that an unknown monitor mode is refused."""
+        with self.assertRaises(ValueError):
+            ResourceMonitor().start_monitoring(mode="shared-memory")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from http_benchmark.benchmark import BenchmarkRunner
+from http_benchmark.models.benchmark_configuration import BenchmarkConfiguration
+from http_benchmark.utils.profiler import SamplingProfiler
+
+
+def _busy_work(stop_event):
+    while not stop_event.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_samples_busy_thread(self):
+        """Test that a busy thread shows up in the collapsed stacks."""
+        stop_event = threading.Event()
+        worker = threading.Thread(target=_busy_work, args=(stop_event,), name="busy-worker")
+        profiler = SamplingProfiler(interval=0.002)
+
+        worker.start()
+        profiler.start()
+        time.sleep(0.2)
+        profiler.stop()
+        stop_event.set()
+        worker.join()
+
+        self.assertGreater(profiler.sample_count, 0)
+        stacks = profiler.get_collapsed_stacks()
+        busy_stacks = [stack for stack in stacks if "_busy_work" in stack]
+        self.assertTrue(busy_stacks)
+        # Stacks are root-first and prefixed with the thread name
+        self.assertTrue(all(stack.startswith("busy-worker;") for stack in busy_stacks))
+
+    def test_idle_threads_are_skipped_by_default(self):
+        """Test that threads parked in Event.wait are not sampled unless requested."""
+        stop_event = threading.Event()
+        idle = threading.Thread(target=stop_event.wait, name="idle-worker")
+        idle.start()
+        try:
+            profiler = SamplingProfiler(interval=0.002)
+            profiler.start()
+            time.sleep(0.05)
+            profiler.stop()
+            self.assertFalse([stack for stack in profiler.get_collapsed_stacks() if stack.startswith("idle-worker;")])
+
+            profiler = SamplingProfiler(interval=0.002, include_idle=True)
+            profiler.start()
+            time.sleep(0.05)
+            profiler.stop()
+            self.assertTrue([stack for stack in profiler.get_collapsed_stacks() if stack.startswith("idle-worker;")])
+        finally:
+            stop_event.set()
+            idle.join()
+
+    def test_write_collapsed(self):
+        """Test writing folded-format output."""
+        profiler = SamplingProfiler(interval=0.002, include_idle=True)
+        profiler.start()
+        time.sleep(0.05)
+        profiler.stop()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = profiler.write_collapsed(os.path.join(temp_dir, "nested", "run.folded"))
+            with open(path, encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack)
+            self.assertGreater(int(count), 0)
+
+    def test_profile_writing_is_not_charged_to_requests(self):
+        """Test that the run's CPU time is read before the adapter closes and the profile is written."""
+        events = []
+        readings = iter(range(100))
+
+        def cpu_times():
+            events.append("cpu")
+            value = float(next(readings))
+            return {"user": value, "system": value}
+
+        adapter = MagicMock()
+        adapter.__enter__.return_value = adapter
+        adapter.__exit__.side_effect = lambda *args: events.append("adapter closed")
+        adapter.make_request.return_value = {"success": True, "response_time": 0.001}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = BenchmarkConfiguration(target_url="http://localhost/", duration_seconds=0.05, profile=True, profile_dir=temp_dir)
+            runner = BenchmarkRunner(config)
+            runner.adapter_classes = {"requests": MagicMock(return_value=adapter)}
+            with (
+                patch("http_benchmark.benchmark.resource_monitor.get_cpu_times", side_effect=cpu_times),
+                patch.object(SamplingProfiler, "write_collapsed", side_effect=lambda path: events.append("profile written") or path),
+            ):
+                result = runner.run()
+
+        self.assertEqual(events[-2:], ["adapter closed", "profile written"])
+        # One reading when monitoring starts, one after warm-up and one at the end of the measured phase
+        self.assertEqual(events.count("cpu"), 3)
+        self.assertEqual(result.cpu_time_user, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
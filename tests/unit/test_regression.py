@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from http_benchmark.regression import check_regression, format_report
+from http_benchmark.utils.histogram import LatencyHistogram
+from http_benchmark.utils.stats import mann_whitney_histograms, t_sf, tail_exceedance_test, welch_t_test
+
+from factories import make_result
+
+
+class TestStats(unittest.TestCase):
+    def test_t_distribution_tail(self):
+        """Test Student's t tail probabilities against table values."""
+        self.assertAlmostEqual(t_sf(2.0, 5), 0.0510, places=4)
+        self.assertAlmostEqual(t_sf(1.812, 10), 0.05, places=3)
+        self.assertAlmostEqual(t_sf(-1.0, 10), 0.8296, places=4)
+
+    def test_welch_t_test_is_one_sided(self):
+        """Test that only a drop of the candidate's mean is significant and too few runs give no p-value."""
+        self.assertLess(welch_t_test([100, 102, 98, 101], [90, 91, 89])["p_value"], 0.001)
+        self.assertGreater(welch_t_test([90, 91, 89], [100, 102, 98, 101])["p_value"], 0.99)
+        self.assertIsNone(welch_t_test([100], [90, 91])["p_value"])
+
+    def test_histogram_tests(self):
+        """Test that a shifted distribution and a heavier tail are detected from bucket counts alone."""
+        rng = random.Random(1)
+        baseline = LatencyHistogram.from_values(rng.lognormvariate(-5, 0.3) for _ in range(5000))
+        same = LatencyHistogram.from_values(rng.lognormvariate(-5, 0.3) for _ in range(5000))
+        slower = LatencyHistogram.from_values(rng.lognormvariate(-4.9, 0.3) for _ in range(5000))
+        heavy_tail = LatencyHistogram.from_values([rng.lognormvariate(-5, 0.3) for _ in range(4900)] + [0.1] * 100)
+
+        self.assertGreater(mann_whitney_histograms(baseline, same)["p_value"], 0.01)
+        shifted = mann_whitney_histograms(baseline, slower)
+        self.assertLess(shifted["p_value"], 1e-6)
+        self.assertGreater(shifted["effect"], 0.5)
+        self.assertGreater(tail_exceedance_test(baseline, same)["p_value"], 0.01)
+        self.assertLess(tail_exceedance_test(baseline, heavy_tail)["p_value"], 1e-6)
+
+
+class TestRegressionCheck(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        self.latencies = lambda shift: [rng.lognormvariate(-5 + shift, 0.2) for _ in range(2000)]
+        self.baseline = [make_result(requests_per_second=rps, latencies=self.latencies(0)) for rps in (1000, 1010, 990)]
+
+    def test_unchanged_candidate_passes(self):
+        """Test that a candidate from the same distribution passes every check."""
+        report = check_regression(self.baseline, [make_result(requests_per_second=rps, latencies=self.latencies(0)) for rps in (1005, 995, 1002)])
+        self.assertFalse(report["regression"])
+        self.assertEqual([check["metric"] for check in report["checks"]], ["requests_per_second", "p99_response_time", "p50_response_time"])
+        self.assertIn("no significant regression", format_report(report, "v1"))
+
+    def test_slower_candidate_fails(self):
+        """Test that lower throughput and slower latencies are flagged with their relative change."""
+        report = check_regression(self.baseline, [make_result(requests_per_second=rps, latencies=self.latencies(0.2)) for rps in (900, 905, 895)])
+        self.assertTrue(report["regression"])
+        self.assertTrue(all(check["regression"] for check in report["checks"]))
+        self.assertAlmostEqual(report["checks"][0]["change"], -0.1, places=2)
+        self.assertIn("REGRESSED", format_report(report, "v1"))
+
+    def test_small_significant_change_within_tolerance_passes(self):
+        """Test that a significant but small change does not fail the gate."""
+        report = check_regression(self.baseline, [make_result(requests_per_second=rps, latencies=self.latencies(0.02)) for rps in (960, 961, 959)], tolerance=0.05)
+        self.assertFalse(report["regression"])
+        throughput = report["checks"][0]
+        self.assertLess(throughput["p_value"], 0.05)
+        self.assertFalse(throughput["regression"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from http_benchmark.benchmark import BenchmarkRunner
+from http_benchmark.models.benchmark_configuration import BenchmarkConfiguration
+from http_benchmark.replay import ReplayRecord, ReplayStats, endpoint_name, iter_access_log, iter_har, iter_records
+from http_benchmark.scenario import PreparedRequest
+
+# Lines in the `benchmark` log_format: they are written when requests end, so /slow (started first) comes last
+ACCESS_LOG = """\
+10.0.0.1 - - [14/Nov/2023:22:13:20 +0000] "GET /users/42?full=1 HTTP/1.1" 200 12 "-" "curl/8.0" 0.010 1700000000.010
+not a log line
+10.0.0.2 - alice [14/Nov/2023:22:13:20 +0000] "POST /users HTTP/1.1" 201 3 "https://app/" "Mozilla/5.0 (X11)" 0.020 1700000000.520
+10.0.0.1 - - [14/Nov/2023:22:13:21 +0000] "GET /slow HTTP/1.1" 504 0 "-" "curl/8.0" 1.500 1700000001.000
+"""
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _write(self, name, text):
+        path = os.path.join(self.directory, name)
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(path, "wt") as f:
+            f.write(text)
+        return path
+
+    def test_iter_access_log(self):
+        """Test that log lines are streamed in start order with recorded timings, from plain or gzipped logs."""
+        path = self._write("access.log.gz", ACCESS_LOG)
+        records = list(iter_records(path, "http://target:8080/"))
+
+        self.assertEqual([record.request.name for record in records], ["GET /slow", "GET /users/{id}", "POST /users"])
+        self.assertEqual([round(record.offset, 3) for record in records], [0.0, 0.5, 1.0])
+        self.assertEqual(records[1].request.url, "http://target:8080/users/42?full=1")
+        self.assertEqual((records[0].recorded_time, records[0].recorded_status), (1.5, 504))
+
+        # The default combined format has second resolution and no request time
+        combined = "\n".join(line.rsplit(" ", 2)[0] for line in ACCESS_LOG.splitlines())
+        records = list(iter_access_log(self._write("combined.log", combined), "http://target/"))
+        self.assertEqual([(record.request.name, record.offset, record.recorded_time) for record in records][0], ("GET /users/{id}", 0.0, None))
+        self.assertEqual(records[-1].offset, 1.0)
+
+    def test_iter_har(self):
+        """Test that HAR entries are retargeted, sorted by start, and keep their bodies and request headers."""
+        entries = [
+            {
+                "startedDateTime": started,
+                "time": time_ms,
+                "request": {
+                    "method": "post",
+                    "url": f"https://prod.example/api/{item}",
+                    "headers": [{"name": "Host", "value": "prod.example"}, {"name": ":authority", "value": "prod"}, {"name": "X-Trace", "value": "1"}],
+                    "postData": {"text": '{"a": 1}'},
+                },
+                "response": {"status": 201},
+            }
+            for started, time_ms, item in [("2024-01-01T00:00:01.250Z", 12.5, "b"), ("2024-01-01T00:00:01.000Z", 8, "0123456789abcdef0123")]
+        ]
+        path = self._write("capture.har", json.dumps({"log": {"entries": entries}}))
+        records = list(iter_har(path, "http://localhost:8080"))
+
+        self.assertEqual([record.request.name for record in records], ["POST /api/{id}", "POST /api/b"])
+        self.assertEqual([record.offset for record in records], [0.0, 0.25])
+        self.assertEqual(records[1].request.url, "http://localhost:8080/api/b")
+        self.assertEqual(records[1].request.headers, {"X-Trace": "1"})
+        self.assertEqual((records[1].request.body, records[1].recorded_time, records[1].recorded_status), ('{"a": 1}', 0.0125, 201))
+        self.assertEqual(endpoint_name("GET", "/orders/7/items/3f2504e0-4f89-11d3-9a0c-0305e82c3301?x=1"), "GET /orders/{id}/items/{id}")
+
+    def test_replay_stats(self):
+        """Test latency ratios against the recording, status mismatches, errors and the endpoint cap."""
+        stats = ReplayStats("access.log", speedup=2.0)
+
+        def record(name, recorded_time, status=200):
+            return ReplayRecord(0.0, PreparedRequest(name, "GET", "http://t/", {}, "", 1.0), recorded_time, status)
+
+        stats.record(record("GET /a", 0.010), {"success": True, "response_time": 0.020, "status_code": 200}, lag=0.001)
+        stats.record(record("GET /a", 0.010), {"success": True, "response_time": 0.005, "status_code": 500}, lag=-0.001)
+        stats.record(record("GET /b", None), {"success": False, "response_time": 0, "error": "refused"}, lag=0.003)
+        summary = stats.summary()
+
+        self.assertEqual((summary["requests"], summary["errors"], summary["status_mismatches"], summary["compared"]), (3, 1, 1, 2))
+        self.assertEqual(summary["slower_share"], 0.5)
+        self.assertAlmostEqual(summary["latency_ratio"]["p50"], 0.5, places=2)
+        self.assertAlmostEqual(summary["schedule_lag"]["max"], 0.003)
+        endpoints = stats.endpoint_summary()
+        self.assertAlmostEqual(endpoints["GET /a"]["recorded_p50_response_time"], 0.010, places=3)
+        self.assertEqual((endpoints["GET /b"]["errors"], endpoints["GET /b"]["error_rate"]), (1, 100.0))
+
+        with patch("http_benchmark.replay.MAX_ENDPOINTS", 2):
+            stats.record(record("GET /c", 0.01), {"success": True, "response_time": 0.01, "status_code": 200}, lag=0.0)
+        self.assertEqual(set(stats.endpoint_summary()), {"GET /a", "GET /b", "other"})
+
+    def test_runner_replays_at_recorded_pace(self):
+        """Test that a sync replay sends every captured request no earlier than its offset divided by the speedup."""
+        path = self._write("access.log", ACCESS_LOG)
+        sent = []
+        adapter = MagicMock()
+        adapter.__enter__.return_value = adapter
+
+        def make_request(request):
+            sent.append((request.name, time.perf_counter()))
+            return {"success": True, "response_time": 0.001, "status_code": 200}
+
+        adapter.make_request.side_effect = make_request
+        config = BenchmarkConfiguration(target_url="http://target/", duration_seconds=5, concurrency=2, replay_path=path, replay_speedup=4.0)
+        runner = BenchmarkRunner(config)
+        runner.adapter_classes = {"requests": MagicMock(return_value=adapter)}
+        result = runner.run()
+
+        self.assertEqual([name for name, _ in sent], ["GET /slow", "GET /users/{id}", "POST /users"])
+        self.assertGreaterEqual(sent[2][1] - sent[0][1], 0.25 - 0.01)
+        self.assertEqual(result.http_method, "REPLAY")
+        self.assertEqual(result.requests_count, 3)
+        self.assertEqual((result.replay_stats["requests"], result.replay_stats["status_mismatches"], result.replay_stats["truncated"]), (3, 2, False))
+        self.assertEqual(result.endpoint_stats["GET /slow"]["requests"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,13 @@ class TestResourceMonitor(unittest.TestCase):
         # CPU usage can be 0 or higher
         self.assertGreaterEqual(cpu_percent, 0)
 
+    def test_get_cpu_times(self):
+        """Test cumulative process CPU time reporting."""
+        cpu_times = resource_monitor.get_cpu_times()
+        self.assertIn("user", cpu_times)
+        self.assertIn("system", cpu_times)
+        self.assertGreater(cpu_times["user"] + cpu_times["system"], 0)
+
     def test_get_memory_info(self):
         """Test memory information monitoring."""
         memory_info = resource_monitor.get_memory_info()
@@ -102,6 +109,9 @@ class TestResourceMonitorContinuous(unittest.TestCase):
         self.assertIn("bytes_recv", delta)
         self.assertIn("packets_sent", delta)
         self.assertIn("packets_recv", delta)
+        self.assertIn("open_sockets_max", delta)
+        self.assertIn("connections_max", delta)
+        self.assertIn("tcp_retransmits", delta)
         # Delta values should be small (not cumulative system totals)
         # During the test, we shouldn't have sent/received TB of data
         self.assertLess(delta["bytes_sent"], 1024 * 1024 * 100)  # < 100MB
@@ -130,6 +140,49 @@ class TestResourceMonitorContinuous(unittest.TestCase):
         self.assertGreaterEqual(metrics["cpu_max"], metrics["cpu_avg"])
         self.assertGreaterEqual(metrics["memory_max"], metrics["memory_avg"])
 
+    def test_configurable_interval(self):
+        """Test that a 10ms interval collects many more samples than the 200ms default."""
+        monitor = ResourceMonitor()
+        monitor.start_monitoring(interval=0.01)
+        time.sleep(0.3)
+        metrics = monitor.stop_monitoring()
+        self.assertGreaterEqual(metrics["sample_count"], 10)
+
+    def test_thread_mode_reports_overhead(self):
+        """Test that the monitor thread reports the CPU time its own sampling cost."""
+        monitor = ResourceMonitor()
+        monitor.start_monitoring(interval=0.01)
+        time.sleep(0.2)
+        monitor.stop_monitoring()
+        stats = monitor.get_monitor_stats()
+        self.assertEqual(stats["mode"], "thread")
+        self.assertGreater(stats["sampler_cpu_seconds"], 0)
+        self.assertGreater(stats["sample_duration_avg_us"], 0)
+
+    def test_interval_below_minimum_rejected(self):
+        """Test that sampling faster than 10ms is refused."""
+        monitor = ResourceMonitor()
+        with self.assertRaises(ValueError):
+            monitor.start_monitoring(interval=0.001)
+
+    def test_take_samples_returns_full_series(self):
+        """Test that the full sample series is handed over and aggregates cover every sample."""
+        monitor = ResourceMonitor(buffer_capacity=4)
+        monitor.start_monitoring(interval=0.01)
+        time.sleep(0.2)
+        metrics = monitor.stop_monitoring()
+        samples = monitor.take_samples()
+
+        self.assertEqual(len(samples), metrics["sample_count"])
+        series = list(samples)
+        self.assertEqual(set(series[0]), {"timestamp", "cpu_percent", "memory_percent", "memory_rss_mb"})
+        timestamps = [sample["timestamp"] for sample in series]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertAlmostEqual(metrics["memory_mb_avg"], sum(s["memory_rss_mb"] for s in series) / len(series))
+        samples.close()
+        # The monitor starts over with an empty buffer
+        self.assertEqual(len(monitor.take_samples()), 0)
+
     def test_stop_without_start_returns_empty_metrics(self):
         """Test that stopping monitoring without starting returns empty metrics."""
         monitor = ResourceMonitor()
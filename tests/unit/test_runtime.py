@@ -0,0 +1,39 @@
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from http_benchmark.utils import runtime
+
+
+class TestRuntimeInfo(unittest.TestCase):
+    def test_runtime_info_keys(self):
+        """Test that runtime information describes the interpreter and GIL state."""
+        info = runtime.get_runtime_info()
+        self.assertEqual(info["python_version"].split(".")[:2], [str(sys.version_info.major), str(sys.version_info.minor)])
+        self.assertIsInstance(info["free_threaded_build"], bool)
+        self.assertIsInstance(info["gil_enabled"], bool)
+
+    def test_host_and_environment_metadata(self):
+        """Test that runs are tagged with the host, the checked-out commit and a stable environment fingerprint."""
+        info = runtime.get_runtime_info()
+        self.assertTrue(info["host"])
+        self.assertEqual(len(info["environment_fingerprint"]), 16)
+        self.assertEqual(info["environment_fingerprint"], runtime.get_runtime_info()["environment_fingerprint"])
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsNone(runtime.get_git_sha(directory))
+
+    def test_free_threaded_build_detection(self):
+        """Test that Py_GIL_DISABLED marks a free-threaded build."""
+        with patch("http_benchmark.utils.runtime.sysconfig.get_config_var", return_value=1):
+            self.assertTrue(runtime.is_free_threaded_build())
+        with patch("http_benchmark.utils.runtime.sysconfig.get_config_var", return_value=None):
+            self.assertFalse(runtime.is_free_threaded_build())
+
+    def test_gil_enabled_without_runtime_check(self):
+        """Test that interpreters without sys._is_gil_enabled are reported as GIL builds."""
+        with patch.object(runtime, "sys", spec=[]):
+            self.assertTrue(runtime.is_gil_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import unittest
+from http_benchmark.utils.sample_buffer import SampleBuffer
+
+
+class TestSampleBuffer(unittest.TestCase):
+    def test_append_and_iterate(self):
+        """Test that samples come back as dicts in insertion order."""
+        buffer = SampleBuffer(("timestamp", "value"), capacity=8)
+        for i in range(5):
+            buffer.append((float(i), i * 10.0))
+
+        samples = list(buffer)
+        self.assertEqual(len(buffer), 5)
+        self.assertEqual(samples[0], {"timestamp": 0.0, "value": 0.0})
+        self.assertEqual([s["value"] for s in samples], [0.0, 10.0, 20.0, 30.0, 40.0])
+
+    def test_spill_to_disk_keeps_every_sample(self):
+        """Test that a full buffer spills to disk and iteration reads spilled samples back."""
+        buffer = SampleBuffer(("timestamp", "value"), capacity=4)
+        for i in range(11):
+            buffer.append((float(i), float(i)))
+
+        self.assertEqual(len(buffer), 11)
+        self.assertEqual(buffer.dropped, 0)
+        self.assertEqual([s["timestamp"] for s in buffer], [float(i) for i in range(11)])
+        # Iteration is repeatable
+        self.assertEqual(len(list(buffer)), 11)
+
+        spill_path = buffer._spill_path
+        self.assertTrue(os.path.exists(spill_path))
+        buffer.close()
+        self.assertFalse(os.path.exists(spill_path))
+
+    def test_ring_mode_overwrites_oldest(self):
+        """Test that without spilling only the newest `capacity` samples are kept."""
+        buffer = SampleBuffer(("timestamp",), capacity=3, spill=False)
+        for i in range(7):
+            buffer.append((float(i),))
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.dropped, 4)
+        self.assertEqual([s["timestamp"] for s in buffer], [4.0, 5.0, 6.0])
+
+    def test_invalid_capacity(self):
+        """Test that a zero-capacity buffer is rejected."""
+        with self.assertRaises(ValueError):
+            SampleBuffer(("timestamp",), capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
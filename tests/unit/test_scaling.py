@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch
+from http_benchmark.models.benchmark_configuration import BenchmarkConfiguration
+from http_benchmark.scaling import gil_contention_estimate, run_thread_scaling_sweep, sweep_thread_counts
+
+from factories import make_result
+
+
+class TestThreadScaling(unittest.TestCase):
+    def test_sweep_thread_counts(self):
+        """Test that thread counts double up to the maximum."""
+        self.assertEqual(sweep_thread_counts(1), [1])
+        self.assertEqual(sweep_thread_counts(8), [1, 2, 4, 8])
+        self.assertEqual(sweep_thread_counts(6), [1, 2, 4, 6])
+        with self.assertRaises(ValueError):
+            sweep_thread_counts(0)
+
+    @patch("http_benchmark.scaling.BenchmarkRunner")
+    def test_scaling_efficiency(self, mock_runner_class):
+        """Test speedup and efficiency relative to the smallest thread count."""
+        rps_by_threads = {1: 100.0, 2: 200.0, 4: 300.0}
+        mock_runner_class.side_effect = lambda config: type(
+            "Runner", (), {"run": lambda self: make_result(requests_per_second=rps_by_threads[config.concurrency], threading_stats={"worker_cpu_utilization": 0.1 * config.concurrency})}
+        )()
+
+        config = BenchmarkConfiguration(target_url="https://example.com", concurrency=10)
+        points = run_thread_scaling_sweep(config, [1, 2, 4])
+
+        self.assertEqual([point["threads"] for point in points], [1, 2, 4])
+        self.assertAlmostEqual(points[1]["speedup"], 2.0)
+        self.assertAlmostEqual(points[1]["efficiency"], 1.0)
+        self.assertAlmostEqual(points[2]["speedup"], 3.0)
+        self.assertAlmostEqual(points[2]["efficiency"], 0.75)
+        self.assertAlmostEqual(points[2]["worker_cpu_utilization"], 0.4)
+
+    def test_gil_contention_estimate(self):
+        """Test that wall time beyond CPU and the single-thread I/O time counts as waiting for the GIL."""
+        # 10ms per request with one thread, 2ms of it on CPU: 8ms of I/O
+        baseline = make_result(avg_response_time=0.010, adapter_cpu_us_per_request=2000.0, threading_stats={"gil_enabled": True})
+        contended = make_result(avg_response_time=0.016, adapter_cpu_us_per_request=2000.0, threading_stats={"gil_enabled": True})
+        self.assertAlmostEqual(gil_contention_estimate(contended, baseline), 0.375)
+        self.assertEqual(gil_contention_estimate(baseline, baseline), 0.0)
+        free_threaded = make_result(avg_response_time=0.016, adapter_cpu_us_per_request=2000.0, threading_stats={"gil_enabled": False})
+        self.assertIsNone(gil_contention_estimate(free_threaded, baseline))
+
+    def test_async_configuration_rejected(self):
+        """Test that sweeps are limited to the thread pool path."""
+        config = BenchmarkConfiguration(target_url="https://example.com", is_async=True)
+        with self.assertRaises(ValueError):
+            run_thread_scaling_sweep(config, [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import collections
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from http_benchmark.benchmark import BenchmarkRunner
+from http_benchmark.models.benchmark_configuration import BenchmarkConfiguration
+from http_benchmark.scenario import EndpointStats, labelled, load_scenario, method_label, request_picker
+
+SCENARIO_LINES = [
+    {"name": "list users", "url": "/users", "weight": 8},
+    {"method": "post", "url": "/users", "body": {"name": "x"}, "weight": 2},
+    "# health checks are rare",
+    "",
+    {"url": "https://other.example/health", "headers": {"Accept": "text/plain"}},
+]
+
+
+class TestScenario(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".jsonl")
+        with os.fdopen(handle, "w") as f:
+            for line in SCENARIO_LINES:
+                f.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+        self.addCleanup(os.remove, self.path)
+
+    def test_load_scenario(self):
+        """Test that lines are parsed once into resolved, serialized requests with endpoint names."""
+        requests = load_scenario(self.path, "http://api.example/v1/", timeout=5)
+
+        self.assertEqual([request.name for request in requests], ["list users", "POST /users", "GET /health"])
+        self.assertEqual(requests[0].url, "http://api.example/users")
+        self.assertEqual(requests[1].method, "POST")
+        self.assertEqual(requests[1].body, '{"name":"x"}')
+        self.assertEqual(requests[1].headers, {"Content-Type": "application/json"})
+        self.assertEqual(requests[2].url, "https://other.example/health")
+        self.assertEqual((requests[2].weight, requests[2].timeout), (1.0, 5))
+        self.assertEqual(method_label(requests), "MIXED")
+        with self.assertRaises(AttributeError):
+            requests[0].url = "http://elsewhere/"
+
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"url": "/x", "weight": 0}) + "\n")
+        with self.assertRaisesRegex(ValueError, r":6: Scenario weight must be positive"):
+            load_scenario(self.path, "http://api.example/")
+
+    def test_request_picker(self):
+        """Test weighted sampling against the weights, seeded reproducibility and sequential replay."""
+        requests = load_scenario(self.path, "http://api.example/")
+        pick = request_picker(requests, "weighted", seed=7)
+        counts = collections.Counter(pick().name for _ in range(11000))
+        self.assertAlmostEqual(counts["list users"] / 11000, 8 / 11, delta=0.02)
+        self.assertAlmostEqual(counts["GET /health"] / 11000, 1 / 11, delta=0.02)
+
+        first, second = request_picker(requests, seed=3), request_picker(requests, seed=3)
+        self.assertEqual([first().name for _ in range(20)], [second().name for _ in range(20)])
+
+        sequential = request_picker(requests, "sequential")
+        self.assertEqual([sequential().name for _ in range(4)], ["list users", "POST /users", "GET /health", "list users"])
+        with self.assertRaises(ValueError):
+            request_picker(requests, "random")
+
+    def test_endpoint_stats(self):
+        """Test per-endpoint shares, errors and latency percentiles, and labelling of async results."""
+        requests = load_scenario(self.path, "http://api.example/")
+        stats = EndpointStats(requests)
+        for _ in range(3):
+            stats.record({"endpoint": "list users", "success": True, "response_time": 0.010})
+        stats.record({"endpoint": "POST /users", "success": False, "response_time": 0.5})
+        stats.record({"endpoint": None, "success": True, "response_time": 0.001})
+
+        summary = stats.summary()
+        self.assertEqual(summary["list users"]["requests"], 3)
+        self.assertAlmostEqual(summary["list users"]["share"], 0.75)
+        self.assertAlmostEqual(summary["list users"]["expected_share"], 8 / 11)
+        self.assertAlmostEqual(summary["list users"]["p99_response_time"], 0.010, places=3)
+        self.assertEqual((summary["POST /users"]["errors"], summary["POST /users"]["error_rate"]), (1, 100.0))
+        self.assertEqual(summary["GET /health"]["requests"], 0)
+        self.assertAlmostEqual(EndpointStats(requests, "sequential").summary()["list users"]["expected_share"], 1 / 3)
+
+        async def request():
+            return {"success": True}
+
+        self.assertEqual(asyncio.run(labelled(request(), "list users")), {"success": True, "endpoint": "list users"})
+
+    def test_runner_replays_scenario(self):
+        """Test that a sync run sends the scenario's requests and reports them per endpoint."""
+        adapter = MagicMock()
+        adapter.__enter__.return_value = adapter
+
+        def make_request(request):
+            time.sleep(0.002)
+            return {"success": request.method == "GET", "response_time": 0.002, "error": "refused"}
+
+        adapter.make_request.side_effect = make_request
+        config = BenchmarkConfiguration(target_url="http://api.example/", duration_seconds=1, concurrency=2, scenario_path=self.path, scenario_mode="sequential")
+        runner = BenchmarkRunner(config)
+        runner.adapter_classes = {"requests": MagicMock(return_value=adapter)}
+
+        result = runner.run()
+
+        sent = collections.Counter(call.args[0].name for call in adapter.make_request.call_args_list)
+        self.assertEqual(set(sent), {"list users", "POST /users", "GET /health"})
+        self.assertEqual(result.http_method, "MIXED")
+        self.assertEqual(sum(stats["requests"] for stats in result.endpoint_stats.values()), result.requests_count)
+        self.assertEqual(result.endpoint_stats["POST /users"]["errors"], result.error_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from http_benchmark.soak import SoakRecorder, detect_leaks
+from http_benchmark.storage import ResultStorage
+from http_benchmark.utils.trend import mann_kendall, sens_slope
+
+
+class TestTrend(unittest.TestCase):
+    def test_mann_kendall_detects_monotonic_trends(self):
+        """Test that steadily rising and falling series are significant and a flat noisy one is not."""
+        rising = mann_kendall([10, 11, 11.5, 13, 14, 14.2, 16, 17])
+        self.assertEqual(rising["trend"], "increasing")
+        self.assertLess(rising["p_value"], 0.01)
+        self.assertEqual(mann_kendall([5, 4, 3, 2, 1, 0])["trend"], "decreasing")
+
+        flat = mann_kendall([10, 12, 9, 11, 10, 12, 9, 11])
+        self.assertEqual(flat["trend"], "none")
+        self.assertEqual(mann_kendall([1, 2, 3])["trend"], "none")  # Too short to test
+        self.assertEqual(mann_kendall([7, 7, 7, 7, 7])["p_value"], 1.0)
+
+    def test_sens_slope_ignores_outliers(self):
+        """Test that Sen's slope follows the bulk of the points rather than a single spike."""
+        self.assertEqual(sens_slope([0, 1, 2, 100, 4, 5]), 1.0)
+
+
+class TestSoak(unittest.TestCase):
+    def test_detect_leaks_needs_trend_and_growth(self):
+        """Test that a leak is flagged only for a significant trend that also grows past the threshold."""
+        analysis = detect_leaks(
+            {
+                "memory_rss_mb": [100 + 2 * window for window in range(10)],  # Grows 18MB
+                "open_fds": [20, 20, 20, 20, 20, 20, 20, 20, 20, 21],  # Rises but only by one
+                "connections": [10, 9, 11, 10, 10, 9, 11, 10, 10, 10],
+            }
+        )
+        self.assertTrue(analysis["leak_suspected"])
+        self.assertEqual(analysis["suspected_leaks"], ["memory_rss_mb"])
+        self.assertEqual(analysis["trends"]["memory_rss_mb"]["growth"], 18)
+
+    def test_recorder_closes_windows_and_keeps_run_totals(self):
+        """Test that windows are handed over as they close and the run statistics cover every window."""
+        windows = []
+        fds = iter(range(100, 200))
+        recorder = SoakRecorder("run-1", 0.02, lambda: {"memory_rss_mb": 50.0, "open_fds": next(fds), "connections": 4, "threads": 3}, windows.append)
+        recorder.start()
+        errors = 0
+        for window in range(5):
+            for _ in range(10):
+                recorder.record(0.010 + window * 0.001)
+            errors += 1
+            time.sleep(0.025)
+            recorder.tick(errors)
+        stats = recorder.finish(errors)
+
+        self.assertEqual(len(windows), 5)
+        self.assertEqual([window["window_index"] for window in windows], list(range(5)))
+        self.assertEqual(windows[0]["requests_count"], 11)
+        self.assertEqual(windows[0]["error_count"], 1)
+        self.assertEqual(windows[0]["histogram"]["count"], 10)
+        self.assertEqual(recorder.count, 50)
+        self.assertAlmostEqual(stats["min_response_time"], 0.010)
+        self.assertAlmostEqual(stats["max_response_time"], 0.014)
+
+        summary = recorder.summary()
+        self.assertEqual(summary["window_count"], 5)
+        self.assertEqual(summary["trends"]["open_fds"]["trend"], "increasing")
+        self.assertTrue(summary["leak_suspected"])
+
+    @patch("http_benchmark.soak.MAX_TREND_POINTS", 4)
+    def test_trend_series_stay_bounded(self):
+        """Test that past the cap neighbouring windows are averaged, keeping the series short and the trend intact."""
+        fds = iter(range(100, 200))
+        recorder = SoakRecorder("run-3", 0.005, lambda: {"memory_rss_mb": 50.0, "open_fds": next(fds), "connections": 4, "threads": 3})
+        recorder.start()
+        for _ in range(10):
+            recorder.record(0.001)
+            time.sleep(0.006)
+            recorder.tick(0)
+        recorder.finish(0)
+
+        summary = recorder.summary()
+        self.assertEqual(summary["window_count"], 10)
+        self.assertEqual(summary["trend_step_windows"], 4)
+        self.assertEqual(summary["series"]["open_fds"], [101.5, 105.5, 108.5])
+        self.assertGreater(summary["trends"]["open_fds"]["slope"], 0)
+
+    def test_windows_round_trip_through_storage(self):
+        """Test that soak windows are stored as they close and read back in order."""
+        with tempfile.TemporaryDirectory() as directory:
+            storage = ResultStorage(os.path.join(directory, "soak.db"))
+            recorder = SoakRecorder("run-2", 0.01, lambda: {"memory_rss_mb": 50.0, "open_fds": 10, "connections": 2, "threads": 3}, storage.save_soak_window)
+            recorder.start()
+            for _ in range(3):
+                recorder.record(0.005)
+                time.sleep(0.015)
+                recorder.tick(0)
+            recorder.finish(0)
+
+            windows = storage.get_soak_windows("run-2")
+            storage.close()
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(windows[2]["window_index"], 2)
+        self.assertEqual(windows[0]["histogram"]["count"], 1)
+        self.assertEqual(windows[0]["open_fds"], 10)
+        self.assertLessEqual(windows[0]["end_time"], windows[1]["start_time"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 import unittest
 import os
 import tempfile
-from http_benchmark.storage import ResultStorage
+import sqlite3
+import threading
+from unittest.mock import patch
+from http_benchmark.storage import ResultStorage, connect
 from http_benchmark.models.benchmark_result import BenchmarkResult
+from http_benchmark.models.resource_metrics import ResourceMetrics
 from datetime import datetime
 
 
@@ -15,6 +19,7 @@ class TestResultStorage(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test database."""
+        self.storage.close()
         if os.path.exists(self.temp_db.name):
             os.unlink(self.temp_db.name)
 
@@ -225,6 +230,361 @@ class TestResultStorage(unittest.TestCase):
             self.assertIn("cpu_usage_avg", comparison_item)
             self.assertIn("memory_usage_avg", comparison_item)
 
+    def test_cpu_cost_round_trip(self):
+        """Test that per-request CPU cost fields are persisted and restored."""
+        result = BenchmarkResult(
+            name="CPU Cost Test",
+            client_library="urllib3",
+            client_type="sync",
+            http_method="GET",
+            url="https://example.com",
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            duration=5.0,
+            requests_count=1000,
+            requests_per_second=200.0,
+            avg_response_time=0.01,
+            min_response_time=0.005,
+            max_response_time=0.02,
+            p95_response_time=0.015,
+            p99_response_time=0.018,
+            cpu_usage_avg=40.0,
+            memory_usage_avg=1.5,
+            network_io={"bytes_sent": 100, "bytes_recv": 200},
+            error_count=0,
+            error_rate=0.0,
+            concurrency_level=4,
+            config_snapshot={},
+            cpu_time_user=0.8,
+            cpu_time_system=0.2,
+            cpu_us_per_request=1000.0,
+            requests_per_cpu_second=1000.0,
+            adapter_cpu_us_per_request=850.0,
+        )
+        self.storage.save_result(result)
+
+        retrieved = self.storage.get_result_by_id(result.id)
+        self.assertAlmostEqual(retrieved.cpu_time_user, 0.8)
+        self.assertAlmostEqual(retrieved.cpu_time_system, 0.2)
+        self.assertAlmostEqual(retrieved.cpu_us_per_request, 1000.0)
+        self.assertAlmostEqual(retrieved.requests_per_cpu_second, 1000.0)
+        self.assertAlmostEqual(retrieved.adapter_cpu_us_per_request, 850.0)
+
+    def test_resource_samples_saved_with_result(self):
+        """Test that the resource sample series is stored in resource_metrics keyed by benchmark_id."""
+        samples = [{"timestamp": 1700000000.0 + i * 0.01, "cpu_percent": 10.0 + i, "memory_percent": 1.0, "memory_rss_mb": 50.0 + i} for i in range(5)]
+        result = BenchmarkResult(
+            name="Samples Test",
+            client_library="httpx",
+            client_type="sync",
+            http_method="GET",
+            url="https://example.com",
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            duration=5.0,
+            requests_count=10,
+            requests_per_second=2.0,
+            avg_response_time=0.1,
+            min_response_time=0.05,
+            max_response_time=0.2,
+            p95_response_time=0.15,
+            p99_response_time=0.18,
+            cpu_usage_avg=12.0,
+            memory_usage_avg=1.0,
+            network_io={},
+            error_count=0,
+            error_rate=0.0,
+            concurrency_level=1,
+            config_snapshot={},
+            resource_samples=samples,
+        )
+        self.storage.save_result(result)
+
+        metrics = self.storage.get_resource_metrics(result.id)
+        self.assertEqual(len(metrics), 5)
+        self.assertEqual([m.cpu_percent for m in metrics], [10.0, 11.0, 12.0, 13.0, 14.0])
+        self.assertEqual(metrics[0].benchmark_id, result.id)
+        self.assertAlmostEqual(metrics[4].memory_mb, 54.0)
+        self.assertEqual(self.storage.get_resource_metrics("unknown-id"), [])
+        # The sample series is not part of the serialized result
+        self.assertNotIn("_resource_samples", result.to_dict())
+
+    def test_target_samples_and_metrics_round_trip(self):
+        """Test that target samples are stored with source "target" and target_metrics survive a round trip."""
+        client_samples = [{"timestamp": 1700000000.0 + i, "cpu_percent": 10.0, "memory_percent": 1.0, "memory_rss_mb": 50.0} for i in range(3)]
+        target_samples = [{"timestamp": 1700000000.0 + i, "cpu_percent": 95.0, "memory_percent": 2.0, "memory_rss_mb": 80.0} for i in range(3)]
+        result = BenchmarkResult(
+            name="Target Test",
+            client_library="httpx",
+            client_type="sync",
+            http_method="GET",
+            url="https://example.com",
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            duration=5.0,
+            requests_count=10,
+            requests_per_second=2.0,
+            avg_response_time=0.1,
+            min_response_time=0.05,
+            max_response_time=0.2,
+            p95_response_time=0.15,
+            p99_response_time=0.18,
+            cpu_usage_avg=12.0,
+            memory_usage_avg=1.0,
+            network_io={},
+            error_count=0,
+            error_rate=0.0,
+            concurrency_level=1,
+            config_snapshot={},
+            target_metrics={"cpu_avg": 95.0, "server_saturated": True},
+            resource_samples=client_samples,
+            target_resource_samples=target_samples,
+        )
+        self.storage.save_result(result)
+
+        self.assertEqual(len(self.storage.get_resource_metrics(result.id)), 6)
+        target = self.storage.get_resource_metrics(result.id, source="target")
+        self.assertEqual([m.cpu_percent for m in target], [95.0, 95.0, 95.0])
+        self.assertEqual({m.source for m in self.storage.get_resource_metrics(result.id, source="client")}, {"client"})
+        self.assertTrue(self.storage.get_result_by_id(result.id).target_metrics["server_saturated"])
+
+    def test_iter_results_filters_pages_and_projects(self):
+        """Test that filters run in SQL, pages follow the keyset cursor newest first, and projections return only the requested fields."""
+        from datetime import timedelta
+
+        base = datetime(2024, 1, 1)
+        for index in range(7):
+            self.storage.save_result(
+                BenchmarkResult(
+                    name="Paged",
+                    client_library="httpx" if index % 2 else "requests",
+                    client_type="sync",
+                    http_method="GET",
+                    url="https://example.com",
+                    start_time=base + timedelta(days=index),
+                    end_time=base + timedelta(days=index, seconds=10),
+                    duration=10.0,
+                    requests_count=index,
+                    requests_per_second=1.0,
+                    avg_response_time=0.1,
+                    min_response_time=0.05,
+                    max_response_time=0.2,
+                    p95_response_time=0.15,
+                    p99_response_time=0.18,
+                    cpu_usage_avg=25.0,
+                    memory_usage_avg=100.0,
+                    network_io={},
+                    error_count=0,
+                    error_rate=0.0,
+                    concurrency_level=1 if index < 4 else 8,
+                    config_snapshot={},
+                )
+            )
+
+        page, cursor = self.storage.query_results(limit=3)
+        self.assertEqual([result.requests_count for result in page], [6, 5, 4])
+        page, cursor = self.storage.query_results(limit=3, after=cursor)
+        self.assertEqual([result.requests_count for result in page], [3, 2, 1])
+        page, cursor = self.storage.query_results(limit=3, after=cursor)
+        self.assertEqual(([result.requests_count for result in page], cursor), ([0], None))
+
+        self.assertEqual([result.requests_count for result in self.storage.iter_results(page_size=2)], [6, 5, 4, 3, 2, 1, 0])
+        filtered = self.storage.iter_results(client_library="httpx", concurrency=[1], since=base, until=base + timedelta(days=3), page_size=1)
+        self.assertEqual([result.requests_count for result in filtered], [1])
+
+        projected = list(self.storage.iter_results(fields=["requests_count", "start_time"], concurrency=8))
+        self.assertEqual(projected[0], {"requests_count": 6, "start_time": base + timedelta(days=6)})
+        self.assertEqual(len(projected), 3)
+        with self.assertRaises(ValueError):
+            list(self.storage.iter_results(fields=["requests_count", "nope"]))
+
+    def test_latency_histograms_are_stored_and_merged(self):
+        """Test that each result keeps its histogram and aggregate percentiles come from the merged histograms, not averaged percentiles."""
+        from http_benchmark.utils.histogram import LatencyHistogram
+
+        runs = {"httpx": [0.010] * 900 + [0.100] * 100, "requests": [0.200] * 10}
+        for client_library, latencies in runs.items():
+            self.storage.save_result(
+                BenchmarkResult(
+                    name="Histograms",
+                    client_library=client_library,
+                    client_type="sync",
+                    http_method="GET",
+                    url="https://example.com",
+                    start_time=datetime.now(),
+                    end_time=datetime.now(),
+                    duration=1.0,
+                    requests_count=len(latencies),
+                    requests_per_second=len(latencies),
+                    avg_response_time=sum(latencies) / len(latencies),
+                    min_response_time=min(latencies),
+                    max_response_time=max(latencies),
+                    p95_response_time=max(latencies),
+                    p99_response_time=max(latencies),
+                    cpu_usage_avg=1.0,
+                    memory_usage_avg=1.0,
+                    network_io={},
+                    error_count=0,
+                    error_rate=0.0,
+                    concurrency_level=1,
+                    config_snapshot={},
+                    latency_histogram=LatencyHistogram.from_values(latencies),
+                )
+            )
+
+        stored = next(self.storage.iter_results(client_library="httpx"))
+        self.assertEqual(stored.latency_histogram.count, 1000)
+
+        aggregate = self.storage.aggregate_latency(name="Histograms")
+        self.assertEqual((aggregate["requests"], aggregate["results_without_histogram"]), (1010, 0))
+        self.assertAlmostEqual(aggregate["percentiles"]["p50"], 0.010, delta=0.0002)
+        self.assertAlmostEqual(aggregate["percentiles"]["p95"], 0.100, delta=0.002)
+        self.assertAlmostEqual(aggregate["percentiles"]["p99.9"], 0.200, delta=0.004)
+        self.assertEqual(self.storage.aggregate_latency(client_library="requests")["requests"], 10)
+
+    def test_tagged_results_are_queryable(self):
+        """Test that tags pin results for later queries and can be removed without deleting the results."""
+        result = BenchmarkResult(
+            name="Tagged",
+            client_library="httpx",
+            client_type="sync",
+            http_method="GET",
+            url="https://example.com",
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            duration=1.0,
+            requests_count=1,
+            requests_per_second=1.0,
+            avg_response_time=0.1,
+            min_response_time=0.1,
+            max_response_time=0.1,
+            p95_response_time=0.1,
+            p99_response_time=0.1,
+            cpu_usage_avg=0.0,
+            memory_usage_avg=0.0,
+            network_io={},
+            error_count=0,
+            error_rate=0.0,
+            concurrency_level=1,
+            config_snapshot={},
+        )
+        self.storage.save_result(result)
+        self.storage.tag_results("v1", [result.id])
+        self.storage.tag_results("v1", [result.id])
+
+        self.assertEqual([tagged.id for tagged in self.storage.iter_results(tag="v1", http_method="GET")], [result.id])
+        self.assertEqual(list(self.storage.iter_results(tag="v1", http_method="POST")), [])
+        self.assertEqual(self.storage.get_tags(result.id), ["v1"])
+        self.storage.remove_tag("v1")
+        self.assertEqual(list(self.storage.iter_results(tag="v1")), [])
+        self.assertIsNotNone(self.storage.get_result_by_id(result.id))
+
+    def test_connection_uses_wal(self):
+        """Test that the storage keeps one connection open in WAL mode."""
+        self.assertEqual(self.storage._conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_background_writer_batches_and_flushes(self):
+        """Test that queued writes are committed by the writer thread and visible to reads on the caller's connection."""
+        with ResultStorage(db_path=self.temp_db.name, background=True) as storage:
+            for index in range(50):
+                storage.save_resource_metrics([ResourceMetrics(benchmark_id="background", timestamp=datetime.now(), cpu_percent=index, memory_mb=1.0, bytes_sent=0, bytes_received=0)])
+            self.assertEqual(len(storage.get_resource_metrics("background")), 50)
+            storage.save_resource_metrics([ResourceMetrics(benchmark_id="background", timestamp=datetime.now(), cpu_percent=1.0, memory_mb=1.0, bytes_sent=0, bytes_received=0)])
+        # Closing flushes whatever is still queued
+        self.assertEqual(len(self.storage.get_resource_metrics("background")), 51)
+
+    def test_background_write_errors_surface_on_flush(self):
+        """Test that a failed background write is reported to the caller and rolled back without the rest of its batch."""
+        storage = ResultStorage(db_path=self.temp_db.name, background=True)
+        gate = threading.Event()
+        storage._write(lambda cursor: gate.wait())  # Hold the writer so the next writes queue up as one batch
+        metric = ResourceMetrics(benchmark_id="duplicate", timestamp=datetime.now(), cpu_percent=1.0, memory_mb=1.0, bytes_sent=0, bytes_received=0)
+        storage.save_resource_metrics([metric])
+        storage.save_resource_metrics([metric])
+        storage.save_resource_metrics([ResourceMetrics(benchmark_id="duplicate", timestamp=datetime.now(), cpu_percent=2.0, memory_mb=1.0, bytes_sent=0, bytes_received=0)])
+        gate.set()
+        with self.assertRaises(Exception):
+            storage.flush()
+        self.assertEqual(len(storage.get_resource_metrics("duplicate")), 2)
+        storage.close()
+
+        with self.assertRaises(ValueError):
+            ResultStorage(":memory:", background=True)
+
+    def test_background_writer_connection_errors_raise_on_open(self):
+        """Test that a writer connection that cannot be opened fails the constructor instead of hanging flush()."""
+        with patch("http_benchmark.storage.connect", side_effect=[connect(self.temp_db.name), sqlite3.OperationalError("unable to open database file")]):
+            with self.assertRaises(sqlite3.OperationalError):
+                ResultStorage(db_path=self.temp_db.name, background=True)
+
+    def test_schema_is_versioned_and_indexed(self):
+        """Test that a new database is at the current schema version and name lookups use an index."""
+        from http_benchmark.storage import SCHEMA_VERSION
+
+        self.assertEqual(self.storage.schema_version(), SCHEMA_VERSION)
+        indexes = {row[1] for row in self.storage._conn.execute("PRAGMA index_list(benchmark_results)")}
+        expected = {"client_url", "name", "method", "git_sha", "start_time"}
+        self.assertTrue({f"idx_benchmark_results_{index}" for index in expected} <= indexes)
+        plan = " ".join(row[3] for row in self.storage._conn.execute("EXPLAIN QUERY PLAN SELECT * FROM benchmark_results WHERE name = ?", ("x",)))
+        self.assertIn("idx_benchmark_results_name", plan)
+
+    def test_unversioned_database_is_migrated_and_backfilled(self):
+        """Test that a database from before schema versioning gets every migration and its run metadata promoted to columns."""
+        import json
+        import sqlite3
+
+        self.storage.close()
+        conn = sqlite3.connect(self.temp_db.name)
+        conn.execute("DROP INDEX idx_benchmark_results_name")
+        conn.execute("ALTER TABLE benchmark_results DROP COLUMN host")
+        conn.execute("PRAGMA user_version = 0")
+        snapshot = {"runtime": {"host": "bench-01", "git_sha": "abc123", "environment_fingerprint": "f00d"}}
+        conn.execute(
+            "INSERT INTO benchmark_results (id, name, client_library, client_type, http_method, url, start_time, end_time, duration, requests_count, "
+            "requests_per_second, avg_response_time, min_response_time, max_response_time, p95_response_time, p99_response_time, cpu_usage_avg, "
+            "memory_usage_avg, network_io, error_count, error_rate, concurrency_level, config_snapshot) "
+            "VALUES ('legacy', 'Legacy', 'httpx', 'sync', 'GET', 'http://x', '2024-01-01T00:00:00', '2024-01-01T00:00:10', 10, 1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 1, 1, '{}', 0, 0, 1, ?)",
+            (json.dumps(snapshot),),
+        )
+        conn.commit()
+        conn.close()
+
+        self.storage = ResultStorage(db_path=self.temp_db.name)
+        result = self.storage.get_result_by_id("legacy")
+        self.assertEqual((result.host, result.git_sha, result.environment_fingerprint), ("bench-01", "abc123", "f00d"))
+        self.assertIn("idx_benchmark_results_name", {row[1] for row in self.storage._conn.execute("PRAGMA index_list(benchmark_results)")})
+
+    def test_newer_schema_is_refused(self):
+        """Test that a database written by a newer version is not silently downgraded."""
+        self.storage._conn.execute("PRAGMA user_version = 99")
+        with self.assertRaises(ValueError):
+            ResultStorage(db_path=self.temp_db.name)
+
+    def test_existing_database_gets_new_columns(self):
+        """Test that a database created with the original schema is upgraded in place."""
+        import sqlite3
+
+        legacy_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+        legacy_db.close()
+        try:
+            conn = sqlite3.connect(legacy_db.name)
+            conn.execute("CREATE TABLE benchmark_results (id TEXT PRIMARY KEY, name TEXT NOT NULL)")
+            conn.execute("CREATE TABLE resource_metrics (id TEXT PRIMARY KEY, benchmark_id TEXT NOT NULL, timestamp TEXT NOT NULL)")
+            conn.commit()
+            conn.close()
+
+            ResultStorage(db_path=legacy_db.name).close()
+
+            conn = sqlite3.connect(legacy_db.name)
+            column_names = [col[1] for col in conn.execute("PRAGMA table_info(benchmark_results);").fetchall()]
+            resource_column_names = [col[1] for col in conn.execute("PRAGMA table_info(resource_metrics);").fetchall()]
+            conn.close()
+            self.assertIn("cpu_us_per_request", column_names)
+            self.assertIn("requests_per_cpu_second", column_names)
+            self.assertIn("source", resource_column_names)
+        finally:
+            os.unlink(legacy_db.name)
+
     def test_database_schema(self):
         """Test that the database schema is correctly created."""
         import sqlite3
@@ -267,6 +627,24 @@ class TestResultStorage(unittest.TestCase):
             "concurrency_level",
             "config_snapshot",
             "created_at",
+            "cpu_time_user",
+            "cpu_time_system",
+            "cpu_us_per_request",
+            "requests_per_cpu_second",
+            "adapter_cpu_us_per_request",
+            "target_metrics",
+            "event_loop_stats",
+            "cpu_budget_cores",
+            "cpu_usage_normalized",
+            "cpu_budget",
+            "soak_stats",
+            "host",
+            "git_sha",
+            "environment_fingerprint",
+            "latency_histogram",
+            "convergence_stats",
+            "endpoint_stats",
+            "replay_stats",
         ]
 
         for col in expected_columns:
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from http_benchmark.storage import ResultStorage
+from http_benchmark.suite import expand_suite, load_suite, run_suite, validate_suite
+
+from factories import make_result
+
+SUITE_TOML = """
+name = "nightly"
+cooldown_seconds = 0
+
+[defaults]
+target_url = "http://localhost/anything"
+duration_seconds = 1
+
+[matrix]
+client_library = ["requests", "aiohttp", "pycurl"]
+is_async = [false, true]
+http_method = ["GET", "POST"]
+payload_bytes = [0, 1024]
+
+[[exclude]]
+http_method = "GET"
+payload_bytes = 1024
+"""
+
+
+class TestSuite(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "nightly.toml")
+        with open(self.path, "w") as f:
+            f.write(SUITE_TOML)
+
+    def test_matrix_expansion_skips_excluded_and_unsupported_combinations(self):
+        """Test that the matrix expands in order and leaves out exclusions and modes the adapters lack."""
+        runs, skipped = expand_suite(load_suite(self.path))
+
+        # 3 clients x 2 modes x 3 method/payload pairs, of which each client supports one mode
+        self.assertEqual(len(runs), 9)
+        self.assertEqual(runs[0]["key"], "client_library=requests, is_async=False, http_method=GET, payload_bytes=0")
+        self.assertEqual({(run["config"].client_library, run["config"].is_async) for run in runs}, {("requests", False), ("aiohttp", True), ("pycurl", False)})
+        self.assertEqual(len(runs[2]["config"].body), 1024)
+        self.assertEqual(runs[0]["config"].duration_seconds, 1)
+        self.assertTrue(runs[0]["config"].name.startswith("nightly ["))
+        reasons = [skip["reason"] for skip in skipped]
+        self.assertEqual(reasons.count("excluded"), 6)
+        self.assertIn("pycurl is sync-only", reasons)
+        self.assertIn("aiohttp is async-only", reasons)
+
+    def test_invalid_suites_are_rejected(self):
+        """Test that unknown fields and suites without a target are refused before anything runs."""
+        with self.assertRaisesRegex(ValueError, "Unknown fields in matrix: clients"):
+            validate_suite({"defaults": {"target_url": "http://localhost"}, "matrix": {"clients": ["httpx"]}})
+        with self.assertRaisesRegex(ValueError, "target_url"):
+            validate_suite({"matrix": {"client_library": ["httpx"]}})
+        with self.assertRaisesRegex(ValueError, "non-empty list"):
+            validate_suite({"defaults": {"target_url": "http://localhost"}, "matrix": {"concurrency": 4}})
+
+    @patch("http_benchmark.suite.time.sleep")
+    @patch("http_benchmark.suite.BenchmarkRunner")
+    def test_run_tags_results_and_resumes(self, mock_runner_class, mock_sleep):
+        """Test that results are tagged with the run ID and a resumed run only runs the missing combinations."""
+        runs = []
+        mock_runner_class.side_effect = lambda config: type("Runner", (), {"run": lambda self: runs.append(config.name) or make_result(config_snapshot=config.to_dict())})()
+        suite = load_suite(self.path)
+        suite["cooldown_seconds"] = 2
+        storage = ResultStorage(os.path.join(self.directory.name, "suite.db"))
+        self.addCleanup(storage.close)
+
+        # The first attempt stops after three runs
+        interrupted = {"count": 0}
+
+        def interrupt(run, result):
+            interrupted["count"] += 1
+            if interrupted["count"] == 3:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_suite(suite, storage, run_id="nightly-1", on_result=interrupt)
+        saved = list(storage.iter_results(tag="nightly-1"))
+        self.assertEqual(len(saved), 3)
+        self.assertEqual(saved[0].config_snapshot["suite"]["run_id"], "nightly-1")
+
+        outcome = run_suite(suite, storage, run_id="nightly-1")
+        self.assertEqual((outcome["resumed"], len(outcome["results"]), outcome["total"]), (3, 6, 9))
+        self.assertEqual(len(runs), 9)
+        self.assertEqual(len(set(runs)), 9)
+        self.assertEqual(len(list(storage.iter_results(tag="nightly-1"))), 9)
+        mock_sleep.assert_called_with(2)
+        self.assertEqual(mock_sleep.call_count, 2 + 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
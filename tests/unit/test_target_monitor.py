@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from http_benchmark.utils.cgroup import read_cgroup_cpu_limit, read_cgroup_cpu_throttling, read_cgroup_cpu_usage, read_cgroup_memory, read_cgroup_pids, resolve_cgroup_path
+from http_benchmark.utils.target_monitor import TargetMonitor
+
+
+class TestCgroupHelpers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        with open(os.path.join(self.path, name), "w") as output:
+            output.write(content)
+
+    def test_reads_cgroup_v2_files(self):
+        """Test reading members, CPU usage, memory and CPU limit of a cgroup v2 directory."""
+        self._write("cgroup.procs", "101\n202\n")
+        self._write("cpu.stat", "usage_usec 2500000\nuser_usec 2000000\nsystem_usec 500000\n")
+        self._write("memory.current", "1048576\n")
+        self._write("cpu.max", "150000 100000\n")
+
+        self.assertEqual(resolve_cgroup_path(self.path), self.path)
+        self.assertEqual(read_cgroup_pids(self.path), [101, 202])
+        self.assertAlmostEqual(read_cgroup_cpu_usage(self.path), 2.5)
+        self.assertEqual(read_cgroup_memory(self.path), 1048576)
+        self.assertAlmostEqual(read_cgroup_cpu_limit(self.path), 1.5)
+
+        self._write("cpu.max", "max 100000\n")
+        self.assertIsNone(read_cgroup_cpu_limit(self.path))
+
+    def test_reads_cpu_throttling(self):
+        """Test reading throttling counters from cgroup v2 (microseconds) and v1 (nanoseconds) cpu.stat files."""
+        self.assertEqual(read_cgroup_cpu_throttling(self.path), {})
+
+        self._write("cpu.stat", "usage_usec 2500000\nnr_periods 40\nnr_throttled 10\nthrottled_usec 250000\n")
+        self.assertEqual(read_cgroup_cpu_throttling(self.path), {"nr_periods": 40, "nr_throttled": 10, "throttled_seconds": 0.25})
+
+        self._write("cpu.stat", "nr_periods 40\nnr_throttled 10\nthrottled_time 500000000\n")
+        self.assertEqual(read_cgroup_cpu_throttling(self.path)["throttled_seconds"], 0.5)
+
+    def test_unknown_cgroup_rejected(self):
+        """Test that a cgroup that does not exist is reported."""
+        with self.assertRaises(ValueError):
+            resolve_cgroup_path("/does/not/exist", root=self.path)
+
+
+class TestTargetMonitor(unittest.TestCase):
+    def test_requires_a_target(self):
+        """Test that a target monitor without targets is refused."""
+        with self.assertRaises(ValueError):
+            TargetMonitor()
+
+    def test_busy_process_is_flagged_saturated(self):
+        """Test that a single-threaded process spinning on a core is sampled and flagged as pegged."""
+        busy = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+        try:
+            monitor = TargetMonitor(pids=[busy.pid])
+            monitor.start()
+            samples = []
+            for _ in range(5):
+                time.sleep(0.1)
+                samples.append(monitor.sample())
+            summary = monitor.summary()
+        finally:
+            busy.kill()
+            busy.wait()
+
+        self.assertEqual(len(samples[0]), 4)
+        self.assertGreater(samples[-1][3], 0)  # RSS in MB
+        self.assertEqual(summary["process_count_max"], 1)
+        self.assertEqual(summary["sample_count"], 5)
+        self.assertGreater(summary["cpu_avg"], 50)
+        self.assertEqual(summary["processes"][0]["pid"], busy.pid)
+        self.assertTrue(summary["processes"][0]["pegged"])
+        self.assertTrue(summary["server_saturated"])
+
+    def test_idle_process_matched_by_name_is_not_saturated(self):
+        """Test that processes are found by name pattern and an idle target is not flagged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executable = os.path.join(tmpdir, "benchtarget-idle")
+            os.symlink(sys.executable, executable)
+            idle = subprocess.Popen([executable, "-c", "import time; time.sleep(30)"])
+            try:
+                monitor = TargetMonitor(name_patterns=["benchtarget-*"])
+                monitor.start()
+                time.sleep(0.2)
+                monitor.sample()
+                summary = monitor.summary()
+            finally:
+                idle.kill()
+                idle.wait()
+
+        self.assertEqual(summary["process_count_max"], 1)
+        self.assertEqual(summary["processes"][0]["pid"], idle.pid)
+        self.assertLess(summary["cpu_avg"], 50)
+        self.assertFalse(summary["server_saturated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from http_benchmark.models.benchmark_configuration import BenchmarkConfiguration
+from http_benchmark.storage import ResultStorage
+from http_benchmark.trials import compare_trials, format_trials, run_trials
+from http_benchmark.utils.stats import bootstrap_ci
+
+from factories import make_result
+
+
+class TestTrials(unittest.TestCase):
+    def test_bootstrap_ci_is_reproducible_and_covers_the_mean(self):
+        """Test that the interval brackets the sample mean and is the same on every call."""
+        values = [100.0, 104.0, 97.0, 101.0, 99.0, 103.0]
+        low, high = bootstrap_ci(values)
+        self.assertLess(low, sum(values) / len(values))
+        self.assertGreater(high, sum(values) / len(values))
+        self.assertEqual((low, high), bootstrap_ci(values))
+        self.assertEqual(bootstrap_ci([5.0]), (5.0, 5.0))
+
+    @patch("http_benchmark.trials.BenchmarkRunner")
+    def test_run_trials_alternates_clients(self, mock_runner_class):
+        """Test that each trial runs one round of all clients."""
+        order = []
+        mock_runner_class.side_effect = lambda config: type("Runner", (), {"run": lambda self: order.append(config.client_library) or make_result()})()
+        configs = {client: BenchmarkConfiguration(target_url="https://example.com", client_library=client) for client in ("httpx", "requests")}
+
+        trials = run_trials(configs, 3)
+
+        self.assertEqual(order, ["httpx", "requests"] * 3)
+        self.assertEqual({client: len(results) for client, results in trials.items()}, {"httpx": 3, "requests": 3})
+
+    def test_compare_trials_marks_significant_differences(self):
+        """Test the per-client summaries and that only the real differences are significant."""
+        rng = random.Random(7)
+        trials = {
+            "requests": [make_result(requests_per_second=rps, latencies=[rng.lognormvariate(-5, 0.2) for _ in range(1000)]) for rps in (100, 102, 98, 101)],
+            "httpx": [make_result(requests_per_second=rps, latencies=[rng.lognormvariate(-5, 0.2) for _ in range(1000)]) for rps in (101, 99, 100, 102)],
+            "aiohttp": [make_result(requests_per_second=rps, latencies=[rng.lognormvariate(-5.3, 0.2) for _ in range(1000)]) for rps in (130, 131, 129, 132)],
+        }
+
+        comparison = compare_trials(trials)
+
+        summary = comparison["clients"]["aiohttp"]["requests_per_second"]
+        self.assertEqual((summary["mean"], summary["median"]), (130.5, 130.5))
+        self.assertLessEqual(summary["ci_low"], summary["mean"])
+        self.assertGreaterEqual(summary["ci_high"], summary["mean"])
+        pairs = {tuple(pair["clients"]): pair for pair in comparison["pairs"]}
+        self.assertFalse(pairs[("requests", "httpx")]["rps_significant"])
+        self.assertFalse(pairs[("requests", "httpx")]["latency_significant"])
+        self.assertTrue(pairs[("requests", "aiohttp")]["rps_significant"])
+        self.assertTrue(pairs[("requests", "aiohttp")]["latency_significant"])
+        self.assertLess(pairs[("requests", "aiohttp")]["latency_effect"], 0.5)
+        self.assertIn("aiohttp vs requests", format_trials(comparison))
+
+    def test_comparison_round_trip(self):
+        """Test that a comparison is stored as one entity linking all of its trial results."""
+        temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+        temp_db.close()
+        self.addCleanup(os.unlink, temp_db.name)
+        trials = {client: [make_result([0.01, 0.02], requests_per_second=rps) for rps in (10, 11)] for client in ("httpx", "requests")}
+        comparison = compare_trials(trials)
+        comparison.update(name="Round trip", url="https://example.com", http_method="GET", concurrency_level=1, trials=2)
+
+        with ResultStorage(db_path=temp_db.name) as storage:
+            storage.save_comparison(comparison)
+            stored = storage.get_comparison(comparison["id"])
+            linked = storage._conn.execute("SELECT COUNT(*) FROM comparison_results WHERE comparison_id = ?", (comparison["id"],)).fetchone()[0]
+
+        self.assertEqual(stored["clients"], comparison["clients"])
+        self.assertEqual((stored["trials"], stored["name"]), (2, "Round trip"))
+        self.assertEqual(linked, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()